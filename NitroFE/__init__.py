@@ -16,8 +16,18 @@ from NitroFE.time_based_features.indicator_features._SeriesWeightedAverage impor
 from NitroFE.time_based_features.indicator_features._SeriesWeightedMovingFeature import SeriesWeightedMovingFeature
 from NitroFE.time_based_features.indicator_features._InverseFisherRelativeStrengthIndex import InverseFisherRelativeStrengthIndex
 from NitroFE.time_based_features.indicator_features._KeltnerChannel import KeltnerChannel
+from NitroFE.time_based_features.indicator_features._KeyedRelativeStrengthIndex import KeyedRelativeStrengthIndex
+from NitroFE.time_based_features.indicator_features._KeyedAverageTrueRange import KeyedAverageTrueRange
+from NitroFE.time_based_features.indicator_features._KeyedBollingerBands import KeyedBollingerBands
+from NitroFE.time_based_features.indicator_features._KeyedMovingAverageConvergenceDivergence import KeyedMovingAverageConvergenceDivergence
 from NitroFE.encoding.encoding_features import SmoothedEncoding,CategoricalEncoding
 from NitroFE.time_based_features.weighted_window_features.weighted_window_features import weighted_window_features
+from NitroFE.time_based_features.weighted_window_features.weighted_windows import window_cache_info,clear_window_cache
+from NitroFE.time_based_features.weighted_window_features.weighted_rolling_window_engine import weighted_rolling_window_engine
+from NitroFE.time_based_features.parallel_fit import parallel_fit
+from NitroFE.time_based_features.async_stream import async_feature_stream,micro_batch_coalescer
+from NitroFE.time_based_features.chunked_fit import chunked_fit
+from NitroFE.time_based_features.feature_state import get_state,set_state
 
 from NitroFE.time_based_features.moving_average_features.moving_average_features import ExponentialMovingFeature,HullMovingFeature,\
     KaufmanAdaptiveMovingAverage,FractalAdaptiveMovingAverage,TripleExponentialMovingFeature,SmoothedMovingAverage
\ No newline at end of file
@@ -0,0 +1,462 @@
+import time
+import asyncio
+import collections
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, Executor
+
+
+def _as_batch(item):
+    """
+    Micro-batch of a stream item, a dataframe is a micro-batch, a series or a dict is one row
+    """
+    if isinstance(item, pd.DataFrame):
+        return item
+    if isinstance(item, pd.Series):
+        return item.to_frame().T
+    if isinstance(item, dict):
+        return pd.DataFrame([item])
+    raise ValueError(
+        f"stream items must be a pd.DataFrame (micro-batch), a pd.Series or a dict (row), got {type(item)}"
+    )
+
+
+def _n_rows(item):
+    return len(item) if isinstance(item, pd.DataFrame) else 1
+
+
+def _coalesce(items: list):
+    """
+    Single micro-batch holding the rows of all items, in item order
+    """
+    if all(isinstance(_item, pd.Series) for _item in items):
+        return pd.DataFrame(items)
+    if all(isinstance(_item, dict) for _item in items):
+        return pd.DataFrame(items)
+    return pd.concat([_as_batch(_item) for _item in items])
+
+
+def _slice_result(result, start: int, stop: int, is_row: bool):
+    if is_row:
+        return result.iloc[start]
+    return result.iloc[start:stop]
+
+
+def _feature_runners(features, method: str):
+    """
+    Callable of every feature of a feature object, list or dict, by name (position for a list)
+    """
+    if isinstance(features, dict):
+        _features = features
+    elif isinstance(features, (list, tuple)):
+        _features = dict(enumerate(features))
+    else:
+        _features = {None: features}
+    return {
+        _name: _feature if callable(_feature) else getattr(_feature, method)
+        for _name, _feature in _features.items()
+    }
+
+
+def _pack_results(features, results: dict):
+    if isinstance(features, dict):
+        return results
+    if isinstance(features, (list, tuple)):
+        return [results[_position] for _position in range(len(results))]
+    return results[None]
+
+
+async def _iterate(source):
+    if hasattr(source, "__aiter__"):
+        async for _item in source:
+            yield _item
+    else:
+        for _item in source:
+            yield _item
+
+
+class _executor_features:
+    """
+    Feature objects (or callables) run in a thread pool, shared by the asyncio adapters
+    """
+
+    def __init__(
+        self,
+        features,
+        method: str,
+        first_fit: bool,
+        executor: Executor,
+        max_workers: int,
+        kwargs: dict,
+    ):
+        if (executor is None) and (max_workers < 1):
+            raise ValueError(f"max_workers must be a positive integer, got {max_workers}")
+
+        self.features = features
+        self.method = method
+        self.first_fit = first_fit
+        self.kwargs = kwargs
+        self._owns_executor = executor is None
+        self._executor = (
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="NitroFE")
+            if executor is None
+            else executor
+        )
+
+    def _runners(self):
+        return _feature_runners(self.features, self.method)
+
+    def _pack(self, results: dict):
+        return _pack_results(self.features, results)
+
+    def close(self):
+        """
+        Shuts the private executor down, waiting for running calculations
+        """
+        if self._owns_executor:
+            self._executor.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+
+class async_feature_stream(_executor_features):
+    """
+    Drives NitroFE feature objects from an asyncio stream of rows or micro-batches.
+
+    Every micro-batch is handed to each feature as fit(batch, first_fit=False), the calls run
+    in an executor so the event loop is never blocked. Calls of the same feature are chained,
+    so its state sees the batches in stream order, while different features and the following
+    batches run concurrently. Once max_pending results wait for the consumer, the stream stops
+    pulling items from the source until the consumer catches up.
+
+    The features keep their state in process, so the executor has to be a thread pool.
+    Pass the same executor to several streams to bound the total number of workers.
+    """
+
+    def __init__(
+        self,
+        features,
+        method: str = "fit",
+        first_fit: bool = False,
+        max_pending: int = 4,
+        executor: Executor = None,
+        max_workers: int = 1,
+        **kwargs
+    ):
+        """
+        Parameters
+        ----------
+        features : Union[object, list, dict]
+            NitroFE feature object, or list/dict of feature objects. Callables such as
+            bound methods are called as callable(batch, first_fit=..., **kwargs)
+        method : str, optional
+            method of the feature objects to run, by default 'fit'
+        first_fit : bool, optional
+            If True, the first micro-batch of the stream is fitted with first_fit=True,
+            use False when the features were already fitted on past data, by default False
+        max_pending : int, optional
+            maximum number of results waiting for the consumer, by default 4
+        executor : Executor, optional
+            thread pool running the feature calculations, by default a private
+            ThreadPoolExecutor with max_workers threads
+        max_workers : int, optional
+            number of threads of the private executor, by default 1
+        kwargs :
+            additional keyword arguments of method
+        """
+        if max_pending < 1:
+            raise ValueError(f"max_pending must be a positive integer, got {max_pending}")
+        super().__init__(features, method, first_fit, executor, max_workers, kwargs)
+        self.max_pending = max_pending
+        self._running = False
+
+    async def _call(self, runner, batch: pd.DataFrame, first_fit: bool, previous):
+        if previous is not None:
+            # the previous batch of the same feature has to be applied to its state first
+            await previous
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executor, lambda: runner(batch, first_fit=first_fit, **self.kwargs)
+        )
+
+    async def stream(self, source):
+        """
+        Feeds the items of source through the features and yields their results, in stream order
+
+        Parameters
+        ----------
+        source : Union[AsyncIterable, Iterable]
+            rows (pd.Series or dict) or micro-batches (pd.DataFrame) in ascending order
+
+        Yields
+        -------
+        Union[pd.DataFrame, list, dict]
+            result of every item, a list/dict of results when features is a list/dict
+        """
+        if self._running:
+            raise ValueError(
+                "stream is already running, the feature state allows only one stream at a time"
+            )
+        self._running = True
+
+        runners = self._runners()
+        pending = asyncio.Queue(maxsize=self.max_pending)
+        previous = {_name: None for _name in runners}
+
+        async def _produce():
+            first_fit = self.first_fit
+            try:
+                async for _item in _iterate(source):
+                    _batch = _as_batch(_item)
+                    for _name, _runner in runners.items():
+                        previous[_name] = asyncio.ensure_future(
+                            self._call(_runner, _batch, first_fit, previous[_name])
+                        )
+                    first_fit = False
+                    await pending.put(dict(previous))
+            except Exception as error:
+                await pending.put(error)
+            else:
+                await pending.put(None)
+
+        producer = asyncio.ensure_future(_produce())
+        tasks = {}
+        try:
+            while True:
+                tasks = await pending.get()
+                if tasks is None:
+                    break
+                if isinstance(tasks, Exception):
+                    raise tasks
+                results = {_name: await _task for _name, _task in tasks.items()}
+                yield self._pack(results)
+        finally:
+            producer.cancel()
+            _outstanding = [producer] + [_task for _task in previous.values() if _task is not None]
+            if isinstance(tasks, dict):
+                _outstanding.extend(tasks.values())
+            while not pending.empty():
+                _queued = pending.get_nowait()
+                if isinstance(_queued, dict):
+                    _outstanding.extend(_queued.values())
+            for _task in _outstanding:
+                _task.cancel()
+            await asyncio.gather(*_outstanding, return_exceptions=True)
+            self._running = False
+
+
+class micro_batch_coalescer(_executor_features):
+    """
+    Coalesces rows submitted one by one into micro-batches, runs a single incremental
+    fit(batch, first_fit=False) per micro-batch and hands every caller the result of its rows.
+
+    A micro-batch is dispatched once it holds max_batch_size rows, or max_latency seconds
+    after its first row arrived, whichever comes first. Micro-batches are fitted in submission
+    order, in the executor, so the event loop is never blocked by the calculation.
+    The time every row waited in the buffer is available from wait_statistics.
+
+    When the fit of a micro-batch raises, the feature state may be partly updated. The callers
+    of that micro-batch get the error, and every later micro-batch fails without being fitted,
+    until reset() is called, e.g. after restoring the features with set_state.
+    """
+
+    def __init__(
+        self,
+        features,
+        method: str = "fit",
+        max_batch_size: int = 64,
+        max_latency: float = 0.005,
+        first_fit: bool = False,
+        executor: Executor = None,
+        max_workers: int = 1,
+        statistics_size: int = 100000,
+        **kwargs
+    ):
+        """
+        Parameters
+        ----------
+        features : Union[object, list, dict]
+            NitroFE feature object, or list/dict of feature objects. Callables such as
+            bound methods are called as callable(batch, first_fit=..., **kwargs)
+        method : str, optional
+            method of the feature objects to run, by default 'fit'
+        max_batch_size : int, optional
+            number of buffered rows dispatching a micro-batch, by default 64
+        max_latency : float, optional
+            maximum time in seconds the first row of a micro-batch waits in the buffer, by default 0.005
+        first_fit : bool, optional
+            If True, the first micro-batch is fitted with first_fit=True,
+            use False when the features were already fitted on past data, by default False
+        executor : Executor, optional
+            thread pool running the feature calculations, by default a private
+            ThreadPoolExecutor with max_workers threads
+        max_workers : int, optional
+            number of threads of the private executor, by default 1
+        statistics_size : int, optional
+            number of most recent rows the wait statistics are computed over, by default 100000
+        kwargs :
+            additional keyword arguments of method
+        """
+        if max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be a positive integer, got {max_batch_size}")
+        if max_latency < 0:
+            raise ValueError(f"max_latency must be non negative, got {max_latency}")
+        super().__init__(features, method, first_fit, executor, max_workers, kwargs)
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+
+        self._buffer = []
+        self._n_buffered = 0
+        self._timer = None
+        self._last_batch = None
+        self._next_first_fit = first_fit
+        self._error = None
+        self._waits = collections.deque(maxlen=statistics_size)
+        self._n_rows = 0
+        self._n_batches = 0
+
+    async def submit(self, item):
+        """
+        Buffers item and returns its feature values, once its micro-batch was fitted
+
+        Parameters
+        ----------
+        item : Union[pd.Series, dict, pd.DataFrame]
+            a row (pd.Series or dict), or several consecutive rows (pd.DataFrame)
+
+        Returns
+        -------
+        Union[pd.Series, pd.DataFrame, float, list, dict]
+            the rows of the feature result belonging to item, a list/dict of them when
+            features is a list/dict
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._buffer.append((item, future, time.perf_counter()))
+        self._n_buffered += _n_rows(item)
+        if self._n_buffered >= self.max_batch_size:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_latency, self._dispatch)
+        return await future
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._buffer:
+            return
+        entries, self._buffer, self._n_buffered = self._buffer, [], 0
+
+        _now = time.perf_counter()
+        for _item, _, _submitted in entries:
+            self._waits.extend([_now - _submitted] * _n_rows(_item))
+            self._n_rows += _n_rows(_item)
+        self._n_batches += 1
+
+        first_fit, self._next_first_fit = self._next_first_fit, False
+        self._last_batch = asyncio.ensure_future(
+            self._fit_batch(entries, first_fit, self._last_batch)
+        )
+
+    def _fit(self, items: list, first_fit: bool):
+        batch = _coalesce(items)
+        return {
+            _name: _runner(batch, first_fit=first_fit, **self.kwargs)
+            for _name, _runner in self._runners().items()
+        }
+
+    def _fail(self, entries: list, error: Exception):
+        for _, _future, _ in entries:
+            if not _future.done():
+                _future.set_exception(error)
+
+    async def _fit_batch(self, entries: list, first_fit: bool, previous):
+        if previous is not None:
+            # the previous micro-batch has to be applied to the feature state first
+            await previous
+        if self._error is not None:
+            error = ValueError(
+                "an earlier micro-batch failed and the feature state may be partly updated, "
+                "restore the features (e.g. with set_state) and call reset() before submitting rows"
+            )
+            error.__cause__ = self._error
+            self._fail(entries, error)
+            return
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self._fit, [_item for _item, _, _ in entries], first_fit
+            )
+        except Exception as error:
+            self._error = error
+            self._fail(entries, error)
+            return
+
+        _start = 0
+        for _item, _future, _ in entries:
+            _stop = _start + _n_rows(_item)
+            if not _future.done():
+                _is_row = not isinstance(_item, pd.DataFrame)
+                _future.set_result(
+                    self._pack(
+                        {
+                            _name: _slice_result(_result, _start, _stop, _is_row)
+                            for _name, _result in results.items()
+                        }
+                    )
+                )
+            _start = _stop
+
+    async def flush(self):
+        """
+        Dispatches the buffered rows and waits until all micro-batches are fitted
+        """
+        self._dispatch()
+        if self._last_batch is not None:
+            await self._last_batch
+
+    async def reset(self, first_fit: bool = False):
+        """
+        Resumes fitting after a failed micro-batch. The buffered and pending micro-batches of before
+        the reset still fail, restore the state of the features before calling reset
+
+        Parameters
+        ----------
+        first_fit : bool, optional
+            If True, the next micro-batch is fitted with first_fit=True, by default False
+        """
+        await self.flush()
+        self._error = None
+        self._next_first_fit = first_fit
+
+    def wait_statistics(self):
+        """
+        Time the rows spent in the buffer before their micro-batch was dispatched
+
+        Returns
+        -------
+        dict
+            total number of rows and micro-batches, mean micro-batch size, and the
+            p50, p99 and maximum wait in seconds over the most recent statistics_size rows
+        """
+        waits = np.fromiter(self._waits, dtype=np.float64, count=len(self._waits))
+        p50, p99, maximum = (
+            (np.percentile(waits, 50), np.percentile(waits, 99), waits.max())
+            if len(waits) > 0
+            else (np.nan, np.nan, np.nan)
+        )
+        return {
+            "rows": self._n_rows,
+            "batches": self._n_batches,
+            "mean_batch_size": self._n_rows / self._n_batches if self._n_batches else np.nan,
+            "p50": p50,
+            "p99": p99,
+            "max": maximum,
+        }
+
+    async def __aexit__(self, *exc_info):
+        await self.flush()
+        await super().__aexit__(*exc_info)
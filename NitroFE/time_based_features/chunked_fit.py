@@ -0,0 +1,191 @@
+import os
+import numpy as np
+import pandas as pd
+from typing import Iterable, Union
+from NitroFE.time_based_features.async_stream import _feature_runners, _pack_results
+
+
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+# bytes reserved for the .npy header, rewritten in place with the final shape
+_NPY_HEADER_SIZE = 128
+
+
+def _combine_results(results: dict):
+    """
+    Single frame of the results of a feature set, columns of every feature suffixed with its name
+    """
+    frames = {
+        _name: _result.to_frame() if isinstance(_result, pd.Series) else _result
+        for _name, _result in results.items()
+    }
+    if list(frames.keys()) == [None]:
+        return frames[None]
+    return pd.concat(
+        [
+            _frame.set_axis([f"{_column}_{_name}" for _column in _frame.columns], axis=1)
+            for _name, _frame in frames.items()
+        ],
+        axis=1,
+    )
+
+
+def _npy_header(n_rows: int, n_columns: int):
+    header = repr(
+        {"descr": "<f8", "fortran_order": False, "shape": (n_rows, n_columns)}
+    ).encode("latin1")
+    _length = _NPY_HEADER_SIZE - len(_NPY_MAGIC) - 2
+    return (
+        _NPY_MAGIC
+        + _length.to_bytes(2, "little")
+        + header.ljust(_length - 1)
+        + b"\n"
+    )
+
+
+class _csv_sink:
+    def __init__(self, path: str):
+        self.path = path
+        self.n_rows = 0
+
+    def write(self, result: pd.DataFrame):
+        result.to_csv(self.path, mode="a" if self.n_rows else "w", header=not self.n_rows)
+        self.n_rows += len(result)
+
+    def close(self):
+        return self.path
+
+
+class _npy_sink:
+    """
+    Appends float64 rows to a .npy file, its header is written with the final shape on close
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.n_rows = 0
+        self.n_columns = None
+        self._file = open(path, "wb")
+        self._file.write(_npy_header(0, 0))
+
+    def write(self, result: pd.DataFrame):
+        values = np.ascontiguousarray(result.to_numpy(dtype=np.float64))
+        if self.n_columns is None:
+            self.n_columns = values.shape[1]
+        if values.shape[1] != self.n_columns:
+            raise ValueError(
+                f"chunk result has {values.shape[1]} columns, previous chunks had {self.n_columns}"
+            )
+        self._file.write(values.astype("<f8", copy=False).tobytes())
+        self.n_rows += len(values)
+
+    def close(self):
+        self._file.seek(0)
+        self._file.write(_npy_header(self.n_rows, self.n_columns or 0))
+        self._file.close()
+        return np.load(self.path, mmap_mode="r")
+
+
+class _array_sink:
+    def __init__(self, array: np.ndarray):
+        self.array = array
+        self.n_rows = 0
+
+    def write(self, result: pd.DataFrame):
+        values = result.to_numpy(dtype=np.float64)
+        if self.n_rows + len(values) > len(self.array):
+            raise ValueError(
+                f"sink array holds {len(self.array)} rows, chunk results have more rows"
+            )
+        self.array[self.n_rows : self.n_rows + len(values)] = values.reshape(
+            (len(values),) + self.array.shape[1:]
+        )
+        self.n_rows += len(values)
+
+    def close(self):
+        if isinstance(self.array, np.memmap):
+            self.array.flush()
+        return self.array
+
+
+def _open_sink(sink):
+    if isinstance(sink, np.ndarray):
+        return _array_sink(sink)
+    if isinstance(sink, (str, os.PathLike)):
+        _path = os.fspath(sink)
+        if _path.endswith(".csv"):
+            return _csv_sink(_path)
+        if _path.endswith(".npy"):
+            return _npy_sink(_path)
+    raise ValueError(
+        f"sink must be None, a path ending with .csv or .npy, or a numpy array, got {sink}"
+    )
+
+
+def _fit_chunks(features, chunks: Iterable, first_fit: bool, method: str, kwargs: dict):
+    runners = _feature_runners(features, method)
+    for _chunk in chunks:
+        if len(_chunk) == 0:
+            continue
+        yield {
+            _name: _runner(_chunk, first_fit=first_fit, **kwargs)
+            for _name, _runner in runners.items()
+        }
+        first_fit = False
+
+
+def chunked_fit(
+    features,
+    chunks: Iterable[Union[pd.DataFrame, pd.Series]],
+    sink=None,
+    first_fit: bool = True,
+    method: str = "fit",
+    **kwargs
+):
+    """
+    Runs a NitroFE feature, or a set of features, over an iterator of consecutive dataframe chunks,
+    e.g. pd.read_csv(path, chunksize=...), without holding the whole history in memory.
+
+    The first chunk is fitted with first_fit, every later chunk with first_fit=False, so the
+    values are the same as those of a single fit over the concatenated chunks. Only one chunk
+    and its result are held at a time, besides the state of the features.
+
+    Parameters
+    ----------
+    features : Union[object, list, dict]
+        NitroFE feature object, or list/dict of feature objects. Callables such as
+        bound methods are called as callable(chunk, first_fit=..., **kwargs)
+    chunks : Iterable[Union[pd.DataFrame, pd.Series]]
+        consecutive chunks of the history, in ascending order
+    sink : Union[str, np.ndarray], optional
+        where the results go, by default None
+
+        * None, the results of every chunk are yielded by a generator
+        * path ending with .csv, the results are appended to the csv file
+        * path ending with .npy, the results are appended as float64 rows to the .npy file
+        * numpy array or np.memmap, the results are written to consecutive rows of the array
+    first_fit : bool, optional
+        first_fit of the first chunk, use False to continue features fitted earlier, by default True
+    method : str, optional
+        method of the feature objects to run, by default 'fit'
+    kwargs :
+        additional keyword arguments of method
+
+    Returns
+    -------
+    Union[Generator, str, np.memmap, np.ndarray]
+        generator of the chunk results (a list/dict of results when features is a list/dict) when
+        sink is None, else the csv path, the .npy file opened as a read only memmap, or the array.
+        In the file and array sinks, the results of a feature set are combined column wise, columns
+        suffixed with the feature name (position for a list)
+    """
+    results = _fit_chunks(features, chunks, first_fit, method, kwargs)
+    if sink is None:
+        return (_pack_results(features, _results) for _results in results)
+
+    _sink = _open_sink(sink)
+    try:
+        for _results in results:
+            _sink.write(_combine_results(_results))
+    finally:
+        _output = _sink.close()
+    return _output
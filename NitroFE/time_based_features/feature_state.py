@@ -0,0 +1,484 @@
+import copy
+import json
+import zlib
+import struct
+import types
+import importlib
+import numpy as np
+import pandas as pd
+from typing import Union
+
+
+STATE_MAGIC = b"NFES"
+STATE_VERSION = 1
+_HEADER = struct.Struct("<4sHI")
+_TAIL_TOLERANCE = 1e-10
+_ALIGNMENT = 8
+# operations outside NitroFE which a snapshot may reference without being passed to set_state
+_SNAPSHOT_OPERATIONS = frozenset(
+    f"numpy:{_name}"
+    for _name in (
+        "sum", "mean", "median", "std", "var", "min", "max", "prod", "ptp", "average",
+        "nansum", "nanmean", "nanmedian", "nanstd", "nanvar", "nanmin", "nanmax", "nanprod",
+        "argmin", "argmax", "nanargmin", "nanargmax", "abs", "absolute", "sqrt", "exp", "log",
+    )
+)
+
+
+class _StateEncoder:
+    """
+    Walks a feature object and encodes it into a JSON serializable tree, numeric values
+    (dataframe/series values, numeric indexes, arrays) being moved out into a flat list of arrays
+    """
+
+    def __init__(self):
+        self.arrays = []
+        self.objects = {}
+
+    def array(self, values: np.ndarray):
+        values = np.ascontiguousarray(values)
+        if values.dtype.hasobject:
+            raise ValueError("object arrays cannot be part of a feature state")
+        self.arrays.append(values)
+        return len(self.arrays) - 1
+
+    def index(self, index: pd.Index):
+        if isinstance(index, pd.RangeIndex):
+            return {"range": [index.start, index.stop, index.step]}
+        if (not index.dtype.hasobject) and (getattr(index, "tz", None) is None):
+            return {"index": self.array(index.to_numpy()), "name": self.encode(index.name)}
+        return {"labels": self.encode(list(index)), "name": self.encode(index.name)}
+
+    def encode(self, value):
+        if (value is None) or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, np.generic):
+            return {"scalar": self.array(np.asarray(value))}
+        if isinstance(value, np.ndarray):
+            return {"array": self.array(value)}
+        if isinstance(value, pd.DataFrame):
+            _dtypes = set(value.dtypes)
+            return {
+                "frame": [self.array(value.to_numpy())]
+                if len(_dtypes) == 1
+                else [self.array(value[_column].to_numpy()) for _column in value.columns],
+                "columns": self.index(value.columns),
+                "index": self.index(value.index),
+            }
+        if isinstance(value, pd.Series):
+            return {
+                "series": self.array(value.to_numpy()),
+                "name": self.encode(value.name),
+                "index": self.index(value.index),
+            }
+        if isinstance(value, pd.Index):
+            return {"pandas_index": self.index(value)}
+        if isinstance(value, list):
+            return {"list": [self.encode(_value) for _value in value]}
+        if isinstance(value, tuple):
+            return {"tuple": [self.encode(_value) for _value in value]}
+        if isinstance(value, dict):
+            return {
+                "dict": [
+                    [self.encode(_key), self.encode(_value)] for _key, _value in value.items()
+                ]
+            }
+        if isinstance(value, types.MethodType):
+            return {"method": value.__func__.__name__, "self": self.encode(value.__self__)}
+        if isinstance(value, (types.FunctionType, types.BuiltinFunctionType, np.ufunc)) or (
+            callable(value) and hasattr(value, "__wrapped__")
+        ):
+            return {"function": _function_path(value)}
+        if hasattr(value, "__dict__") and type(value).__module__.startswith("NitroFE"):
+            if id(value) in self.objects:
+                return {"ref": self.objects[id(value)]}
+            self.objects[id(value)] = len(self.objects)
+            _attributes = (
+                value._snapshot_attributes()
+                if isinstance(value, base_feature_state)
+                else vars(value)
+            )
+            return {
+                "object": f"{type(value).__module__}:{type(value).__qualname__}",
+                "id": self.objects[id(value)],
+                "attributes": {
+                    _key: self.encode(_value) for _key, _value in _attributes.items()
+                },
+            }
+        raise ValueError(
+            f"values of type {type(value).__name__} cannot be part of a feature state"
+        )
+
+
+class _StateDecoder:
+    """
+    Rebuilds the encoded tree, import paths resolve to NitroFE, the allowed numpy operations
+    and the operations passed to set_state only
+    """
+
+    def __init__(self, arrays: list, operations: dict = None):
+        self.arrays = arrays
+        self.operations = operations or {}
+        self.objects = {}
+
+    def index(self, node: dict):
+        if "range" in node:
+            return pd.RangeIndex(*node["range"])
+        if "index" in node:
+            return pd.Index(self.arrays[node["index"]], name=self.decode(node["name"]))
+        return pd.Index(self.decode(node["labels"]), name=self.decode(node["name"]))
+
+    def decode(self, node):
+        if not isinstance(node, dict):
+            return node
+        if "scalar" in node:
+            return self.arrays[node["scalar"]][()]
+        if "array" in node:
+            return self.arrays[node["array"]].copy()
+        if "frame" in node:
+            _columns, _index = self.index(node["columns"]), self.index(node["index"])
+            if len(node["frame"]) == 1:
+                return pd.DataFrame(
+                    self.arrays[node["frame"][0]].copy(), index=_index, columns=_columns
+                )
+            return pd.DataFrame(
+                {
+                    _position: self.arrays[_array]
+                    for _position, _array in enumerate(node["frame"])
+                },
+                index=_index,
+            ).set_axis(_columns, axis=1)
+        if "series" in node:
+            return pd.Series(
+                self.arrays[node["series"]].copy(),
+                index=self.index(node["index"]),
+                name=self.decode(node["name"]),
+            )
+        if "pandas_index" in node:
+            return self.index(node["pandas_index"])
+        if "list" in node:
+            return [self.decode(_value) for _value in node["list"]]
+        if "tuple" in node:
+            return tuple(self.decode(_value) for _value in node["tuple"])
+        if "dict" in node:
+            return {self.decode(_key): self.decode(_value) for _key, _value in node["dict"]}
+        if "method" in node:
+            _method = getattr(self.decode(node["self"]), node["method"], None)
+            if node["method"].startswith("__") or not isinstance(_method, types.MethodType):
+                raise ValueError(f"{node['method']} is not a method of a NitroFE feature")
+            return _method
+        if "function" in node:
+            return _resolve_path(node["function"], self.operations)
+        if "ref" in node:
+            return self.objects[node["ref"]]
+        if "object" in node:
+            _class = _resolve_path(node["object"])
+            if not isinstance(_class, type):
+                raise ValueError(f"{node['object']} is not a NitroFE class")
+            _object = _class.__new__(_class)
+            self.objects[node["id"]] = _object
+            _restore_attributes(_object, self.attributes(node))
+            return _object
+        raise ValueError(f"unknown feature state node {sorted(node)}")
+
+    def attributes(self, node: dict):
+        return {_key: self.decode(_value) for _key, _value in node["attributes"].items()}
+
+
+def _restore_attributes(feature, attributes: dict):
+    if isinstance(feature, base_feature_state):
+        feature._restore_snapshot(attributes)
+    else:
+        feature.__dict__.update(attributes)
+
+
+def _function_path(function):
+    _module = getattr(function, "__module__", None) or "numpy"
+    _name = getattr(function, "__qualname__", function.__name__)
+    if ("<lambda>" in _name) or ("<locals>" in _name):
+        raise ValueError(
+            f"{_name} is not importable, only module level functions can be part of a feature state"
+        )
+    if _import_path(f"{_module}:{_name}") is not function:
+        raise ValueError(f"{_module}.{_name} cannot be resolved back from its import path")
+    return f"{_module}:{_name}"
+
+
+def _import_path(path: str):
+    _module, _name = path.split(":")
+    value = importlib.import_module(_module)
+    for _attribute in _name.split("."):
+        value = getattr(value, _attribute)
+    return value
+
+
+def _resolve_path(path: str, operations: dict = None):
+    """
+    Object behind an import path of a snapshot, which is restricted to the NitroFE package,
+    the numpy operations of _SNAPSHOT_OPERATIONS and the operations given by path
+    """
+    if (operations is not None) and (path in operations):
+        return operations[path]
+    _module = path.split(":")[0]
+    if not (
+        (_module == "NitroFE")
+        or _module.startswith("NitroFE.")
+        or (path in _SNAPSHOT_OPERATIONS)
+    ):
+        raise ValueError(
+            f"{path} cannot be restored from a feature state, only NitroFE, common numpy "
+            "operations and the operations passed to set_state are"
+        )
+    return _import_path(path)
+
+
+def get_state(feature):
+    """
+    Serializes the fitted state of a NitroFE feature object into a compact binary snapshot
+
+    The snapshot holds a versioned, compressed header, describing the object tree, its configuration
+    and the import paths of its operations, followed by the numeric state as flat, 8 byte aligned arrays.
+    Lambdas and locally defined functions cannot be part of a snapshot. The per entity arrays of a
+    memory mapped state store stay in the store file, the snapshot references the file by its path.
+
+    Parameters
+    ----------
+    feature : object
+        NitroFE feature object, e.g. an indicator, a moving average or a weighted_window_features object
+
+    Returns
+    -------
+    bytes
+    """
+    encoder = _StateEncoder()
+    root = encoder.encode(feature)
+
+    _offset, _arrays = 0, []
+    for _array in encoder.arrays:
+        _arrays.append(
+            {"dtype": _array.dtype.str, "shape": list(_array.shape), "offset": _offset}
+        )
+        _offset += -(-_array.nbytes // _ALIGNMENT) * _ALIGNMENT
+    header = zlib.compress(
+        json.dumps({"root": root, "arrays": _arrays}, separators=(",", ":")).encode(), 1
+    )
+    header += b"\0" * (-(_HEADER.size + len(header)) % _ALIGNMENT)
+
+    buffer = bytearray(_HEADER.size + len(header) + _offset)
+    _HEADER.pack_into(buffer, 0, STATE_MAGIC, STATE_VERSION, len(header))
+    buffer[_HEADER.size : _HEADER.size + len(header)] = header
+    _start = _HEADER.size + len(header)
+    for _array, _spec in zip(encoder.arrays, _arrays):
+        _position = _start + _spec["offset"]
+        buffer[_position : _position + _array.nbytes] = _array.tobytes()
+    return bytes(buffer)
+
+
+def set_state(feature, state: bytes, operations: tuple = ()):
+    """
+    Restores a snapshot created by get_state into feature, which has to be of the same class.
+    feature then continues with first_fit=False exactly where the snapshotted object stopped
+
+    Only NitroFE classes and functions, common numpy operations (np.sum, np.mean, ...) and the
+    given operations are resolved from the snapshot, no other code is imported.
+
+    Parameters
+    ----------
+    feature : object
+        NitroFE feature object, freshly constructed or already fitted
+    state : bytes
+        snapshot created by get_state
+    operations : tuple, optional
+        module level operations outside NitroFE and numpy, e.g. self defined window operations,
+        which the snapshot references, by default ()
+
+    Returns
+    -------
+    object
+        feature
+    """
+    _magic, _version, _length = _HEADER.unpack_from(state, 0)
+    if _magic != STATE_MAGIC:
+        raise ValueError("state is not a NitroFE feature state snapshot")
+    if _version != STATE_VERSION:
+        raise ValueError(
+            f"feature state version {_version} not supported, supported version is {STATE_VERSION}"
+        )
+    header = json.loads(
+        zlib.decompressobj().decompress(bytes(state[_HEADER.size : _HEADER.size + _length]))
+    )
+    _start = _HEADER.size + _length
+    arrays = [
+        np.frombuffer(
+            state,
+            dtype=np.dtype(_spec["dtype"]),
+            count=int(np.prod(_spec["shape"], dtype=np.int64)),
+            offset=_start + _spec["offset"],
+        ).reshape(_spec["shape"])
+        if np.prod(_spec["shape"]) > 0
+        else np.empty(_spec["shape"], dtype=np.dtype(_spec["dtype"]))
+        for _spec in header["arrays"]
+    ]
+
+    _class_path = header["root"].get("object")
+    if _class_path != f"{type(feature).__module__}:{type(feature).__qualname__}":
+        raise ValueError(
+            f"state of {_class_path} cannot be restored into {type(feature).__qualname__}"
+        )
+    _decoder = _StateDecoder(
+        arrays,
+        {_function_path(_operation): _operation for _operation in operations},
+    )
+    _decoder.objects[header["root"]["id"]] = feature
+    _attributes = _decoder.attributes(header["root"])
+    feature.__dict__.clear()
+    _restore_attributes(feature, _attributes)
+    return feature
+
+
+def _exponential_lookback(alpha: float, tolerance: float):
+    """
+    Number of rows after which the weight left on older values, (1 - alpha) ** rows,
+    falls below tolerance. None for a tolerance of 0, every earlier row then counts
+    """
+    if tolerance <= 0:
+        return None
+    if alpha >= 1:
+        return 0
+    return int(np.ceil(np.log(tolerance) / np.log1p(-alpha)))
+
+
+def _sequential_lookback(*lookbacks):
+    """
+    Lookback of features applied one after the other, None if any of them is unbounded
+    """
+    if any(_lookback is None for _lookback in lookbacks):
+        return None
+    return sum(lookbacks)
+
+
+def _parallel_lookback(*lookbacks):
+    """
+    Lookback of features applied side by side to the same rows, None if any of them is unbounded
+    """
+    if any(_lookback is None for _lookback in lookbacks):
+        return None
+    return max(lookbacks)
+
+
+def _latest_rows(fit, lookback: int, dataframe, k: int, kwargs: dict):
+    """
+    Last k rows of fit(dataframe, first_fit=True, **kwargs), fitted over the last lookback + k rows only
+    """
+    if k < 1:
+        raise ValueError(f"k must be a positive integer, got {k}")
+    _n_rows = len(dataframe)
+    if (lookback is not None) and (lookback + k < _n_rows):
+        _start = _n_rows - lookback - k
+        kwargs = {
+            _key: _value.iloc[_start:]
+            if isinstance(_value, (pd.DataFrame, pd.Series)) and len(_value) == _n_rows
+            else _value
+            for _key, _value in kwargs.items()
+        }
+        dataframe = dataframe.iloc[_start:]
+    result = fit(dataframe, first_fit=True, **kwargs)
+    return result[-k:] if isinstance(result, np.ndarray) else result.iloc[-k:]
+
+
+class base_feature_state:
+    """
+    Adds get_state/set_state snapshots of the fitted continuation state to a feature class,
+    and latest, computing the most recent values over the rows they depend on only
+    """
+
+    # True for recursions which carry a missing (NaN or inf) value till the end of the history
+    _missing_values_persist = False
+
+    def _snapshot_attributes(self):
+        """
+        Attributes making up the get_state snapshot, by name
+        """
+        return vars(self)
+
+    def _restore_snapshot(self, attributes: dict):
+        """
+        Sets the attributes decoded from a get_state snapshot
+        """
+        self.__dict__.update(attributes)
+
+    def _tail_lookback(self, tolerance: float):
+        """
+        Number of rows preceding a value which it depends on, None when it depends on every earlier row
+        """
+        return None
+
+    def _detached_copy(self):
+        """
+        Copy of the feature whose fits leave the fitted state of this one unchanged, used by latest
+        """
+        return copy.deepcopy(self)
+
+    def latest(
+        self,
+        dataframe: Union[pd.DataFrame, pd.Series],
+        k: int = 1,
+        tolerance: float = _TAIL_TOLERANCE,
+        **kwargs
+    ):
+        """
+        Last k values of fit(dataframe, first_fit=True), computed over the last rows of the
+        dataframe they depend on, so that the cost does not grow with the length of the history.
+
+        Window based features use their exact lookback. Recursive (exponential) features drop the rows
+        whose weight in the latest values fell below tolerance. Features depending on the whole
+        history (e.g. SeriesWeightedAverage) fit all rows, as do recursions which never forget a missing
+        value (e.g. SmoothedMovingAverage) when the history holds one. The values are computed on a copy,
+        the fitted state is left unchanged and first_fit=False calls continue from the last fit.
+
+        Parameters
+        ----------
+        dataframe : Union[pd.DataFrame, pd.Series]
+            history of column values, in ascending order
+        k : int, optional
+            number of most recent values to compute, by default 1
+        tolerance : float, optional
+            weight below which older rows of recursive features are dropped, 0 keeps every row, by default 1e-10
+        kwargs :
+            additional keyword arguments of fit. Dataframes with as many rows as dataframe,
+            such as dataframe_for_weight, are cut along with it
+
+        Returns
+        -------
+        Union[pd.DataFrame, pd.Series]
+            last k rows of the fit result
+        """
+        _lookback = self._tail_lookback(tolerance)
+        if self._missing_values_persist and (
+            not np.isfinite(np.asarray(dataframe, dtype=np.float64)).all()
+        ):
+            _lookback = None
+        return _latest_rows(self._detached_copy().fit, _lookback, dataframe, k, kwargs)
+
+    def get_state(self):
+        """
+        Compact binary snapshot of the fitted state, see NitroFE.get_state
+
+        Returns
+        -------
+        bytes
+        """
+        return get_state(self)
+
+    def set_state(self, state: bytes, operations: tuple = ()):
+        """
+        Restores a snapshot created by get_state, see NitroFE.set_state
+
+        Parameters
+        ----------
+        state : bytes
+            snapshot created by get_state
+        operations : tuple, optional
+            module level operations outside NitroFE and numpy which the snapshot references, by default ()
+        """
+        return set_state(self, state, operations=operations)
@@ -6,9 +6,13 @@ from pandas.core.frame import DataFrame
 from NitroFE.time_based_features.moving_average_features.moving_average_features import (
     ExponentialMovingFeature,
 )
+from NitroFE.time_based_features.feature_state import (
+    base_feature_state,
+    _parallel_lookback,
+)
 
 
-class AbsolutePriceOscillator:
+class AbsolutePriceOscillator(base_feature_state):
     """
     Provided dataframe must be in ascending order.
     """
@@ -64,6 +68,20 @@ class AbsolutePriceOscillator:
         self.initialize_using_operation = initialize_using_operation
         self.initialize_span = initialize_span
 
+    def _tail_lookback(self, tolerance: float):
+        return _parallel_lookback(
+            *[
+                ExponentialMovingFeature(
+                    span=_span,
+                    initialize_using_operation=self.initialize_using_operation,
+                    initialize_span=self.initialize_span,
+                    ignore_na=self.ignore_na,
+                    times=self.times,
+                )._tail_lookback(tolerance)
+                for _span in [self.span_fast, self.span_slow]
+            ]
+        )
+
     def fit(self, dataframe: Union[pd.DataFrame, pd.Series], first_fit: bool = True):
         """
         For your training/initial fit phase (very first fit) use fit_first=True, and for any production/test implementation pass fit_first=False
@@ -5,13 +5,18 @@ from NitroFE.time_based_features.weighted_window_features.weighted_windows impor
     _equal_window,
     _identity_window,
 )
+from NitroFE.time_based_features.weighted_window_features.weighted_window_kernels import (
+    _window_nanargmax,
+    _window_nanargmin,
+)
 
 from NitroFE.time_based_features.weighted_window_features.weighted_window_features import (
     weighted_window_features,
 )
+from NitroFE.time_based_features.feature_state import base_feature_state
 
 
-class AroonOscillator:
+class AroonOscillator(base_feature_state):
     def __init__(
         self,
         lookback_period: int = 4,
@@ -29,10 +34,13 @@ class AroonOscillator:
         self.min_periods = min_periods
 
     def _calculate_aroon_up(self, x, look_back_period):
-        return x.argmax() / (look_back_period)
+        return _window_nanargmax(x) / (look_back_period)
 
     def _calculate_aroon_down(self, x, look_back_period):
-        return x.argmin() / (look_back_period)
+        return _window_nanargmin(x) / (look_back_period)
+
+    def _tail_lookback(self, tolerance: float):
+        return self.lookback_period - 1
 
     def fit(self, dataframe: Union[pd.DataFrame, pd.Series], first_fit: bool = True):
         """
@@ -63,6 +71,8 @@ class AroonOscillator:
             symmetric=None,
             operation=self._calculate_aroon_up,
             operation_args=(self.lookback_period,),
+            raw=True,
+            vectorized=True,
         )
         aroon_down = self._aroon_up_object._template_feature_calculation(
             function_name="aroon_down",
@@ -74,6 +84,8 @@ class AroonOscillator:
             symmetric=None,
             operation=self._calculate_aroon_down,
             operation_args=(self.lookback_period,),
+            raw=True,
+            vectorized=True,
         )
         aroon_value = 100 * (aroon_up - aroon_down)
 
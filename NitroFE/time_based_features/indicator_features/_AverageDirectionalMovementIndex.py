@@ -13,12 +13,21 @@ from NitroFE.time_based_features.weighted_window_features.weighted_windows impor
     _equal_window,
     _identity_window,
 )
+from NitroFE.time_based_features.weighted_window_features.weighted_window_kernels import (
+    _window_nanmax,
+    _window_nanmin,
+)
 from NitroFE.time_based_features.weighted_window_features.weighted_window_features import (
     weighted_window_features,
 )
+from NitroFE.time_based_features.feature_state import (
+    base_feature_state,
+    _parallel_lookback,
+    _sequential_lookback,
+)
 
 
-class AverageDirectionalMovementIndex:
+class AverageDirectionalMovementIndex(base_feature_state):
     def __init__(
         self,
         directional_movement_lookback_period: int = 4,
@@ -79,14 +88,35 @@ class AverageDirectionalMovementIndex:
 
     def _plus_dm(self, x, look_back_period):
         look_back_period = int(look_back_period / 2)
-        return np.max(x.iloc[look_back_period:]) - np.max(
-            x.iloc[0 : look_back_period - 1]
+        return _window_nanmax(x[..., look_back_period:]) - _window_nanmax(
+            x[..., 0 : look_back_period - 1]
         )
 
     def _minus_dm(self, x, look_back_period):
         look_back_period = int(look_back_period / 2)
-        return np.min(x.iloc[0 : look_back_period - 1]) - np.min(
-            x.iloc[look_back_period:]
+        return _window_nanmin(x[..., 0 : look_back_period - 1]) - _window_nanmin(
+            x[..., look_back_period:]
+        )
+
+    def _tail_lookback(self, tolerance: float):
+        _directional_movement = _sequential_lookback(
+            2 * self.directional_movement_lookback_period - 1,
+            ExponentialMovingFeature(
+                alpha=1 / (self.directional_movement_smoothing_period),
+                min_periods=self.directional_movement_smoothing_min_periods,
+            )._tail_lookback(tolerance),
+        )
+        return _sequential_lookback(
+            _parallel_lookback(
+                _directional_movement,
+                AverageTrueRange(
+                    true_range_lookback=self.true_range_lookback
+                )._tail_lookback(tolerance),
+            ),
+            ExponentialMovingFeature(
+                alpha=1 / (self.average_directional_movement_smoothing_period),
+                min_periods=self.average_directional_movement_min_periods,
+            )._tail_lookback(tolerance),
         )
 
     def fit(
@@ -146,6 +176,8 @@ class AverageDirectionalMovementIndex:
             symmetric=None,
             operation=self._plus_dm,
             operation_args=(self.directional_movement_lookback_period),
+            raw=True,
+            vectorized=True,
         )
         minus_dma = self._minus_dma_object._template_feature_calculation(
             function_name="minus_dma",
@@ -157,6 +189,8 @@ class AverageDirectionalMovementIndex:
             symmetric=None,
             operation=self._minus_dm,
             operation_args=(self.directional_movement_lookback_period),
+            raw=True,
+            vectorized=True,
         )
 
         names = (
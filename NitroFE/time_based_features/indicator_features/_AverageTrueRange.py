@@ -6,12 +6,17 @@ from NitroFE.time_based_features.weighted_window_features.weighted_windows impor
     _equal_window,
     _identity_window,
 )
+from NitroFE.time_based_features.weighted_window_features.weighted_window_kernels import (
+    _window_nanmax,
+    _window_nanmin,
+)
 from NitroFE.time_based_features.weighted_window_features.weighted_window_features import (
     weighted_window_features,
 )
+from NitroFE.time_based_features.feature_state import base_feature_state
 
 
-class AverageTrueRange:
+class AverageTrueRange(base_feature_state):
     def __init__(
         self,
         true_range_lookback: int = 4,
@@ -43,14 +48,22 @@ class AverageTrueRange:
         self.return_true_range = return_true_range
 
     def true_range(self, x):
+        _max, _min = _window_nanmax(x), _window_nanmin(x)
         return np.max(
             [
-                (np.max(x) - np.min(x)),
-                np.abs(np.max(x) - x.iloc[-1]),
-                np.abs(np.min(x) - x.iloc[-1]),
-            ]
+                (_max - _min),
+                np.abs(_max - x[..., -1]),
+                np.abs(_min - x[..., -1]),
+            ],
+            axis=0,
         )
 
+    def _tail_lookback(self, tolerance: float):
+        # both rolling windows of the average true range span true_range_lookback rows
+        if self.return_true_range:
+            return self.true_range_lookback - 1
+        return 2 * (self.true_range_lookback - 1)
+
     def fit(self, dataframe: Union[pd.DataFrame, pd.Series], first_fit: bool = True):
         """
         For your training/initial fit phase (very first fit) use fit_first=True, and for any production/test implementation pass fit_first=False
@@ -81,6 +94,8 @@ class AverageTrueRange:
                 symmetric=None,
                 operation=self.true_range,
                 operation_args=(),
+                raw=True,
+                vectorized=True,
             )
         )
         if self.return_true_range:
@@ -8,10 +8,15 @@ from NitroFE.time_based_features.weighted_window_features.weighted_windows impor
     _equal_window,
     _identity_window,
 )
+from NitroFE.time_based_features.weighted_window_features.weighted_window_kernels import (
+    _continuation_buffer,
+    _rolling_mean_std,
+)
 from NitroFE.time_based_features.indicator_features._TypicalValue import TypicalValue
+from NitroFE.time_based_features.feature_state import base_feature_state
 
 
-class BollingerBands:
+class BollingerBands(base_feature_state):
     def __init__(
         self,
         typical_value_lookback_period: int = 6,
@@ -46,6 +51,11 @@ class BollingerBands:
 
         self.standard_deviation_multiplier = standard_deviation_multiplier
 
+    def _tail_lookback(self, tolerance: float):
+        return (self.typical_value_lookback_period - 1) + (
+            self.moving_average_typical_value_lookback_period - 1
+        )
+
     def fit(
         self,
         dataframe: Union[pd.DataFrame, pd.Series],
@@ -71,40 +81,28 @@ class BollingerBands:
                 lookback_period=self.typical_value_lookback_period,
                 min_periods=self.typical_value_min_periods,
             )
-            self._ma_bollinger_bands_object = weighted_window_features()
-            self._std_bollinger_bands_object = weighted_window_features()
 
         _typical_value = self._typical_value_object.fit(
             dataframe=dataframe, first_fit=first_fit
         )
 
-        _moving_average_typical_value = (
-            self._ma_bollinger_bands_object._template_feature_calculation(
-                function_name="moving_average_typical_value",
-                win_function=_identity_window,
-                first_fit=first_fit,
-                dataframe=_typical_value,
-                window=self.moving_average_typical_value_lookback_period,
-                min_periods=self.moving_average_typical_value_min_periods,
-                symmetric=None,
-                operation=np.mean,
-                operation_args=(),
-            )
+        # moving average and standard deviation share one pass over the typical values,
+        # continued from the last window - 1 typical values of the previous run
+        _window = self.moving_average_typical_value_lookback_period
+        values = _continuation_buffer(
+            None if first_fit else self.typical_values_from_last_run,
+            _typical_value.to_numpy(dtype=np.float64).reshape(len(_typical_value), -1),
         )
-
-        _std_typical_value = (
-            self._std_bollinger_bands_object._template_feature_calculation(
-                function_name="moving_average_typical_value",
-                win_function=_identity_window,
-                first_fit=first_fit,
-                dataframe=_typical_value,
-                window=self.moving_average_typical_value_lookback_period,
-                min_periods=self.moving_average_typical_value_min_periods,
-                symmetric=None,
-                operation=np.std,
-                operation_args=(),
-            )
+        _mean, _std = _rolling_mean_std(
+            values, _window, self.moving_average_typical_value_min_periods
         )
+        _n_tail = len(values) - len(_typical_value)
+        self.typical_values_from_last_run = values[
+            max(len(values) - _window + 1, 0) :
+        ].copy()
+
+        _moving_average_typical_value = _mean[_n_tail:]
+        _std_typical_value = _std[_n_tail:]
 
         positive_band = (
             _moving_average_typical_value
@@ -118,12 +116,18 @@ class BollingerBands:
 
         if isinstance(dataframe, pd.Series):
             if dataframe.name is None:
-                positive_band.name = "positive_band"
-                negative_band.name = "negative_band"
+                columns = ["positive_band", "negative_band"]
             else:
-                positive_band.name = positive_band.name + "_positive_band"
-                negative_band.name = negative_band.name + "_negative_band"
-        elif isinstance(dataframe, pd.DataFrame):
-            positive_band.columns = positive_band.columns + "_positive_band"
-            negative_band.columns = negative_band.columns + "_negative_band"
-        return pd.concat([positive_band, negative_band], axis=1)
+                columns = [
+                    _typical_value.name + "_positive_band",
+                    _typical_value.name + "_negative_band",
+                ]
+        else:
+            columns = (_typical_value.columns + "_positive_band").append(
+                _typical_value.columns + "_negative_band"
+            )
+        return pd.DataFrame(
+            np.concatenate([positive_band, negative_band], axis=1),
+            index=_typical_value.index,
+            columns=columns,
+        )
@@ -1,16 +1,17 @@
 import numpy as np
 import pandas as pd
 from typing import Union, Callable
-from NitroFE.time_based_features.weighted_window_features.weighted_window_features import (
-    weighted_window_features,
+from NitroFE.time_based_features.weighted_window_features.weighted_window_kernels import (
+    _continuation_buffer,
+    _rolling_nansum,
 )
-from NitroFE.time_based_features.weighted_window_features.weighted_windows import (
-    _equal_window,
-    _identity_window,
+from NitroFE.time_based_features.weighted_window_features.weighted_window_jit import (
+    _compiled_adaptive_smoothing,
 )
+from NitroFE.time_based_features.feature_state import base_feature_state
 
 
-class ElasticSeriesWeightedAverage:
+class ElasticSeriesWeightedAverage(base_feature_state):
     def __init__(self, weight_sum_lookback: int = 4):
         """
         Parameters
@@ -41,7 +42,8 @@ class ElasticSeriesWeightedAverage:
         dataframe : Union[pd.DataFrame, pd.Series]
             dataframe containing column values
         dataframe_for_weight : Union[pd.DataFrame, pd.Series]
-            dataframe containing column values
+            dataframe containing weight values, one column shared by every dataframe column
+            or one column per dataframe column (matched by position)
         first_fit : bool, optional
             Rolling features require past "window" number of values for calculation.
             Use True, when calculating for training data { in which case last "window" number of values will be saved }
@@ -52,49 +54,55 @@ class ElasticSeriesWeightedAverage:
 
         """
 
-        if first_fit:
-            self._object = weighted_window_features()
-
-        rolling_sum = self._object._template_feature_calculation(
-            function_name="_lag_object",
-            win_function=_identity_window,
-            first_fit=first_fit,
-            dataframe=dataframe_for_weight,
-            window=self.weight_sum_lookback,
-            min_periods=1,
-            symmetric=None,
-            operation=np.sum,
-            operation_args=(),
-        ).fillna(0)
-
         if isinstance(dataframe, pd.Series):
             dataframe = dataframe.to_frame()
+        values = dataframe.to_numpy(dtype=np.float64)
+        weights = np.asarray(dataframe_for_weight, dtype=np.float64)
+        if len(weights) != len(values):
+            raise ValueError(
+                f"dataframe_for_weight has {len(weights)} rows, expected {len(values)} rows of dataframe"
+            )
+        weights = weights.reshape(len(values), -1)
+        if weights.shape[1] not in (1, values.shape[1]):
+            raise ValueError(
+                f"dataframe_for_weight must have one column or {values.shape[1]} columns, "
+                f"one per dataframe column, got {weights.shape[1]}"
+            )
 
-        eswa = pd.DataFrame(np.zeros(dataframe.shape), columns=dataframe.columns)
-        print(dataframe.shape)
-        print(eswa)
         if first_fit:
-            eswa = pd.concat([dataframe.iloc[:1], eswa])
+            _tail = None
+            _initial = values[:1].reshape(-1)
         else:
-            eswa = pd.concat([self.values_from_last_run, eswa])
-
-        eswa["_iloc"] = np.arange(len(eswa))
-        ll = [x for x in eswa.columns if x != "_iloc"]
+            if getattr(self, "values_from_last_run", None) is None:
+                raise ValueError(
+                    "First fit has not occured before. Kindly run first_fit=True for first fit instance,"
+                    "and then proceed with first_fit=False for subsequent fits "
+                )
+            _tail = self.weight_values_from_last_run
+            _initial = self.values_from_last_run.reshape(-1)
 
-        for r1, r2, r3, r4 in zip(
-            dataframe.iterrows(),
-            eswa[1:].iterrows(),
-            dataframe_for_weight.iterrows(),
-            rolling_sum.iterrows(),
-        ):
+        # the last weight_sum_lookback - 1 weights of the previous fit open the rolling sums
+        _weights = _continuation_buffer(_tail, weights)
+        _n_tail = 0 if _tail is None else len(_tail)
+        weight_sum = _rolling_nansum(_weights, self.weight_sum_lookback)[_n_tail:]
 
-            previous_eswa = eswa[eswa["_iloc"] == (r2[1]["_iloc"] - 1)][ll]
-            eswa.loc[eswa["_iloc"] == r2[1]["_iloc"], ll] = (
-                previous_eswa.fillna(0)
-                + ((r1[1] - previous_eswa) * (r3[1] / r4[1])).fillna(0)
-            ).values[0]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gain = np.broadcast_to(weights / weight_sum, values.shape).copy()
+        # a missing (NaN or inf) value or an undefined w/Wn leaves the average unchanged,
+        # an undefined previous average restarts from 0
+        gain[~np.isfinite(values) | ~np.isfinite(gain)] = 0
+        if len(values) > 0:
+            gain[0, ~np.isfinite(_initial)] = 0
+        values = np.where(gain == 0, 0.0, values)
 
-        res = eswa.iloc[1:][ll]
+        eswa = _compiled_adaptive_smoothing(
+            values, gain, np.where(np.isfinite(_initial), _initial, 0.0)
+        )
+        res = pd.DataFrame(eswa, columns=dataframe.columns)
 
-        self.values_from_last_run = eswa.iloc[-1:]
+        self.weight_values_from_last_run = _weights[
+            max(len(_weights) - (self.weight_sum_lookback - 1), 0) :
+        ].copy()
+        if len(eswa) > 0:
+            self.values_from_last_run = eswa[-1:].copy()
         return res
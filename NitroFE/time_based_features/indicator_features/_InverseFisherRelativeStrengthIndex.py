@@ -11,9 +11,16 @@ from NitroFE.time_based_features.weighted_window_features.weighted_windows impor
 from NitroFE.time_based_features.indicator_features._RelativeStrengthIndex import (
     RelativeStrengthIndex,
 )
+from NitroFE.time_based_features.feature_state import (
+    base_feature_state,
+    _sequential_lookback,
+)
+
 
+class InverseFisherRelativeStrengthIndex(base_feature_state):
+    # built on RelativeStrengthIndex
+    _missing_values_persist = True
 
-class InverseFisherRelativeStrengthIndex:
     def __init__(self, lookback_period: int = 8, lookback_for_inverse_fisher: int = 8):
         """
         Parameters
@@ -26,6 +33,12 @@ class InverseFisherRelativeStrengthIndex:
         self.lookback_period = lookback_period
         self.lookback_for_inverse_fisher = lookback_for_inverse_fisher
 
+    def _tail_lookback(self, tolerance: float):
+        return _sequential_lookback(
+            RelativeStrengthIndex(self.lookback_period)._tail_lookback(tolerance),
+            self.lookback_for_inverse_fisher - 1,
+        )
+
     def fit(self, dataframe: Union[pd.DataFrame, pd.Series], first_fit: bool = True):
         """
         Parameters
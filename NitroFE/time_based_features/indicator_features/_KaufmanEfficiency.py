@@ -8,9 +8,10 @@ from NitroFE.time_based_features.weighted_window_features.weighted_windows impor
     _equal_window,
     _identity_window,
 )
+from NitroFE.time_based_features.feature_state import base_feature_state
 
 
-class KaufmanEfficiency:
+class KaufmanEfficiency(base_feature_state):
     def __init__(self, lookback_period: int = 4, min_periods: int = None):
         """
         Parameters
@@ -24,10 +25,13 @@ class KaufmanEfficiency:
         self.min_periods = min_periods
 
     def _calculate_kaufman_efficiency(self, x):
-        up = np.abs(x.iloc[-1] - x.iloc[0])
-        down = np.abs(x.diff().fillna(0)).sum()
+        up = np.abs(x[..., -1] - x[..., 0])
+        down = np.nansum(np.abs(np.diff(x, axis=-1)), axis=-1)
         return up / down
 
+    def _tail_lookback(self, tolerance: float):
+        return self.lookback_period - 1
+
     def fit(self, dataframe: Union[pd.DataFrame, pd.Series], first_fit: bool = True):
         """
         For your training/initial fit phase (very first fit) use fit_first=True, and for any production/test implementation pass fit_first=False
@@ -57,6 +61,8 @@ class KaufmanEfficiency:
                 symmetric=None,
                 operation=self._calculate_kaufman_efficiency,
                 operation_args=(),
+                raw=True,
+                vectorized=True,
             )
         )
 
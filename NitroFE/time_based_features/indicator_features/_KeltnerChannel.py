@@ -14,9 +14,13 @@ from NitroFE.time_based_features.weighted_window_features.weighted_windows impor
 from NitroFE.time_based_features.moving_average_features.moving_average_features import (
     ExponentialMovingFeature,
 )
+from NitroFE.time_based_features.feature_state import (
+    base_feature_state,
+    _parallel_lookback,
+)
 
 
-class KeltnerChannel:
+class KeltnerChannel(base_feature_state):
     def __init__(
         self,
         ema_span: int = 8,
@@ -57,6 +61,18 @@ class KeltnerChannel:
         self.average_true_range_periods = average_true_range_periods
         self.atr_multiply = atr_multiply
 
+    def _tail_lookback(self, tolerance: float):
+        return _parallel_lookback(
+            AverageTrueRange(true_range_lookback=self.true_range_lookback)._tail_lookback(
+                tolerance
+            ),
+            ExponentialMovingFeature(
+                span=self.ema_span,
+                initialize_using_operation=self.initialize_using_operation,
+                initialize_span=self.initialize_span,
+            )._tail_lookback(tolerance),
+        )
+
     def fit(self, dataframe: Union[pd.DataFrame, pd.Series], first_fit: bool = True):
         """
         For your training/initial fit phase (very first fit) use fit_first=True, and for any production/test implementation pass fit_first=False
@@ -0,0 +1,85 @@
+import numpy as np
+from NitroFE.time_based_features.weighted_window_features.weighted_window_kernels import (
+    _window_nanmax,
+    _window_nanmin,
+)
+from NitroFE.time_based_features.weighted_window_features.ring_buffer import RingBuffer
+from NitroFE.time_based_features.keyed_state import keyed_entity_state
+
+
+class KeyedAverageTrueRange(keyed_entity_state):
+    """
+    Entity keyed AverageTrueRange, holding the state of all entities in columnar arrays.
+    The values of an entity are the same as AverageTrueRange fitted over its whole history
+    """
+
+    def __init__(
+        self,
+        true_range_lookback: int = 4,
+        average_true_range_span: int = 6,
+        true_range_min_periods: int = None,
+        average_true_range_periods: int = 1,
+        return_true_range: bool = False,
+    ):
+        """
+        Parameters
+        ----------
+        true_range_lookback : int, optional
+            Size of the rolling window for true range value calculation, by default 4
+        average_true_range_span : int, optional
+            Size of the rolling window for average true range value calculation, by default 6
+        true_range_min_periods : int, optional
+            Minimum number of observations in window required to have a value for true range calculation, by default None
+        average_true_range_periods : int, optional
+            Minimum number of observations in window required to have a value for average true range calculation , by default 1
+        return_true_range : bool, optional
+            If true, True range is returned instead of Average True range
+        """
+        self.true_range_lookback = true_range_lookback
+        self.average_true_range_span = average_true_range_span
+        self.true_range_min_periods = true_range_min_periods
+        self.average_true_range_periods = average_true_range_periods
+        self.return_true_range = return_true_range
+        self._output_names = (
+            ("true_range",) if return_true_range else ("average_true_range",)
+        )
+
+    def _initialize_state(self):
+        # same as AverageTrueRange, both windows are true_range_lookback long
+        self._values = RingBuffer(0, self.true_range_lookback)
+        self._true_range = RingBuffer(0, self.true_range_lookback)
+
+    @staticmethod
+    def _min_periods(min_periods: int, window: int):
+        return window if min_periods is None else min_periods
+
+    def _update_rows(self, rows: np.ndarray, values: np.ndarray):
+        _window = self.true_range_lookback
+
+        self._values.push(values, rows)
+        x = self._values.last(_window, rows)
+        _max, _min = _window_nanmax(x), _window_nanmin(x)
+        true_range = np.max(
+            [
+                (_max - _min),
+                np.abs(_max - x[..., -1]),
+                np.abs(_min - x[..., -1]),
+            ],
+            axis=0,
+        )
+        true_range[
+            (~np.isnan(x)).sum(axis=1)
+            < self._min_periods(self.true_range_min_periods, _window)
+        ] = np.nan
+        if self.return_true_range:
+            return true_range[:, np.newaxis]
+
+        self._true_range.push(true_range, rows)
+        x = self._true_range.last(_window, rows)
+        _counts = (~np.isnan(x)).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            average_true_range = np.nansum(x, axis=1) / _counts
+        average_true_range[
+            _counts < self._min_periods(self.average_true_range_periods, _window)
+        ] = np.nan
+        return average_true_range[:, np.newaxis]
@@ -0,0 +1,92 @@
+import numpy as np
+from NitroFE.time_based_features.weighted_window_features.weighted_window_kernels import (
+    _window_nanmax,
+    _window_nanmin,
+    _window_nanstd,
+)
+from NitroFE.time_based_features.weighted_window_features.ring_buffer import RingBuffer
+from NitroFE.time_based_features.keyed_state import keyed_entity_state
+
+
+class KeyedBollingerBands(keyed_entity_state):
+    """
+    Entity keyed BollingerBands, holding the state of all entities in columnar arrays.
+    The values of an entity are the same as BollingerBands fitted over its whole history
+    """
+
+    _output_names = ("positive_band", "negative_band")
+
+    def __init__(
+        self,
+        typical_value_lookback_period: int = 6,
+        typical_value_min_periods: int = None,
+        moving_average_typical_value_lookback_period: int = 6,
+        moving_average_typical_value_min_periods: int = None,
+        standard_deviation_multiplier: int = 2,
+    ):
+        """
+        Parameters
+        ----------
+        typical_value_lookback_period : int, optional
+            Size of the rolling window for typical value, by default 6
+        typical_value_min_periods : int, optional
+            Minimum number of observations in window required to have a value for typical value, by default None
+        moving_average_typical_value_lookback_period : int, optional
+            Size of the rolling window for moving average of typical value, by default 6
+        moving_average_typical_value_min_periods : int, optional
+            Minimum number of observations in window required to have a value for moving average of typical value, by default None
+        standard_deviation_multiplier : int, optional
+            standard deviation multiplier for upper and lower bollinger band, by default 2
+        """
+        self.typical_value_lookback_period = typical_value_lookback_period
+        self.typical_value_min_periods = typical_value_min_periods
+        self.moving_average_typical_value_lookback_period = (
+            moving_average_typical_value_lookback_period
+        )
+        self.moving_average_typical_value_min_periods = (
+            moving_average_typical_value_min_periods
+        )
+        self.standard_deviation_multiplier = standard_deviation_multiplier
+
+    def _initialize_state(self):
+        self._values = RingBuffer(0, self.typical_value_lookback_period)
+        self._typical_values = RingBuffer(
+            0, self.moving_average_typical_value_lookback_period
+        )
+
+    def _update_rows(self, rows: np.ndarray, values: np.ndarray):
+        _window = self.typical_value_lookback_period
+        _min_periods = (
+            _window
+            if self.typical_value_min_periods is None
+            else self.typical_value_min_periods
+        )
+        self._values.push(values, rows)
+        x = self._values.last(_window, rows)
+        _typical_value = (_window_nanmax(x) + _window_nanmin(x) + x[..., -1]) / 3
+        _typical_value[(~np.isnan(x)).sum(axis=1) < _min_periods] = np.nan
+
+        _window = self.moving_average_typical_value_lookback_period
+        _min_periods = (
+            _window
+            if self.moving_average_typical_value_min_periods is None
+            else self.moving_average_typical_value_min_periods
+        )
+        self._typical_values.push(_typical_value, rows)
+        x = self._typical_values.last(_window, rows)
+        _counts = (~np.isnan(x)).sum(axis=1)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            _moving_average_typical_value = np.nansum(x, axis=1) / _counts
+        _std_typical_value = _window_nanstd(x)
+        _moving_average_typical_value[_counts < _min_periods] = np.nan
+        _std_typical_value[_counts < _min_periods] = np.nan
+
+        positive_band = (
+            _moving_average_typical_value
+            + self.standard_deviation_multiplier * _std_typical_value
+        )
+        negative_band = (
+            _moving_average_typical_value
+            - self.standard_deviation_multiplier * _std_typical_value
+        )
+        return np.stack([positive_band, negative_band], axis=1)
@@ -0,0 +1,111 @@
+import numpy as np
+from NitroFE.time_based_features.keyed_state import keyed_entity_state
+
+
+class KeyedMovingAverageConvergenceDivergence(keyed_entity_state):
+    """
+    Entity keyed MovingAverageConvergenceDivergence, holding the state of all entities in columnar arrays.
+    The values of an entity are the same as MovingAverageConvergenceDivergence fitted over its whole history.
+    Only the 'mean' operations are available in keyed mode
+    """
+
+    _keyed_state = {
+        "_fast_weighted": np.nan,
+        "_fast_old_weight": 1.0,
+        "_fast_observations": 0,
+        "_slow_weighted": np.nan,
+        "_slow_old_weight": 1.0,
+        "_slow_observations": 0,
+        "_smoothing_weighted": np.nan,
+        "_smoothing_old_weight": 1.0,
+        "_smoothing_observations": 0,
+    }
+
+    def __init__(
+        self,
+        fast_period: int = 26,
+        slow_period: int = 12,
+        smoothing_period: int = 9,
+        fast_operation: str = "mean",
+        slow_operation: str = "mean",
+        smoothing_operation: str = "mean",
+        ignore_na: bool = False,
+        return_histogram=False,
+    ):
+        """
+        Parameters
+        ----------
+        fast_period : int, optional
+            specify decay in terms of span, for the fast moving feature, by default 26
+        slow_period : int, optional
+            specify decay in terms of span, for the slow moving feature, by default 12
+        smoothing_period : int, optional
+            specify decay in terms of span, for the smoothing moving feature, by default 9
+        fast_operation : str, {'mean'}
+            operation to be performed for the fast moving feature, by default 'mean'
+        slow_operation : str, {'mean'}
+            operation to be performed for the slow moving feature, by default 'mean'
+        smoothing_operation : str, {'mean'}
+            operation to be performed for the smoothing moving feature, by default 'mean'
+        ignore_na : bool, optional
+            Ignore missing values when calculating weights, by default False
+        return_histogram : bool, optional
+            If True, the macd histogram is returned instead of the smoothed signal line, by default False
+        """
+        for _operation in [fast_operation, slow_operation, smoothing_operation]:
+            if _operation != "mean":
+                raise ValueError(
+                    f"Operation {_operation} not supported in keyed mode, only 'mean' is supported"
+                )
+
+        self.span_fast = fast_period
+        self.span_slow = slow_period
+        self.smoothing_period = smoothing_period
+        self.fast_operation = fast_operation
+        self.slow_operation = slow_operation
+        self.smoothing_operation = smoothing_operation
+        self.ignore_na = ignore_na
+        self.return_histogram = return_histogram
+        self._output_names = ("macd_histogram",) if return_histogram else ("macd",)
+
+    def _exponential_update(self, name: str, rows: np.ndarray, values: np.ndarray, span: int):
+        """
+        One step of pandas ewm(span=span, adjust=False).mean() for every row
+        """
+        alpha = 2.0 / (span + 1.0)
+        weighted = getattr(self, f"_{name}_weighted")[rows]
+        old_weight = getattr(self, f"_{name}_old_weight")[rows]
+        observations = getattr(self, f"_{name}_observations")
+
+        _is_observation = ~np.isnan(values)
+        _has_weighted = ~np.isnan(weighted)
+        observations[rows] += _is_observation
+
+        old_weight = np.where(
+            _has_weighted & (_is_observation | (not self.ignore_na)),
+            old_weight * (1.0 - alpha),
+            old_weight,
+        )
+        _update = _has_weighted & _is_observation
+        with np.errstate(invalid="ignore"):
+            _updated = np.where(
+                weighted != values,
+                (old_weight * weighted + alpha * values) / (old_weight + alpha),
+                weighted,
+            )
+        weighted = np.where(
+            _update, _updated, np.where(_is_observation, values, weighted)
+        )
+        old_weight = np.where(_update, 1.0, old_weight)
+
+        getattr(self, f"_{name}_weighted")[rows] = weighted
+        getattr(self, f"_{name}_old_weight")[rows] = old_weight
+        return np.where(observations[rows] >= 1, weighted, np.nan)
+
+    def _update_rows(self, rows: np.ndarray, values: np.ndarray):
+        fast_em = self._exponential_update("fast", rows, values, self.span_fast)
+        slow_em = self._exponential_update("slow", rows, values, self.span_slow)
+        raw_macd = slow_em - fast_em
+
+        macd = self._exponential_update("smoothing", rows, raw_macd, self.smoothing_period)
+        return (raw_macd - macd if self.return_histogram else macd)[:, np.newaxis]
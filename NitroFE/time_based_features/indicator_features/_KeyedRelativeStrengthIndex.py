@@ -0,0 +1,69 @@
+import numpy as np
+from NitroFE.time_based_features.keyed_state import keyed_entity_state
+
+
+class KeyedRelativeStrengthIndex(keyed_entity_state):
+    """
+    Entity keyed RelativeStrengthIndex, holding the state of all entities in columnar arrays.
+    The values of an entity are the same as RelativeStrengthIndex fitted over its whole history
+    """
+
+    _keyed_state = {
+        "_last_value": np.nan,
+        "_n_values": 0,
+        "_up_sum": 0.0,
+        "_down_sum": 0.0,
+        "_up_smoothed": 0.0,
+        "_down_smoothed": 0.0,
+    }
+    _output_names = ("rsi",)
+
+    def __init__(self, lookback_period: int = 8):
+        """
+        Parameters
+        ----------
+        lookback_period : int, optional
+            Size of the rolling window for lookback, by default 8
+        """
+        self.lookback_period = lookback_period
+
+    def _smoothed_update(
+        self,
+        smoothed: np.ndarray,
+        total: np.ndarray,
+        rows: np.ndarray,
+        values: np.ndarray,
+        n_values: np.ndarray,
+    ):
+        """
+        SmoothedMovingAverage step, 0 during warm up, then the mean of the first
+        lookback_period values, then (previous * (lookback_period - 1) + value) / lookback_period
+        """
+        _lookback = self.lookback_period
+        _warm_up = n_values < _lookback
+        total[rows[_warm_up]] += np.nan_to_num(values[_warm_up])
+        smoothed[rows] = np.where(
+            _warm_up,
+            np.where(n_values == _lookback - 1, total[rows] / _lookback, 0.0),
+            (smoothed[rows] * (_lookback - 1) + values) / _lookback,
+        )
+        return smoothed[rows]
+
+    def _update_rows(self, rows: np.ndarray, values: np.ndarray):
+        diff_val = values - self._last_value[rows]
+        up_value = np.where(np.isnan(diff_val), np.nan, np.where(diff_val > 0, diff_val, 0))
+        down_value = np.where(np.isnan(diff_val), np.nan, -np.where(diff_val < 0, diff_val, 0))
+
+        _n_values = self._n_values[rows]
+        smoothed_up_value = self._smoothed_update(
+            self._up_smoothed, self._up_sum, rows, up_value, _n_values
+        )
+        smoothed_down_value = self._smoothed_update(
+            self._down_smoothed, self._down_sum, rows, down_value, _n_values
+        )
+        self._last_value[rows] = values
+        self._n_values[rows] = _n_values + 1
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - 100 / (1 + (smoothed_up_value / smoothed_down_value))
+        return rsi[:, np.newaxis]
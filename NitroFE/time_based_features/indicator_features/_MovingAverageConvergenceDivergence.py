@@ -9,9 +9,13 @@ from NitroFE.time_based_features.indicator_features._AbsolutePriceOscillator imp
 from NitroFE.time_based_features.moving_average_features.moving_average_features import (
     ExponentialMovingFeature,
 )
+from NitroFE.time_based_features.feature_state import (
+    base_feature_state,
+    _sequential_lookback,
+)
 
 
-class MovingAverageConvergenceDivergence:
+class MovingAverageConvergenceDivergence(base_feature_state):
     """
     Provided dataframe must be in ascending order.
     """
@@ -77,6 +81,25 @@ class MovingAverageConvergenceDivergence:
         self.initialize_using_operation = initialize_using_operation
         self.initialize_span = initialize_span
 
+    def _tail_lookback(self, tolerance: float):
+        return _sequential_lookback(
+            AbsolutePriceOscillator(
+                fast_period=self.span_fast,
+                slow_period=self.span_slow,
+                initialize_using_operation=self.initialize_using_operation,
+                initialize_span=self.initialize_span,
+                ignore_na=self.ignore_na,
+                times=self.times,
+            )._tail_lookback(tolerance),
+            ExponentialMovingFeature(
+                span=self.smoothing_period,
+                ignore_na=self.ignore_na,
+                times=self.times,
+                initialize_using_operation=self.initialize_using_operation,
+                initialize_span=self.initialize_span,
+            )._tail_lookback(tolerance),
+        )
+
     def fit(
         self,
         dataframe: Union[pd.DataFrame, pd.Series],
@@ -6,9 +6,14 @@ from pandas.core.frame import DataFrame
 from NitroFE.time_based_features.moving_average_features.moving_average_features import (
     ExponentialMovingFeature,
 )
+from NitroFE.time_based_features.feature_state import (
+    base_feature_state,
+    _parallel_lookback,
+    _sequential_lookback,
+)
 
 
-class PercentageValueOscillator:
+class PercentageValueOscillator(base_feature_state):
     """
     Provided dataframe must be in ascending order.
     """
@@ -66,6 +71,19 @@ class PercentageValueOscillator:
         self.initialize_using_operation = initialize_using_operation
         self.initialize_span = initialize_span
 
+    def _tail_lookback(self, tolerance: float):
+        _fast, _slow, _smoothing = [
+            ExponentialMovingFeature(
+                span=_span,
+                initialize_using_operation=self.initialize_using_operation,
+                initialize_span=self.initialize_span,
+                ignore_na=self.ignore_na,
+                times=self.times,
+            )._tail_lookback(tolerance)
+            for _span in [self.span_fast, self.span_slow, self.span_smoothing]
+        ]
+        return _sequential_lookback(_parallel_lookback(_fast, _slow), _smoothing)
+
     def fit(
         self,
         dataframe: Union[pd.DataFrame, pd.Series],
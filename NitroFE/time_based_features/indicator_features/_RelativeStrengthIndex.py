@@ -16,9 +16,16 @@ from NitroFE.time_based_features.moving_average_features.moving_average_features
     TripleExponentialMovingFeature,
     SmoothedMovingAverage,
 )
+from NitroFE.time_based_features.feature_state import (
+    base_feature_state,
+    _sequential_lookback,
+)
+
 
+class RelativeStrengthIndex(base_feature_state):
+    # the gains and losses are smoothed by SmoothedMovingAverage
+    _missing_values_persist = True
 
-class RelativeStrengthIndex:
     def __init__(self, lookback_period: int = 8):
         """
         Parameters
@@ -29,13 +36,18 @@ class RelativeStrengthIndex:
         self.lookback_period = lookback_period
 
     def _diff_pos(self, x):
-        diff_val = x.iloc[-1] - x.iloc[-2]
-        return diff_val if diff_val > 0 else 0
+        diff_val = x[..., -1] - x[..., -2]
+        return np.where(diff_val > 0, diff_val, 0)[()]
 
     def _diff_neg(self, x):
-        diff_val = x.iloc[-1] - x.iloc[-2]
-        res = diff_val if diff_val < 0 else 0
-        return -res
+        diff_val = x[..., -1] - x[..., -2]
+        res = np.where(diff_val < 0, diff_val, 0)
+        return -res[()]
+
+    def _tail_lookback(self, tolerance: float):
+        return _sequential_lookback(
+            1, SmoothedMovingAverage(self.lookback_period)._tail_lookback(tolerance)
+        )
 
     def fit(self, dataframe: Union[pd.DataFrame, pd.Series], first_fit: bool = True):
         """
@@ -79,6 +91,8 @@ class RelativeStrengthIndex:
             symmetric=None,
             operation=self._diff_pos,
             operation_args=(),
+            raw=True,
+            vectorized=True,
         )
 
         down_value = self._down_object._template_feature_calculation(
@@ -91,6 +105,8 @@ class RelativeStrengthIndex:
             symmetric=None,
             operation=self._diff_neg,
             operation_args=(),
+            raw=True,
+            vectorized=True,
         )
 
         smoothed_up_value = self._up_smoothed.fit(
@@ -16,9 +16,13 @@ from NitroFE.time_based_features.moving_average_features.moving_average_features
     TripleExponentialMovingFeature,
     SmoothedMovingAverage,
 )
+from NitroFE.time_based_features.weighted_window_features.weighted_window_kernels import (
+    _continuation_buffer,
+)
+from NitroFE.time_based_features.feature_state import base_feature_state
 
 
-class SeriesWeightedAverage:
+class SeriesWeightedAverage(base_feature_state):
     def __init__(self):
         pass
 
@@ -48,48 +52,39 @@ class SeriesWeightedAverage:
         if isinstance(dataframe_for_weight, pd.Series):
             dataframe_for_weight = dataframe_for_weight.to_frame()
 
-        multiplication_res = (
-            pd.DataFrame(
-                np.multiply(dataframe.values, dataframe_for_weight.values),
-                columns=dataframe.columns,
-            )
-            if first_fit
-            else pd.concat(
-                [
-                    self.multiplication_values_from_last_run,
-                    pd.DataFrame(
-                        np.multiply(dataframe.values, dataframe_for_weight.values),
-                        columns=dataframe.columns,
-                    ),
-                ]
-            )
-        )
+        multiplication_res = np.multiply(dataframe.values, dataframe_for_weight.values)
 
+        # the running sums of the previous fit are carried as the first row of the expanding sums
         if not first_fit:
-            dataframe_for_weight = pd.concat(
-                [self.values_from_last_run, dataframe_for_weight]
+            multiplication_res = _continuation_buffer(
+                self.multiplication_values_from_last_run, multiplication_res
+            )
+            dataframe_for_weight = pd.DataFrame(
+                _continuation_buffer(
+                    self.values_from_last_run,
+                    dataframe_for_weight.to_numpy(dtype=np.float64),
+                ),
+                columns=dataframe_for_weight.columns,
             )
 
-        cumilative_res = dataframe_for_weight.expanding().sum()
+        cumilative_res = dataframe_for_weight.expanding().sum().values
 
-        cumilative_multiplication_res = multiplication_res.expanding().sum()
-        self.multiplication_values_from_last_run = cumilative_multiplication_res.iloc[
-            -1:
-        ]
+        cumilative_multiplication_res = (
+            pd.DataFrame(multiplication_res, columns=dataframe.columns)
+            .expanding()
+            .sum()
+            .values
+        )
+        self.multiplication_values_from_last_run = cumilative_multiplication_res[-1:]
 
         cumilative_multiplication_res = (
-            cumilative_multiplication_res.iloc[1:]
+            cumilative_multiplication_res[1:]
             if (not first_fit)
             else cumilative_multiplication_res
         )
-        cumilative_res = cumilative_res.iloc[1:] if (not first_fit) else cumilative_res
-        dataframe_for_weight = (
-            dataframe_for_weight.iloc[1:] if (not first_fit) else dataframe_for_weight
-        )
+        cumilative_res = cumilative_res[1:] if (not first_fit) else cumilative_res
 
-        res = pd.DataFrame(
-            cumilative_multiplication_res.values / (cumilative_res.values)
-        )
-        self.values_from_last_run = cumilative_res.iloc[-1:]
+        res = pd.DataFrame(cumilative_multiplication_res / cumilative_res)
+        self.values_from_last_run = cumilative_res[-1:]
 
         return res
@@ -8,9 +8,10 @@ from NitroFE.time_based_features.weighted_window_features.weighted_windows impor
     _equal_window,
     _identity_window,
 )
+from NitroFE.time_based_features.feature_state import base_feature_state
 
 
-class SeriesWeightedMovingFeature:
+class SeriesWeightedMovingFeature(base_feature_state):
     def __init__(
         self,
         lookback_period: int = 4,
@@ -35,6 +36,9 @@ class SeriesWeightedMovingFeature:
         self.operation = np.mean if operation == None else operation
         self.operation_args = operation_args
 
+    def _tail_lookback(self, tolerance: float):
+        return self.lookback_period - 1
+
     def fit(
         self,
         dataframe: Union[pd.DataFrame, pd.Series],
@@ -11,9 +11,13 @@ from NitroFE.time_based_features.weighted_window_features.weighted_windows impor
 from NitroFE.time_based_features.moving_average_features.moving_average_features import (
     TripleExponentialMovingFeature,
 )
+from NitroFE.time_based_features.feature_state import (
+    base_feature_state,
+    _sequential_lookback,
+)
 
 
-class TripleExponentialMovingAverageOscillator:
+class TripleExponentialMovingAverageOscillator(base_feature_state):
     def __init__(
         self,
         com: float = None,
@@ -67,7 +71,23 @@ class TripleExponentialMovingAverageOscillator:
         self.initialize_span = initialize_span
 
     def _ocs_value(self, x):
-        return (x.iloc[-1] - x.iloc[0]) / x.iloc[0]
+        return (x[..., -1] - x[..., 0]) / x[..., 0]
+
+    def _tail_lookback(self, tolerance: float):
+        return _sequential_lookback(
+            TripleExponentialMovingFeature(
+                com=self.com,
+                span=self.span,
+                halflife=self.halflife,
+                alpha=self.alpha,
+                min_periods=self.min_periods,
+                ignore_na=self.ignore_na,
+                initialize_using_operation=self.initialize_using_operation,
+                initialize_span=self.initialize_span,
+                times=self.times,
+            )._tail_lookback(tolerance),
+            1,
+        )
 
     def fit(
         self,
@@ -117,5 +137,7 @@ class TripleExponentialMovingAverageOscillator:
             symmetric=None,
             operation=self._ocs_value,
             operation_args=(),
+            raw=True,
+            vectorized=True,
         )
         return res
@@ -8,9 +8,14 @@ from NitroFE.time_based_features.weighted_window_features.weighted_windows impor
     _equal_window,
     _identity_window,
 )
+from NitroFE.time_based_features.weighted_window_features.weighted_window_kernels import (
+    _window_nanmax,
+    _window_nanmin,
+)
+from NitroFE.time_based_features.feature_state import base_feature_state
 
 
-class TypicalValue:
+class TypicalValue(base_feature_state):
     def __init__(self, lookback_period: int = 6, min_periods: int = None):
         """
         Parameters
@@ -24,7 +29,10 @@ class TypicalValue:
         self.min_periods = min_periods
 
     def _calculate_typical_value(self, x):
-        return (np.max(x) + np.min(x) + x.iloc[-1:]) / 3
+        return (_window_nanmax(x) + _window_nanmin(x) + x[..., -1]) / 3
+
+    def _tail_lookback(self, tolerance: float):
+        return self.lookback_period - 1
 
     def fit(self, dataframe: Union[pd.DataFrame, pd.Series], first_fit: bool = True):
         """
@@ -55,6 +63,8 @@ class TypicalValue:
             symmetric=None,
             operation=self._calculate_typical_value,
             operation_args=(),
+            raw=True,
+            vectorized=True,
         )
 
         return _typical_value
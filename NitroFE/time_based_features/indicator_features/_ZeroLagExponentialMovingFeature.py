@@ -11,9 +11,13 @@ from NitroFE.time_based_features.weighted_window_features.weighted_windows impor
 from NitroFE.time_based_features.moving_average_features.moving_average_features import (
     ExponentialMovingFeature,
 )
+from NitroFE.time_based_features.feature_state import (
+    base_feature_state,
+    _sequential_lookback,
+)
 
 
-class ZeroLagExponentialMovingFeature:
+class ZeroLagExponentialMovingFeature(base_feature_state):
     def __init__(
         self,
         lag_period: int = 5,
@@ -73,7 +77,23 @@ class ZeroLagExponentialMovingFeature:
         self.initialize_span = initialize_span
 
     def _sub_lag(self, x):
-        return 2 * x.iloc[-1] - x.iloc[0]
+        return 2 * x[..., -1] - x[..., 0]
+
+    def _tail_lookback(self, tolerance: float):
+        return _sequential_lookback(
+            max(int((self.lag_period - 1) / 2) - 1, 0),
+            ExponentialMovingFeature(
+                com=self.com,
+                span=self.span,
+                halflife=self.halflife,
+                alpha=self.alpha,
+                initialize_using_operation=self.initialize_using_operation,
+                initialize_span=self.initialize_span,
+                min_periods=self.min_periods,
+                ignore_na=self.ignore_na,
+                times=self.times,
+            )._tail_lookback(tolerance),
+        )
 
     def fit(
         self,
@@ -121,6 +141,8 @@ class ZeroLagExponentialMovingFeature:
             symmetric=None,
             operation=self._sub_lag,
             operation_args=(),
+            raw=True,
+            vectorized=True,
         )
 
         res = self._zlema_object.fit(
@@ -0,0 +1,376 @@
+import os
+import abc
+import copy
+import json
+import struct
+import numpy as np
+import pandas as pd
+from typing import Union
+from NitroFE.time_based_features.feature_state import base_feature_state
+from NitroFE.time_based_features.weighted_window_features.ring_buffer import RingBuffer
+
+
+STORE_MAGIC = b"NFKS"
+STORE_VERSION = 1
+_STORE_HEADER = struct.Struct("<4sHI")
+_STORE_ALIGNMENT = 64
+
+
+class keyed_entity_state(base_feature_state, abc.ABC):
+    """
+    Base of the entity keyed indicators. The streaming state of every entity (e.g. instrument)
+    is one row of columnar numpy arrays / one lane of ring buffers, so that a batch of
+    (entity_id, value) ticks updates all touched entities in a single vectorized call.
+
+    Subclasses declare their per entity arrays in ``_keyed_state`` (name -> initial value),
+    create their ring buffers in ``_initialize_state`` and implement ``_update_rows``
+    """
+
+    _keyed_state = {}
+    _output_names = ()
+
+    def _initialize_state(self):
+        pass
+
+    @abc.abstractmethod
+    def _update_rows(self, rows: np.ndarray, values: np.ndarray):
+        """
+        Applies one tick to every given state row, each row at most once, and returns
+        the new values, shape (rows, outputs)
+        """
+
+    def _reset_entities(self):
+        self.entity_ids = pd.Index([])
+        for _name, _fill in self._keyed_state.items():
+            setattr(self, _name, np.full(0, _fill))
+        self._initialize_state()
+
+    def _reset_rows(self, rows: np.ndarray):
+        for _name, _fill in self._keyed_state.items():
+            getattr(self, _name)[rows] = _fill
+        for _value in vars(self).values():
+            if isinstance(_value, RingBuffer):
+                _value.reset(rows)
+
+    def _state_arrays(self):
+        """
+        Every per entity array of the state, by name, entities along the first axis
+        """
+        arrays = {_name: getattr(self, _name) for _name in self._keyed_state}
+        for _attribute, _value in vars(self).items():
+            if isinstance(_value, RingBuffer):
+                for _name in ["values", "position", "count"]:
+                    arrays[f"{_attribute}.{_name}"] = getattr(_value, _name)
+        return arrays
+
+    def _set_state_array(self, name: str, array: np.ndarray):
+        _attribute, _, _name = name.rpartition(".")
+        setattr(getattr(self, _attribute) if _attribute else self, _name or name, array)
+
+    def _store_configuration(self):
+        return {
+            _key: _value
+            for _key, _value in vars(self).items()
+            if (not _key.startswith("_"))
+            and (_key != "entity_ids")
+            and isinstance(_value, (bool, int, float, str, type(None)))
+        }
+
+    def open_state_store(self, path: str, n_entities: int = None):
+        """
+        Keeps the per entity state in a memory mapped file on local disk instead of process memory.
+        The file has a fixed layout per feature and configuration, a header followed by one
+        aligned region per state array, holding n_entities rows each.
+
+        Entity ids are then the integers 0 to n_entities - 1. Several processes can open the
+        same file and update disjoint entity ranges, writes go straight into the shared mapping.
+        Create the file once (e.g. in the parent process) before the workers open it.
+
+        Reopening an existing file with a larger n_entities grows the store, the state of the
+        existing entities is kept and the new entities start empty. The file is rewritten, so
+        grow the store only while no other process has it open.
+
+        Parameters
+        ----------
+        path : str
+            path of the state file, created if it does not exist
+        n_entities : int, optional
+            number of entities, required when the file is created, by default None
+
+        Returns
+        -------
+        object
+            self
+        """
+        self._reset_entities()
+        _configuration = {
+            "feature": f"{type(self).__module__}:{type(self).__qualname__}",
+            "parameters": self._store_configuration(),
+        }
+
+        if not os.path.exists(path):
+            if n_entities is None:
+                raise ValueError("n_entities is required to create a new state store")
+            self._write_store(path, _configuration, n_entities)
+
+        header, _start = self._read_store_header(path, _configuration)
+        if (n_entities is not None) and (n_entities < header["n_entities"]):
+            raise ValueError(
+                f"state store {path} holds {header['n_entities']} entities, got n_entities={n_entities}, "
+                "a state store can only grow"
+            )
+        if (n_entities is not None) and (n_entities > header["n_entities"]):
+            _previous = np.memmap(path, dtype=np.uint8, mode="r")
+            self._write_store(
+                path, _configuration, n_entities, self._store_arrays(_previous, header, _start)
+            )
+            del _previous
+            header, _start = self._read_store_header(path, _configuration)
+
+        self._store = np.memmap(path, dtype=np.uint8, mode="r+")
+        for _name, _array in self._store_arrays(self._store, header, _start).items():
+            self._set_state_array(_name, _array)
+        self.entity_ids = pd.RangeIndex(header["n_entities"], name="entity_id")
+        return self
+
+    def _write_store(self, path: str, configuration: dict, n_entities: int, previous: dict = None):
+        """
+        Writes an empty state store for n_entities, with the state of previous (name -> array)
+        copied into its first rows
+        """
+        _offset, _layout = 0, []
+        for _name, _array in self._state_arrays().items():
+            _shape = [int(n_entities)] + list(_array.shape[1:])
+            _layout.append(
+                {"name": _name, "dtype": _array.dtype.str, "shape": _shape, "offset": _offset}
+            )
+            _nbytes = int(np.prod(_shape)) * _array.dtype.itemsize
+            _offset += -(-_nbytes // _STORE_ALIGNMENT) * _STORE_ALIGNMENT
+        header = json.dumps(dict(configuration, n_entities=int(n_entities), layout=_layout)).encode()
+        header += b" " * (-(_STORE_HEADER.size + len(header)) % _STORE_ALIGNMENT)
+
+        # written under a temporary name, so that no process opens a half written store
+        _temporary = f"{path}.{os.getpid()}.tmp"
+        with open(_temporary, "wb") as _file:
+            _file.write(_STORE_HEADER.pack(STORE_MAGIC, STORE_VERSION, len(header)))
+            _file.write(header)
+            _file.truncate(_STORE_HEADER.size + len(header) + max(_offset, 1))
+        _store = np.memmap(_temporary, dtype=np.uint8, mode="r+")
+        _arrays = self._store_arrays(
+            _store, {"layout": _layout}, _STORE_HEADER.size + len(header)
+        )
+        for _name, _array in _arrays.items():
+            _array[:] = self._initial_value(_name)
+            if previous is not None:
+                _array[: len(previous[_name])] = previous[_name]
+        _store.flush()
+        del _store, _arrays
+        os.replace(_temporary, path)
+
+    @staticmethod
+    def _read_store_header(path: str, configuration: dict):
+        """
+        Header of a state store and the offset of its first state array
+        """
+        with open(path, "rb") as _file:
+            _magic, _version, _length = _STORE_HEADER.unpack(_file.read(_STORE_HEADER.size))
+            if _magic != STORE_MAGIC:
+                raise ValueError(f"{path} is not a NitroFE state store")
+            if _version != STORE_VERSION:
+                raise ValueError(
+                    f"state store version {_version} not supported, supported version is {STORE_VERSION}"
+                )
+            header = json.loads(_file.read(_length))
+        if {_key: header[_key] for _key in configuration} != json.loads(
+            json.dumps(configuration)
+        ):
+            raise ValueError(
+                f"state store {path} was created for {header['feature']} with parameters "
+                f"{header['parameters']}, which do not match this feature"
+            )
+        return header, _STORE_HEADER.size + _length
+
+    @staticmethod
+    def _store_arrays(store: np.memmap, header: dict, start: int):
+        """
+        State arrays of a state store by name, as views into its mapping
+        """
+        return {
+            _spec["name"]: np.ndarray(
+                _spec["shape"], dtype=_spec["dtype"], buffer=store, offset=start + _spec["offset"]
+            )
+            for _spec in header["layout"]
+        }
+
+    def _snapshot_attributes(self):
+        """
+        A memory mapped state store is referenced by its path, its per entity arrays stay in the file
+        """
+        if getattr(self, "_store", None) is None:
+            return vars(self)
+        _in_store = set(self._keyed_state) | {"_store", "entity_ids"}
+        attributes = {
+            _key: _value
+            for _key, _value in vars(self).items()
+            if (_key not in _in_store) and not isinstance(_value, RingBuffer)
+        }
+        attributes["_store_path"] = self._store.filename
+        return attributes
+
+    def _restore_snapshot(self, attributes: dict):
+        _store_path = attributes.pop("_store_path", None)
+        self.__dict__.update(attributes)
+        if _store_path is not None:
+            self.open_state_store(_store_path)
+
+    def _detached_copy(self):
+        # the first fit of latest starts its entities afresh in memory, without the per entity
+        # arrays and without the state store
+        _in_store = set(self._keyed_state) | {"_store", "entity_ids"}
+        _copy = copy.copy(self)
+        _copy.__dict__ = copy.deepcopy(
+            {
+                _key: _value
+                for _key, _value in vars(self).items()
+                if (_key not in _in_store) and not isinstance(_value, RingBuffer)
+            }
+        )
+        return _copy
+
+    def _initial_value(self, name: str):
+        if name in self._keyed_state:
+            return self._keyed_state[name]
+        return np.nan if name.endswith(".values") else 0
+
+    def flush(self):
+        """
+        Writes the changes of a memory mapped state store to disk
+        """
+        if getattr(self, "_store", None) is not None:
+            self._store.flush()
+
+    def _add_entities(self, entity_ids: pd.Index):
+        if getattr(self, "_store", None) is not None:
+            raise ValueError(
+                f"entity ids of a state store must be integers from 0 to {len(self.entity_ids) - 1}, "
+                f"got {list(entity_ids[:5])}"
+            )
+        _n = len(entity_ids)
+        self.entity_ids = self.entity_ids.append(entity_ids)
+        for _name, _fill in self._keyed_state.items():
+            _array = getattr(self, _name)
+            setattr(self, _name, np.concatenate([_array, np.full(_n, _fill, dtype=_array.dtype)]))
+        for _value in vars(self).values():
+            if isinstance(_value, RingBuffer):
+                _value.add_lanes(_n)
+
+    def _entity_rows(self, entity_ids: pd.Index):
+        """
+        State row of every entity id, registering unseen entities with an empty state
+        """
+        if not hasattr(self, "entity_ids"):
+            self._reset_entities()
+        rows = self.entity_ids.get_indexer(entity_ids)
+        _new = rows < 0
+        if _new.any():
+            self._add_entities(entity_ids[_new].unique())
+            rows[_new] = self.entity_ids.get_indexer(entity_ids[_new])
+        return rows
+
+    @property
+    def n_entities(self):
+        return len(self.entity_ids) if hasattr(self, "entity_ids") else 0
+
+    def update(self, entity_ids, values):
+        """
+        Updates the state of the touched entities with a batch of ticks and returns their new values.
+        Ticks of the same entity are applied in batch order
+
+        Parameters
+        ----------
+        entity_ids : array-like
+            entity id (e.g. instrument) of every tick
+        values : array-like
+            value of every tick
+
+        Returns
+        -------
+        Union[pd.DataFrame, pd.Series]
+            feature value after every tick, indexed by entity id, in tick order
+        """
+        _entity_ids = pd.Index(entity_ids, name="entity_id")
+        _values = np.asarray(values, dtype=np.float64).reshape(-1)
+        if len(_entity_ids) != len(_values):
+            raise ValueError(
+                f"got {len(_entity_ids)} entity ids for {len(_values)} values, expected one id per value"
+            )
+
+        rows = self._entity_rows(_entity_ids)
+        result = np.full((len(rows), len(self._output_names)), np.nan)
+
+        # k-th tick of an entity within the batch goes into round k, every round touches an entity once
+        _order = np.argsort(rows, kind="stable")
+        _sorted = rows[_order]
+        _positions = np.arange(len(rows))
+        _group_start = np.maximum.accumulate(
+            np.where(np.r_[True, _sorted[1:] != _sorted[:-1]], _positions, 0)
+        )
+        _round = np.empty(len(rows), dtype=np.int64)
+        _round[_order] = _positions - _group_start
+
+        for _r in range(_round.max() + 1 if len(rows) > 0 else 0):
+            _ticks = _round == _r
+            result[_ticks] = self._update_rows(rows[_ticks], _values[_ticks])
+
+        if len(self._output_names) == 1:
+            return pd.Series(result[:, 0], index=_entity_ids, name=self._output_names[0])
+        return pd.DataFrame(result, index=_entity_ids, columns=list(self._output_names))
+
+    def fit(self, dataframe: Union[pd.DataFrame, pd.Series], first_fit: bool = True):
+        """
+        Runs the history of many entities through the keyed state, one column per entity id,
+        rows in ascending order. Afterwards, update continues every entity from its last row
+
+        Parameters
+        ----------
+        dataframe : Union[pd.DataFrame, pd.Series]
+            dataframe with one column per entity id
+        first_fit : bool, optional
+            If True, the state of all entities (only of the given entities, for a state store)
+            is reset before the fit, else the state of the given entities is continued, by default True
+
+        Returns
+        -------
+        pd.DataFrame
+            feature values, one column per entity id and output
+        """
+        if isinstance(dataframe, pd.Series):
+            dataframe = dataframe.to_frame()
+        if dataframe.columns.has_duplicates:
+            raise ValueError("keyed fit requires one column per entity id")
+        _in_store = getattr(self, "_store", None) is not None
+        if first_fit and (not _in_store):
+            self._reset_entities()
+
+        rows = self._entity_rows(dataframe.columns)
+        if first_fit and _in_store:
+            # other entities of a shared store may belong to other processes
+            self._reset_rows(rows)
+        values = dataframe.to_numpy(dtype=np.float64)
+        result = np.full(values.shape + (len(self._output_names),), np.nan)
+        for _position in range(values.shape[0]):
+            result[_position] = self._update_rows(rows, values[_position])
+
+        if len(self._output_names) == 1:
+            return pd.DataFrame(result[..., 0], index=dataframe.index, columns=dataframe.columns)
+        return pd.concat(
+            [
+                pd.DataFrame(
+                    result[..., _position],
+                    index=dataframe.index,
+                    columns=[f"{_column}_{_name}" for _column in dataframe.columns],
+                )
+                for _position, _name in enumerate(self._output_names)
+            ],
+            axis=1,
+        )
@@ -9,9 +9,23 @@ from NitroFE.time_based_features.weighted_window_features.weighted_windows impor
     _equal_window,
     _identity_window,
 )
+from NitroFE.time_based_features.weighted_window_features.weighted_window_kernels import (
+    _rolling_count,
+    _sliding_nanmax,
+    _continuation_buffer,
+    _exponential_filter,
+)
+from NitroFE.time_based_features.weighted_window_features.weighted_window_jit import (
+    _compiled_adaptive_smoothing,
+)
+from NitroFE.time_based_features.feature_state import (
+    base_feature_state,
+    _exponential_lookback,
+    _sequential_lookback,
+)
 
 
-class ExponentialMovingFeature:
+class ExponentialMovingFeature(base_feature_state):
     """
     Provided dataframe must be in ascending order.
     """
@@ -84,6 +98,29 @@ class ExponentialMovingFeature:
 
         return _return
 
+    def _tail_lookback(self, tolerance: float):
+        # time based or na ignoring decay does not follow the row count
+        if (self.times is not None) or self.ignore_na:
+            return None
+        if self.alpha is not None:
+            alpha = self.alpha
+        elif self.span is not None:
+            alpha = 2 / (self.span + 1)
+        elif self.com is not None:
+            alpha = 1 / (self.com + 1)
+        elif self.halflife is not None:
+            alpha = 1 - np.exp(np.log(0.5) / self.halflife)
+        else:
+            return None
+        _initialize = (
+            (self.initialize_span or self.span or 0)
+            if self.initialize_using_operation
+            else 0
+        )
+        return _sequential_lookback(
+            _exponential_lookback(alpha, tolerance), self.min_periods, _initialize
+        )
+
     def fit(self, dataframe: Union[pd.DataFrame, pd.Series], first_fit: bool = True):
         """
         For your training/initial fit phase (very first fit) use fit_first=True, and for any production/test implementation pass fit_first=False
@@ -105,8 +142,14 @@ class ExponentialMovingFeature:
                     "and then proceed with first_fit=False for subsequent fits "
                 )
             self.adjust = False
-            dataframe = pd.concat(
-                [self.last_values_from_previous_run, dataframe], axis=0
+            _input = dataframe
+            _values = _continuation_buffer(
+                self.last_values_from_previous_run, dataframe.to_numpy(dtype=np.float64)
+            )
+            dataframe = (
+                pd.Series(_values, name=dataframe.name)
+                if isinstance(dataframe, pd.Series)
+                else pd.DataFrame(_values, columns=dataframe.columns)
             )
         else:
 
@@ -146,12 +189,18 @@ class ExponentialMovingFeature:
         _return = self._perform_temp_operation(_dataframe)
 
         if not first_fit:
-            _return = _return.iloc[1:]
-        self.last_values_from_previous_run = _return.iloc[-1:]
+            _return = (
+                pd.Series(_return.to_numpy()[1:], index=_input.index, name=_input.name)
+                if isinstance(_input, pd.Series)
+                else pd.DataFrame(
+                    _return.to_numpy()[1:], index=_input.index, columns=_input.columns
+                )
+            )
+        self.last_values_from_previous_run = _return.to_numpy(dtype=np.float64)[-1:]
         return _return
 
 
-class HullMovingFeature:
+class HullMovingFeature(base_feature_state):
     """
     Provided dataframe must be in ascending order.
     """
@@ -183,6 +232,9 @@ class HullMovingFeature:
             np.ceil(self.window / 2)
         ), int(np.ceil(np.sqrt(self.window)))
 
+    def _tail_lookback(self, tolerance: float):
+        return (self.window - 1) + (self.window_square_root - 1)
+
     def fit(self, dataframe: Union[pd.DataFrame, pd.Series], first_fit: bool = True):
         """
         For your training/initial fit phase (very first fit) use fit_first=True, and for any production/test implementation pass fit_first=False
@@ -243,12 +295,10 @@ class _a_kaufman_efficiency:
         pass
 
     def _calculate_kaufman_efficiency(self, x):
-        up = np.abs(x.iloc[-1] - x.iloc[0])
-        down = np.abs(x.diff().fillna(0)).sum()
-        if down == 0:
-            return 0
-        else:
-            return up / down
+        up = np.abs(x[..., -1] - x[..., 0])
+        down = np.nansum(np.abs(np.diff(x, axis=-1)), axis=-1)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(down == 0, 0, up / down)[()]
 
     def fit(
         self,
@@ -274,13 +324,15 @@ class _a_kaufman_efficiency:
                 symmetric=None,
                 operation=self._calculate_kaufman_efficiency,
                 operation_args=(),
+                raw=True,
+                vectorized=True,
             )
         )
 
         return _kaufman_efficiency
 
 
-class KaufmanAdaptiveMovingAverage:
+class KaufmanAdaptiveMovingAverage(base_feature_state):
     """
     Provided dataframe must be in ascending order.
     """
@@ -310,6 +362,14 @@ class KaufmanAdaptiveMovingAverage:
         self.fast_ema_span = fast_ema_span
         self.slow_ema_span = slow_ema_span
 
+    def _tail_lookback(self, tolerance: float):
+        # the smoothing constant never falls below the square of the slower span constant
+        _smoothing = min(2 / (self.fast_ema_span + 1), 2 / (self.slow_ema_span + 1)) ** 2
+        return _sequential_lookback(
+            self.kaufman_efficiency_lookback_period - 1,
+            _exponential_lookback(_smoothing, tolerance),
+        )
+
     def fit(self, dataframe: Union[pd.DataFrame, pd.Series], first_fit: bool = True):
         """
         For your training/initial fit phase (very first fit) use fit_first=True, and for any production/test implementation pass fit_first=False
@@ -331,24 +391,17 @@ class KaufmanAdaptiveMovingAverage:
         if isinstance(dataframe, pd.Series):
             dataframe = dataframe.to_frame()
 
-        kma = pd.DataFrame(
-            np.zeros(dataframe.shape), columns=dataframe.columns, index=dataframe.index
-        )
         if first_fit:
-            kma = pd.concat(
-                [pd.DataFrame(np.zeros((1, kma.shape[1])), columns=kma.columns), kma]
-            )
             if self.kaufman_efficiency_min_periods == None:
                 _first_pervious = self.kaufman_efficiency_lookback_period - 2
             elif self.kaufman_efficiency_min_periods > 1:
                 _first_pervious = self.kaufman_efficiency_min_periods - 2
             else:
                 _first_pervious = 0
-
+            _initial = np.zeros(dataframe.shape[1])
         else:
-            kma = pd.concat([self.values_from_last_run, kma])
             _first_pervious = -1
-        kma["_iloc"] = np.arange(len(kma))
+            _initial = self.values_from_last_run
 
         _kaufman_efficiency = self._kaufman_object.fit(
             dataframe=dataframe,
@@ -357,37 +410,32 @@ class KaufmanAdaptiveMovingAverage:
             min_periods=self.kaufman_efficiency_min_periods,
         )
 
-        ll = [x for x in kma.columns if x != "_iloc"]
         SC = (
-            _kaufman_efficiency.copy()
+            _kaufman_efficiency.to_numpy(dtype=np.float64)
             * (2 / (self.fast_ema_span + 1) - 2 / (self.slow_ema_span + 1))
             + 2 / (self.slow_ema_span + 1)
         ) ** 2
 
         if first_fit:
-            SC.iloc[_first_pervious] = [0] * SC.shape[1]
-
-        for r1, r2, r3 in zip(
-            dataframe[(_first_pervious + 1) :].iterrows(),
-            kma[(1 + _first_pervious + 1) :].iterrows(),
-            SC[(_first_pervious + 1) :].iterrows(),
-        ):
-
-            previous_kama = kma[kma["_iloc"] == (r2[1]["_iloc"] - 1)][ll]
-
-            kma.loc[kma["_iloc"] == r2[1]["_iloc"], ll] = (
-                previous_kama
-                + np.multiply(r3[1].values, (r1[1].values - previous_kama.values))
-            ).values[0]
-
-        res = kma.iloc[1:][ll]
+            SC[_first_pervious] = 0
+
+        res = pd.DataFrame(
+            _compiled_adaptive_smoothing(
+                dataframe.to_numpy(dtype=np.float64),
+                SC,
+                _initial,
+                start=_first_pervious + 1,
+            ),
+            index=dataframe.index,
+            columns=dataframe.columns,
+        )
 
-        self.values_from_last_run = res.iloc[-1:]
+        self.values_from_last_run = res.to_numpy(dtype=np.float64)[-1:]
 
         return res
 
 
-class FractalAdaptiveMovingAverage:
+class FractalAdaptiveMovingAverage(base_feature_state):
     """
     Provided dataframe must be in ascending order.
     """
@@ -404,12 +452,77 @@ class FractalAdaptiveMovingAverage:
         self.lookback_period = lookback_period
         self.min_periods = min_periods
 
-    def _first_lb(self, x, first_len):
-        return (np.max(x) - np.min(x)) / first_len
+    def _tail_lookback(self, tolerance: float):
+        if self.lookback_period < 2:
+            return None
+        # smallest alpha, reached at the lower clip 0.01 of a_value
+        FC = (self.lookback_period) / 2
+        SC = self.lookback_period
+        oldN = (2 - 0.01) / 0.01
+        newN = ((SC - FC) * (oldN - 1) / (SC - 1)) + FC
+        return _sequential_lookback(
+            self.lookback_period - 1, _exponential_lookback(2 / (newN + 1), tolerance)
+        )
 
-    def _second_lb(self, x, first_len):
-        half = int((first_len) / 2)
-        return (np.max(x.iloc[:half]) - np.min(x.iloc[:half])) / half
+    def _lookback_ranges(self, values: np.ndarray):
+        """
+        (max - min) / length over the latest half, the older half and the whole lookback window
+        ending at every row, all three from one sliding max / min over half windows.
+        A window holding a NaN or inf value has no range, as np.max / np.min of the pandas
+        rolling windows, where inf is turned into NaN, returned NaN.
+        """
+        window = self.lookback_period
+        half = int((window) / 2)
+
+        # the values follow window - 1 empty rows, so that every window of the values is a full one
+        padded = np.full((window - 1 + len(values), values.shape[1]), np.nan)
+        padded[window - 1 :] = values
+        _missing = np.zeros(padded.shape, dtype=bool)
+        _missing[window - 1 :] = ~np.isfinite(values)
+        padded[_missing] = np.nan
+        _max = _sliding_nanmax(padded, half)
+        _min = -_sliding_nanmax(-padded, half)
+        _half_counts = _rolling_count(~np.isnan(padded), half)
+        _half_missing = _rolling_count(_missing, half)
+        _counts = _rolling_count(np.isfinite(values), window)
+        _whole_missing = _rolling_count(~np.isfinite(values), window)
+
+        _latest = np.arange(window - 1, len(padded))
+        _older = _latest - (window - half)
+        _whole_max = np.maximum(_max[_latest], _max[_older])
+        _whole_min = np.minimum(_min[_latest], _min[_older])
+        if window > 2 * half:
+            # the middle row of an odd window belongs to neither half
+            _middle = padded[_latest - half]
+            _whole_max = np.maximum(_whole_max, np.where(np.isnan(_middle), -np.inf, _middle))
+            _whole_min = np.minimum(_whole_min, np.where(np.isnan(_middle), np.inf, _middle))
+
+        # the older half of a window shorter than lookback_period holds its first values
+        _older = np.where(
+            _latest < 2 * (window - 1),
+            window - 1 + np.minimum(half - 1, _latest - (window - 1)),
+            _older,
+        )
+
+        def _half_range(rows):
+            return np.where(
+                (_half_counts[rows] > 0) & (_half_missing[rows] == 0),
+                _max[rows] - _min[rows],
+                np.nan,
+            )
+
+        _half_periods = half if self.min_periods is None else self.min_periods
+        _periods = window if self.min_periods is None else self.min_periods
+        first_res = np.where(
+            _half_counts[_latest] < _half_periods, np.nan, _half_range(_latest) / half
+        )
+        second_res = np.where(_counts < _periods, np.nan, _half_range(_older) / half)
+        third_res = np.where(
+            (_counts < _periods) | (_counts == 0) | (_whole_missing > 0),
+            np.nan,
+            (_whole_max - _whole_min) / window,
+        )
+        return first_res, second_res, third_res
 
     def fit(self, dataframe: Union[pd.DataFrame, pd.Series], first_fit: bool = True):
         """
@@ -426,68 +539,41 @@ class FractalAdaptiveMovingAverage:
             were saved during the last phase, will be utilized for calculation }, by default True
         """
 
-        if first_fit:
-            self._first_object = weighted_window_features()
-            self._second_object = weighted_window_features()
-            self._third_object = weighted_window_features()
-
         if isinstance(dataframe, pd.Series):
             dataframe = dataframe.to_frame()
 
-        fama = pd.DataFrame(
-            np.zeros(dataframe.shape), columns=dataframe.columns, index=dataframe.index
-        )
         if first_fit:
-            fama = pd.concat(
-                [pd.DataFrame(np.zeros((1, fama.shape[1])), columns=fama.columns), fama]
+            if self.lookback_period < 2:
+                raise ValueError(
+                    f"lookback_period must be at least 2, got {self.lookback_period}"
+                )
+            # validates the half window and min_periods the way pandas does
+            dataframe.rolling(
+                window=int((self.lookback_period) / 2), min_periods=self.min_periods
             )
+            _tail = None
+            _initial = np.zeros(dataframe.shape[1])
         else:
-            fama = pd.concat([self.values_from_last_run, fama])
-        fama["_iloc"] = np.arange(len(fama))
-        ll = [x for x in fama.columns if x != "_iloc"]
-
-        first_res = self._first_object._template_feature_calculation(
-            function_name="_first_object",
-            win_function=_identity_window,
-            first_fit=first_fit,
-            dataframe=dataframe,
-            window=int((self.lookback_period) / 2),
-            min_periods=self.min_periods,
-            symmetric=None,
-            operation=self._first_lb,
-            operation_args=(int((self.lookback_period) / 2)),
-        )
-
-        second_res = self._second_object._template_feature_calculation(
-            function_name="_second_object",
-            win_function=_identity_window,
-            first_fit=first_fit,
-            dataframe=dataframe,
-            window=self.lookback_period,
-            min_periods=self.min_periods,
-            symmetric=None,
-            operation=self._second_lb,
-            operation_args=(self.lookback_period),
-        )
-
-        third_res = self._third_object._template_feature_calculation(
-            function_name="_third_object",
-            win_function=_identity_window,
-            first_fit=first_fit,
-            dataframe=dataframe,
-            window=self.lookback_period,
-            min_periods=self.min_periods,
-            symmetric=None,
-            operation=self._first_lb,
-            operation_args=(self.lookback_period),
-        )
-        fractal_dimension = (
-            np.log(second_res + first_res) - np.log(third_res)
-        ) / np.log(2)
-        a_value = np.exp(-4.6 * (fractal_dimension - 1)).fillna(0)
-        a_value = pd.DataFrame(
-            np.where(a_value < 0.01, 0.01, a_value), columns=a_value.columns
-        )
+            if getattr(self, "last_values_from_previous_run", None) is None:
+                raise ValueError(
+                    "First fit has not occured before. Kindly run first_fit=True for first fit instance,"
+                    "and then proceed with first_fit=False for subsequent fits "
+                )
+            _tail = self.last_values_from_previous_run
+            _initial = self.values_from_last_run
+
+        values = _continuation_buffer(_tail, dataframe.to_numpy(dtype=np.float64))
+        _n_tail = 0 if _tail is None else len(_tail)
+
+        first_res, second_res, third_res = self._lookback_ranges(values)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fractal_dimension = (
+                np.log(second_res[_n_tail:] + first_res[_n_tail:])
+                - np.log(third_res[_n_tail:])
+            ) / np.log(2)
+            a_value = np.exp(-4.6 * (fractal_dimension - 1))
+        a_value[np.isnan(a_value)] = 0
+        a_value = np.where(a_value < 0.01, 0.01, a_value)
 
         FC = (self.lookback_period) / 2
         SC = self.lookback_period
@@ -495,22 +581,20 @@ class FractalAdaptiveMovingAverage:
         newN = ((SC - FC) * (oldN - 1) / (SC - 1)) + FC
         a_value = 2 / (newN + 1)
 
-        for r1, r2, r3 in zip(
-            dataframe.iterrows(), fama[1:].iterrows(), a_value.iterrows()
-        ):
-            previous_kama = fama[fama["_iloc"] == (r2[1]["_iloc"] - 1)][ll]
-            fama.loc[fama["_iloc"] == r2[1]["_iloc"], ll] = (
-                np.multiply(previous_kama.values, (1 - r3[1].values))
-                + np.multiply(r1[1].values, r3[1].values)
-            )[0]
-
-        res = fama.iloc[1:][ll]
+        res = pd.DataFrame(
+            _compiled_adaptive_smoothing(
+                values[_n_tail:], a_value, _initial, convex=True
+            ),
+            index=dataframe.index,
+            columns=dataframe.columns,
+        )
 
-        self.values_from_last_run = res.iloc[-1:]
+        self.last_values_from_previous_run = values[1 - self.lookback_period :].copy()
+        self.values_from_last_run = res.to_numpy(dtype=np.float64)[-1:]
         return res
 
 
-class TripleExponentialMovingFeature:
+class TripleExponentialMovingFeature(base_feature_state):
     """
     Provided dataframe must be in ascending order.
     """
@@ -568,6 +652,20 @@ class TripleExponentialMovingFeature:
         self.initialize_using_operation = initialize_using_operation
         self.initialize_span = initialize_span
 
+    def _tail_lookback(self, tolerance: float):
+        _lookback = ExponentialMovingFeature(
+            initialize_using_operation=self.initialize_using_operation,
+            initialize_span=self.initialize_span,
+            com=self.com,
+            span=self.span,
+            halflife=self.halflife,
+            alpha=self.alpha,
+            min_periods=self.min_periods,
+            ignore_na=self.ignore_na,
+            times=self.times,
+        )._tail_lookback(tolerance)
+        return _sequential_lookback(_lookback, _lookback, _lookback)
+
     def fit(self, dataframe: Union[pd.DataFrame, pd.Series], first_fit: bool = True):
 
         """
@@ -642,11 +740,13 @@ class TripleExponentialMovingFeature:
         return triple_exponential_average
 
 
-class SmoothedMovingAverage:
+class SmoothedMovingAverage(base_feature_state):
     """
     Provided dataframe must be in ascending order.
     """
 
+    _missing_values_persist = True
+
     def __init__(self, lookback_period: int = 4):
         """
         Parameters
@@ -656,6 +756,12 @@ class SmoothedMovingAverage:
         """
         self.lookback_period = lookback_period
 
+    def _tail_lookback(self, tolerance: float):
+        return _sequential_lookback(
+            self.lookback_period - 1,
+            _exponential_lookback(1 / self.lookback_period, tolerance),
+        )
+
     def fit(
         self,
         dataframe: Union[pd.DataFrame, pd.Series],
@@ -676,39 +782,36 @@ class SmoothedMovingAverage:
 
         """
 
-        if first_fit:
-            self._first_object = weighted_window_features()
-
         if isinstance(dataframe, pd.Series):
             dataframe = dataframe.to_frame()
+        values = dataframe.to_numpy(dtype=np.float64)
 
-        sma = pd.DataFrame(
-            np.zeros(dataframe.shape), columns=dataframe.columns, index=dataframe.index
-        )
         if first_fit:
-            sma.iloc[self.lookback_period - 1] = (
-                dataframe.iloc[: (self.lookback_period)].sum() / self.lookback_period
+            if len(values) < self.lookback_period:
+                raise ValueError(
+                    f"first fit requires at least lookback_period={self.lookback_period} rows, got {len(values)}"
+                )
+            # the average starts as the plain mean of the first lookback_period values
+            sma = np.zeros(values.shape)
+            sma[self.lookback_period - 1] = (
+                np.nansum(values[: self.lookback_period], axis=0) / self.lookback_period
+            )
+            sma[self.lookback_period :] = _exponential_filter(
+                values[self.lookback_period :],
+                1 / self.lookback_period,
+                sma[self.lookback_period - 1],
             )
         else:
-            sma = pd.concat([self.values_from_last_run, sma])
-
-        sma["_iloc"] = np.arange(len(sma))
-        ll = [x for x in sma.columns if x != "_iloc"]
-
-        _start_frame = self.lookback_period if first_fit else 0
-        _start_sma = self.lookback_period if first_fit else 1
-        for r1, r2 in zip(
-            dataframe[_start_frame:].iterrows(), sma[_start_sma:].iterrows()
-        ):
-
-            previous_kama = sma[sma["_iloc"] == (r2[1]["_iloc"] - 1)][ll]
-
-            sma.loc[sma["_iloc"] == r2[1]["_iloc"], ll] = (
-                (previous_kama * (self.lookback_period - 1) + r1[1])
-                / self.lookback_period
-            ).values[0]
+            if getattr(self, "values_from_last_run", None) is None:
+                raise ValueError(
+                    "First fit has not occured before. Kindly run first_fit=True for first fit instance,"
+                    "and then proceed with first_fit=False for subsequent fits "
+                )
+            sma = _exponential_filter(
+                values, 1 / self.lookback_period, self.values_from_last_run
+            )
 
-        res = sma[ll] if first_fit else sma.iloc[1:][ll]
+        res = pd.DataFrame(sma, index=dataframe.index, columns=dataframe.columns)
 
-        self.values_from_last_run = res.iloc[-1:]
+        self.values_from_last_run = sma[-1:].copy()
         return res
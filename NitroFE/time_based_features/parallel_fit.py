@@ -0,0 +1,366 @@
+import os
+import copy
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Union
+
+
+def _resolve_n_jobs(n_jobs: int, n_tasks: int):
+    """
+    Number of worker processes to use, -1 meaning one per cpu, never more than n_tasks
+    """
+    if n_jobs is None:
+        n_jobs = 1
+    if (n_jobs == 0) or (n_jobs < -1):
+        raise ValueError(f"n_jobs must be a positive integer or -1, got {n_jobs}")
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    return max(1, min(n_jobs, n_tasks))
+
+
+def _column_shards(n_columns: int, n_shards: int):
+    """
+    Splits n_columns positions into n_shards contiguous, equally sized position lists
+    """
+    return [
+        list(_positions)
+        for _positions in np.array_split(np.arange(n_columns), n_shards)
+        if len(_positions) > 0
+    ]
+
+
+def _share_frame(dataframe: pd.DataFrame):
+    """
+    Copies the values of a dataframe into a shared memory block, so that worker processes
+    can attach to them instead of receiving a pickled copy of the whole dataframe
+    """
+    values = dataframe.to_numpy(dtype=np.float64)
+    block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    np.ndarray(values.shape, dtype=np.float64, buffer=block.buf)[:] = values
+    return block, (block.name, values.shape)
+
+
+def _attach_frame(spec: tuple, positions: list, index: pd.Index, columns: list):
+    _name, _shape = spec
+    block = shared_memory.SharedMemory(name=_name)
+    try:
+        values = np.ndarray(_shape, dtype=np.float64, buffer=block.buf)
+        return pd.DataFrame(values[:, positions], index=index, columns=columns)
+    finally:
+        block.close()
+
+
+def _fit_shard(target, method: str, specs: dict, positions: list, index, columns, kwargs):
+    """
+    Worker process entry point, rebuilds the column shard from shared memory and
+    runs target.method over it, returning the result together with the updated target
+    """
+    frames = {
+        _key: _attach_frame(_spec, positions, index, columns)
+        for _key, _spec in specs.items()
+    }
+    _dataframe = frames.pop("dataframe")
+    result = getattr(target, method)(_dataframe, **frames, **kwargs)
+    return result, target
+
+
+def _run_shards(
+    targets: list,
+    method: str,
+    frames: dict,
+    shards: list,
+    n_jobs: int,
+    kwargs: dict,
+):
+    """
+    Runs targets[i].method over the columns shards[i] of frames in worker processes
+
+    Parameters
+    ----------
+    targets : list
+        one picklable object per shard
+    method : str
+        name of the method to run, it receives the "dataframe" frame as first argument,
+        the other frames as keyword arguments of the same name
+    frames : dict
+        dataframes sharing the same index and columns, transferred through shared memory
+    shards : list
+        column positions of every shard
+    n_jobs : int
+        number of worker processes
+    kwargs : dict
+        additional keyword arguments of method
+
+    Returns
+    -------
+    list
+        (result, updated target) for every shard, in shard order
+    """
+    _dataframe = frames["dataframe"]
+    blocks, specs = [], {}
+    try:
+        for _key, _frame in frames.items():
+            _block, specs[_key] = _share_frame(_frame)
+            blocks.append(_block)
+
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            futures = [
+                executor.submit(
+                    _fit_shard,
+                    _target,
+                    method,
+                    specs,
+                    _positions,
+                    _dataframe.index,
+                    list(_dataframe.columns[_positions]),
+                    kwargs,
+                )
+                for _target, _positions in zip(targets, shards)
+            ]
+            return [_future.result() for _future in futures]
+    finally:
+        for _block in blocks:
+            _block.close()
+            _block.unlink()
+
+
+def _is_state_object(value):
+    return hasattr(value, "__dict__") and type(value).__module__.startswith("NitroFE")
+
+
+def _is_column_labels(value, columns: list):
+    """
+    True for a list holding exactly the column labels, e.g. the columns saved at a first fit
+    """
+    if (not isinstance(value, list)) or (len(value) != len(columns)):
+        return False
+    try:
+        return value == list(columns)
+    except (ValueError, TypeError):
+        return False
+
+
+def _split_state(value, columns: list, shard_columns: list):
+    """
+    Restricts the column wise state held by a fitted object to the columns of one shard
+    """
+    if isinstance(value, pd.DataFrame):
+        _columns = set(columns)
+        if _columns.issubset(value.columns):
+            _shard_columns = set(shard_columns)
+            return value[
+                [
+                    _column
+                    for _column in value.columns
+                    if (_column in _shard_columns) or (_column not in _columns)
+                ]
+            ]
+        return value
+    if isinstance(value, np.ndarray) and value.ndim == 2 and value.shape[1] == len(columns):
+        return value[:, [list(columns).index(_column) for _column in shard_columns]]
+    if isinstance(value, dict):
+        return {
+            _key: _split_state(_value, columns, shard_columns)
+            for _key, _value in value.items()
+        }
+    if _is_column_labels(value, columns):
+        return list(shard_columns)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_split_state(_value, columns, shard_columns) for _value in value)
+    if _is_state_object(value):
+        _shard = copy.copy(value)
+        _shard.__dict__ = _split_state(value.__dict__, columns, shard_columns)
+        return _shard
+    return value
+
+
+def _merge_state(values: list, shard_columns: list):
+    """
+    Merges the column wise state of the per shard objects back, column shard by column shard
+    """
+    first = values[0]
+    if isinstance(first, pd.DataFrame) and all(
+        isinstance(_value, pd.DataFrame) and set(_columns).issubset(_value.columns)
+        for _value, _columns in zip(values, shard_columns)
+    ):
+        _all_columns = {_column for _columns in shard_columns for _column in _columns}
+        _extra_columns = [_column for _column in first.columns if _column not in _all_columns]
+        return pd.concat(
+            [_value[list(_columns)] for _value, _columns in zip(values, shard_columns)]
+            + [first[_extra_columns]],
+            axis=1,
+        )
+    if (
+        isinstance(first, np.ndarray)
+        and first.ndim == 2
+        and all(
+            isinstance(_value, np.ndarray)
+            and _value.ndim == 2
+            and _value.shape[1] == len(_columns)
+            for _value, _columns in zip(values, shard_columns)
+        )
+    ):
+        return np.concatenate(values, axis=1)
+    if isinstance(first, dict):
+        return {
+            _key: _merge_state([_value[_key] for _value in values], shard_columns)
+            for _key in first.keys()
+        }
+    if all(
+        _is_column_labels(_value, _columns)
+        for _value, _columns in zip(values, shard_columns)
+    ):
+        return [_column for _columns in shard_columns for _column in _columns]
+    if isinstance(first, (list, tuple)) and all(
+        len(_value) == len(first) for _value in values
+    ):
+        return type(first)(
+            _merge_state(list(_values), shard_columns) for _values in zip(*values)
+        )
+    if _is_state_object(first):
+        _merged = copy.copy(first)
+        _merged.__dict__ = _merge_state([_value.__dict__ for _value in values], shard_columns)
+        return _merged
+    return first
+
+
+def _labelled_by_column(result: pd.DataFrame, columns: list, n_blocks: int, blockwise: bool):
+    """
+    True when every output label starts with "{column}_" of the column it was computed from,
+    for outputs laid out block by block or column by column
+    """
+    return all(
+        str(_label).startswith(
+            f"{columns[_position % len(columns)] if blockwise else columns[_position // n_blocks]}_"
+        )
+        for _position, _label in enumerate(result.columns)
+    )
+
+
+def _merge_results(results: list, shard_columns: list):
+    """
+    Concatenates the per shard results column wise. Features returning several blocks of
+    columns (such as positive and negative bands) are reassembled block by block, features
+    returning several columns per column (such as caluclate_multiple_window_features) stay
+    column by column
+    """
+    if isinstance(results[0], pd.Series):
+        return pd.concat(results, axis=1)
+    if isinstance(results[0], np.ndarray):
+        return np.concatenate(results, axis=1)
+    # results labelled with default integer columns are relabelled over the whole frame
+    _ignore_index = all(
+        _result.columns.equals(pd.RangeIndex(_result.shape[1])) for _result in results
+    )
+    _blocks = {
+        _result.shape[1] // len(_columns)
+        if _result.shape[1] % len(_columns) == 0
+        else None
+        for _result, _columns in zip(results, shard_columns)
+    }
+    if (len(_blocks) != 1) or (_blocks == {None}) or (_blocks == {1}):
+        return pd.concat(results, axis=1, ignore_index=_ignore_index)
+    _n_blocks = _blocks.pop()
+    if all(
+        _labelled_by_column(_result, _columns, _n_blocks, blockwise=False)
+        and not _labelled_by_column(_result, _columns, _n_blocks, blockwise=True)
+        for _result, _columns in zip(results, shard_columns)
+    ):
+        return pd.concat(results, axis=1, ignore_index=_ignore_index)
+    return pd.concat(
+        [
+            _result.iloc[:, _block * len(_columns) : (_block + 1) * len(_columns)]
+            for _block in range(_n_blocks)
+            for _result, _columns in zip(results, shard_columns)
+        ],
+        axis=1,
+        ignore_index=_ignore_index,
+    )
+
+
+def parallel_fit(
+    feature,
+    dataframe: Union[pd.DataFrame, pd.Series],
+    first_fit: bool = True,
+    n_jobs: int = -1,
+    method: str = "fit",
+    **kwargs
+):
+    """
+    Runs a NitroFE feature over column shards of the dataframe in worker processes
+
+    Column values are transferred to the workers through shared memory. The column wise state
+    saved by every shard (e.g. last_values_from_previous_run) is merged back into ``feature``,
+    so that subsequent first_fit=False calls work, both through parallel_fit and serially.
+
+    Parameters
+    ----------
+    feature : object
+        NitroFE feature object, e.g. an indicator, a moving average or a weighted_window_features object
+    dataframe : Union[pd.DataFrame, pd.Series]
+        dataframe containing column values to create feature over, values are treated as float64
+    first_fit : bool, optional
+        Indicator features require past values for calculation.
+        Use True, when calculating for training data (very first fit)
+        Use False, when calculating for subsequent testing/production data { in which case the values, which
+        were saved during the last phase, will be utilized for calculation }, by default True
+    n_jobs : int, optional
+        number of worker processes, -1 uses one process per cpu, by default -1
+    method : str, optional
+        method of feature to run, e.g. 'fit' or 'caluclate_barthann_feature', by default 'fit'
+    kwargs :
+        additional keyword arguments of method. Dataframes with the same index and columns as dataframe,
+        such as dataframe_for_weight, are sharded along with it
+
+    Returns
+    -------
+    Union[pd.DataFrame, pd.Series]
+        same as feature.method(dataframe, first_fit=first_fit, **kwargs)
+    """
+    if isinstance(dataframe, pd.Series) or (dataframe.shape[1] < 2):
+        return getattr(feature, method)(dataframe, first_fit=first_fit, **kwargs)
+    if hasattr(feature, "n_jobs"):
+        # features sharding their own plan over worker processes, such as
+        # weighted_rolling_window_engine, run with n_jobs workers
+        _n_jobs, feature.n_jobs = feature.n_jobs, n_jobs
+        try:
+            return getattr(feature, method)(dataframe, first_fit=first_fit, **kwargs)
+        finally:
+            feature.n_jobs = _n_jobs
+
+    n_jobs = _resolve_n_jobs(n_jobs, dataframe.shape[1])
+    if n_jobs == 1:
+        return getattr(feature, method)(dataframe, first_fit=first_fit, **kwargs)
+    if dataframe.columns.has_duplicates:
+        raise ValueError("parallel_fit requires unique column labels")
+
+    frames = {"dataframe": dataframe}
+    for _key in list(kwargs.keys()):
+        if (
+            isinstance(kwargs[_key], pd.DataFrame)
+            and kwargs[_key].columns.equals(dataframe.columns)
+            and kwargs[_key].index.equals(dataframe.index)
+        ):
+            frames[_key] = kwargs.pop(_key)
+
+    columns = list(dataframe.columns)
+    shards = _column_shards(len(columns), n_jobs)
+    shard_columns = [[columns[_position] for _position in _shard] for _shard in shards]
+    targets = [
+        _split_state(feature, columns, _shard_columns) for _shard_columns in shard_columns
+    ]
+
+    outputs = _run_shards(
+        targets,
+        method,
+        frames,
+        shards,
+        n_jobs,
+        dict(kwargs, first_fit=first_fit),
+    )
+    feature.__dict__.update(
+        _merge_state([_target for _, _target in outputs], shard_columns).__dict__
+    )
+    return _merge_results([_result for _result, _ in outputs], shard_columns)
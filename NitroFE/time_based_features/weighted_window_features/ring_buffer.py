@@ -0,0 +1,90 @@
+import numpy as np
+
+
+class RingBuffer:
+    def __init__(self, n_lanes: int, capacity: int):
+        """
+        Fixed size circular buffer holding the last ``capacity`` values of ``n_lanes`` independent lanes
+        (e.g. one lane per column), so that appending a value never allocates
+
+        Parameters
+        ----------
+        n_lanes : int
+            number of independent lanes
+        capacity : int
+            number of most recent values kept per lane
+        """
+        if capacity < 1:
+            raise ValueError(f"capacity must be a positive integer, got {capacity}")
+        self.capacity = int(capacity)
+        self.values = np.full((int(n_lanes), self.capacity), np.nan, dtype=np.float64)
+        # next write position and number of stored values, per lane
+        self.position = np.zeros(int(n_lanes), dtype=np.int64)
+        self.count = np.zeros(int(n_lanes), dtype=np.int64)
+
+    @property
+    def n_lanes(self):
+        return self.values.shape[0]
+
+    def _lanes(self, lanes):
+        return np.arange(self.n_lanes) if lanes is None else np.asarray(lanes)
+
+    def push(self, values: np.ndarray, lanes: np.ndarray = None):
+        """
+        Appends one value per lane, overwriting the oldest value of full lanes
+
+        Parameters
+        ----------
+        values : np.ndarray
+            1D array with one value per lane
+        lanes : np.ndarray, optional
+            lanes the values belong to, by default all lanes
+        """
+        _lanes = self._lanes(lanes)
+        self.values[_lanes, self.position[_lanes]] = values
+        self.position[_lanes] = (self.position[_lanes] + 1) % self.capacity
+        self.count[_lanes] = np.minimum(self.count[_lanes] + 1, self.capacity)
+
+    def extend(self, block: np.ndarray, lanes: np.ndarray = None):
+        """
+        Appends a (rows, lanes) block of values, oldest row first
+        """
+        block = np.asarray(block, dtype=np.float64).reshape(len(block), -1)
+        for _row in block[-self.capacity :]:
+            self.push(_row, lanes)
+
+    def last(self, length: int, lanes: np.ndarray = None):
+        """
+        Last ``length`` values of every lane, oldest first, NaN padded in front
+        for lanes holding less than ``length`` values
+
+        Returns
+        -------
+        np.ndarray
+            2D array (lanes, length)
+        """
+        _lanes = self._lanes(lanes)
+        _offsets = np.arange(length) - length
+        _positions = (self.position[_lanes, np.newaxis] + _offsets) % self.capacity
+        result = self.values[_lanes[:, np.newaxis], _positions]
+        result[_offsets < -self.count[_lanes, np.newaxis]] = np.nan
+        return result
+
+    def add_lanes(self, n_lanes: int):
+        """
+        Appends n_lanes empty lanes
+        """
+        self.values = np.concatenate(
+            [self.values, np.full((int(n_lanes), self.capacity), np.nan)]
+        )
+        self.position = np.concatenate([self.position, np.zeros(int(n_lanes), dtype=np.int64)])
+        self.count = np.concatenate([self.count, np.zeros(int(n_lanes), dtype=np.int64)])
+
+    def reset(self, lanes: np.ndarray = None):
+        """
+        Empties the given lanes, by default all lanes
+        """
+        _lanes = self._lanes(lanes)
+        self.values[_lanes] = np.nan
+        self.position[_lanes] = 0
+        self.count[_lanes] = 0
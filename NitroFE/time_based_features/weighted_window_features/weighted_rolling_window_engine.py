@@ -1,220 +1,291 @@
-from weighted_window_features import (
-    caluclate_equal_feature,
-    caluclate_barthann_feature,
-    caluclate_bartlett_feature,
-    caluclate_blackman_feature,
-    caluclate_blackmanharris_feature,
-    caluclate_bohman_feature,
-    caluclate_cosine_feature,
-    caluclate_exponential_feature,
-    caluclate_flattop_feature,
-    caluclate_gaussian_feature,
-    caluclate_hamming_feature,
-    caluclate_hann_feature,
-    caluclate_kaiser_feature,
-    caluclate_parzen_feature,
-    caluclate_triang_feature,
+from NitroFE.time_based_features.weighted_window_features.weighted_window_features import (
+    weighted_window_features,
 )
+from NitroFE.time_based_features.weighted_window_features.weighted_windows import (
+    _WINDOW_FUNCTIONS,
+)
+from NitroFE.time_based_features.weighted_window_features.weighted_window_kernels import (
+    _native_operation_name,
+)
+from NitroFE.time_based_features.parallel_fit import (
+    _resolve_n_jobs,
+    _column_shards,
+    _run_shards,
+)
+from NitroFE.time_based_features.feature_state import base_feature_state
 
-
+import copy
+import inspect
 import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from typing import Union
 
 
-class weighted_rolling_window_engine:
-    def __init__(self):
-        self.function_mapper = {
-            "equal": caluclate_equal_feature,
-            "barthann": caluclate_barthann_feature,
-            "bartlett": caluclate_bartlett_feature,
-            "blackman": caluclate_blackman_feature,
-            "blackmanharris": caluclate_blackmanharris_feature,
-            "bohman": caluclate_bohman_feature,
-            "cosine": caluclate_cosine_feature,
-            "exponential": caluclate_exponential_feature,
-            "flattop": caluclate_flattop_feature,
-            "gaussian": caluclate_gaussian_feature,
-            "hamming": caluclate_hamming_feature,
-            "hann": caluclate_hann_feature,
-            "kaiser": caluclate_kaiser_feature,
-            "parzen": caluclate_parzen_feature,
-            "triang": caluclate_triang_feature,
-        }
+_FEATURE_GROUP = "weighted_window_features"
+# parameters of the pandas rolling callback, without effect on np.sum/np.mean configurations
+_CALLBACK_ONLY_PARAMS = ("operation_args", "raw", "vectorized")
+
+
+class weighted_rolling_window_engine(base_feature_state):
+    def __init__(self, n_threads: int = None, n_jobs: int = 1):
+        """
+        Parameters
+        ----------
+        n_threads : int, optional
+            Number of threads over which independent columns are calculated,
+            when None is passed, the ThreadPoolExecutor default is used, by default None
+        n_jobs : int, optional
+            Number of worker processes over which columns are sharded, -1 uses one process per cpu.
+            Column values are transferred to the workers through shared memory, by default 1
+        """
+        if (n_threads is not None) and (n_threads < 1):
+            raise ValueError(f"n_threads must be a positive integer, got {n_threads}")
+        _resolve_n_jobs(n_jobs, 1)
+        self.n_threads = n_threads
+        self.n_jobs = n_jobs
+        self.plan = None
+        self.output_columns = None
 
-    def fit(self, dataframe: Union[pd.DataFrame, pd.Series], payload: dict):
+    def fit(
+        self,
+        dataframe: Union[pd.DataFrame, pd.Series],
+        payload: dict = None,
+        first_fit: bool = True,
+    ):
         """
+        For your training/initial fit phase (very first fit) use first_fit=True, and for any production/test implementation pass first_fit=False
+
+        Payload structure, where every window specific parameter is either a single value, or a list holding one value per configuration ::
+
+            {
+                "column_name": {
+                    "weighted_window_features": {
+                        "barthann": {"window": [3, 4], "min_periods": [1, 2], "operation": [np.mean, np.sum]},
+                        "kaiser": {"window": 5, "beta": 7},
+                    }
+                }
+            }
+
         Parameters
         ----------
         dataframe :  Union[pd.DataFrame,pd.Series]
-            dataframe/series over which barthann weighted rolling window feature is to be constructed
-        payload : dict
-            payload containing feature generation information
+            dataframe/series over which weighted rolling window features are to be constructed
+        payload : dict, optional
+            payload containing feature generation information, only used when first_fit is True
+        first_fit : bool, optional
+            Indicator features require past values for calculation.
+            Use True, when calculating for training data (very first fit)
+            Use False, when calculating for subsequent testing/production data { in which case the values, which
+            were saved during the last phase, will be utilized for calculation }, by default True
 
         Returns
         -------
-        dict
+        pd.DataFrame
+            one column per feature configuration, named "{column}_{window_type}_{window}"
+        """
+        if isinstance(dataframe, pd.Series):
+            dataframe = dataframe.to_frame()
+
+        if first_fit:
+            self.plan = self._compile_plan(dataframe, payload)
+            self.output_columns = [
+                _name for _column_plan in self.plan for _name in _column_plan["names"]
+            ]
+        elif self.plan is None:
+            raise ValueError(
+                "First fit has not occured before. Kindly run first_fit=True for first fit instance,"
+                "and then proceed with first_fit=False for subsequent fits "
+            )
+
+        n_jobs = _resolve_n_jobs(self.n_jobs, len(self.plan))
+        if n_jobs == 1:
+            result = self._fit_plan(dataframe, first_fit=first_fit)
+        else:
+            shards = _column_shards(len(self.plan), n_jobs)
+            targets = []
+            for _shard in shards:
+                _target = copy.copy(self)
+                _target.plan = [self.plan[_position] for _position in _shard]
+                _target.n_jobs = 1
+                targets.append(_target)
+
+            outputs = _run_shards(
+                targets,
+                "_fit_plan",
+                {"dataframe": dataframe[[_plan["column"] for _plan in self.plan]]},
+                shards,
+                n_jobs,
+                {"first_fit": first_fit},
+            )
+            result = np.concatenate([_result for _result, _ in outputs], axis=1)
+            self.plan = [_plan for _, _target in outputs for _plan in _target.plan]
+
+        return pd.DataFrame(result, index=dataframe.index, columns=self.output_columns)
+
+    def _fit_plan(self, dataframe: pd.DataFrame, first_fit: bool):
+        """
+        Executes the compiled plan, one column plan per thread, into a single preallocated array
+        """
+        _widths = [len(_column_plan["names"]) for _column_plan in self.plan]
+        _offsets = np.concatenate([[0], np.cumsum(_widths)]).astype(int)
+        result = np.empty((len(dataframe), _offsets[-1]), dtype=np.float64)
+
+        def _run(column_plan, offset):
+            result[:, offset : offset + len(column_plan["names"])] = self._execute_column_plan(
+                column_plan, dataframe[column_plan["column"]], first_fit
+            )
+
+        with ThreadPoolExecutor(max_workers=self.n_threads) as executor:
+            _futures = [
+                executor.submit(_run, _column_plan, _offset)
+                for _column_plan, _offset in zip(self.plan, _offsets)
+            ]
+            for _future in _futures:
+                _future.result()
+
+        return result
+
+    def _compile_plan(self, dataframe: pd.DataFrame, payload: dict):
+        """
+        Validates the payload and compiles it into one execution plan per column, with
+        identical (column, window type, parameters) entries calculated only once
+        """
+        if not isinstance(payload, dict) or len(payload) == 0:
+            raise ValueError("payload must be a non empty dict")
+
+        plan, names = [], set()
+        for _column, _column_payload in payload.items():
+            if _column not in dataframe.columns:
+                raise ValueError(f"column {_column} from payload not in dataframe")
+            if not isinstance(_column_payload, dict) or (
+                _FEATURE_GROUP not in _column_payload
+            ):
+                raise ValueError(
+                    f"payload for column {_column} must hold a '{_FEATURE_GROUP}' dict"
+                )
+
+            _column_plan = {
+                "column": _column,
+                "native": [],
+                "callback": [],
+                "names": [],
+                "objects": None,
+            }
+            _seen = []
+            for _window_type, _window_payload in _column_payload[_FEATURE_GROUP].items():
+                for _params in self._expand_window_payload(_window_type, _window_payload):
+                    if (_window_type, _params) in _seen:
+                        continue
+                    _seen.append((_window_type, _params))
 
+                    _name = f"{_column}_{_window_type}_{_params['window']}"
+                    _suffix = 1
+                    while _name in names:
+                        _name = f"{_column}_{_window_type}_{_params['window']}_{_suffix}"
+                        _suffix += 1
+                    names.add(_name)
+
+                    # operation None is the np.sum/np.mean default of the window type
+                    _operation = _params.get("operation", None)
+                    _native = (
+                        _native_operation_name(
+                            np.mean if _operation is None else _operation,
+                            _params.get("operation_args", ()),
+                        )
+                        is not None
+                    ) and isinstance(_params["window"], (int, np.integer))
+                    _column_plan["native" if _native else "callback"].append(
+                        (len(_column_plan["names"]), _window_type, _params)
+                    )
+                    _column_plan["names"].append(_name)
+            plan.append(_column_plan)
+        return plan
+
+    def _expand_window_payload(self, window_type: str, window_payload: dict):
+        """
+        Expands the list valued parameters of one window type into one dict of parameters per configuration
         """
-        self.output_dict = {}
-        self.dataframe = dataframe
-        self.payload = payload
-
-        for _column_key in self.payload.keys():
-
-            if "weighted_window_features" in self.payload[_column_key].keys():
-                self.output_dict[_column_key] = {"weighted_window_features": {}}
-
-                for _window_keys in self.payload[_column_key][
-                    "weighted_window_features"
-                ].keys():
-                    if _window_keys in self.function_mapper.keys():
-
-                        self.output_dict[_column_key]["weighted_window_features"][
-                            _window_keys
-                        ] = {}
-                        dict_all = self.payload[_column_key][
-                            "weighted_window_features"
-                        ][_window_keys]
-
-                        feature_generated = []
-                        if isinstance(
-                            self.payload[_column_key]["weighted_window_features"][
-                                _window_keys
-                            ]["window"],
-                            int,
-                        ):
-                            iter_duration = 1
-                            resulting_feature = self.function_mapper[_window_keys](
-                                self.dataframe[_column_key],
-                                **self.payload[_column_key]["weighted_window_features"][
-                                    _window_keys
-                                ]
-                            )
-                            feature_generated.append(resulting_feature)
-
-                        else:
-                            iter_duration = len(
-                                self.payload[_column_key]["weighted_window_features"][
-                                    _window_keys
-                                ]["window"]
-                            )
-                            for _iter in range(iter_duration):
-                                resulting_feature = self.function_mapper[_window_keys](
-                                    self.dataframe[_column_key],
-                                    **dict(
-                                        zip(
-                                            dict_all.keys(),
-                                            np.array(list(dict_all.values()))[:, _iter],
-                                        )
-                                    )
-                                )
-                                feature_generated.append(resulting_feature)
-
-                        self.output_dict[_column_key]["weighted_window_features"][
-                            _window_keys
-                        ] = feature_generated
-        return self.output_dict
-
-
-df = pd.DataFrame({"a": np.arange(10), "b": np.arange(10) * 2})
-payload = {
-    "a": {
-        "weighted_window_features": {
-            "barthann": {
-                "window": [3, 4],
-                "min_periods": [1, 2],
-                "symmetric": [False, True],
-                "operation": [np.mean, np.mean],
-            },
-            "bartlett": {
-                "window": [3, 4],
-                "min_periods": [1, 2],
-                "symmetric": [False, True],
-                "operation": [np.mean, np.mean],
-            },
-            "equal": {
-                "window": 3,
-                "min_periods": 1,
-                "symmetric": False,
-                "operation": np.mean,
-            },
-            "blackman": {
-                "window": [3, 3],
-                "min_periods": [1, 1],
-                "symmetric": [False, True],
-                "operation": [np.mean, np.mean],
-            },
-            "blackmanharris": {
-                "window": [3, 3],
-                "min_periods": [1, 1],
-                "symmetric": [False, True],
-                "operation": [np.mean, np.mean],
-            },
-            "bohman": {
-                "window": [3, 3],
-                "min_periods": [1, 1],
-                "symmetric": [False, True],
-                "operation": [np.mean, np.mean],
-            },
-            "cosine": {
-                "window": [3, 3],
-                "min_periods": [1, 1],
-                "symmetric": [False, True],
-                "operation": [np.mean, np.mean],
-            },
-            "exponential": {
-                "window": [3, 5],
-                "min_periods": [1, 1],
-                "center": [1, None],
-                "symmetric": [False, True],
-                "tau": [1, 0.5],
-                "operation": [np.mean, np.mean],
-            },
-            "flattop": {
-                "window": [3, 6],
-                "min_periods": [2, 1],
-                "symmetric": [False, True],
-                "operation": [np.mean, np.sum],
-            },
-            "gaussian": {
-                "window": [3, 3],
-                "min_periods": [1, 1],
-                "symmetric": [False, True],
-                "std": [1, 2],
-                "operation": [np.mean, np.mean],
-            },
-            "hamming": {
-                "window": [3, 3],
-                "min_periods": [2, 1],
-                "symmetric": [False, True],
-                "operation": [np.mean, np.mean],
-            },
-            "hann": {
-                "window": [3, 3],
-                "min_periods": [2, 1],
-                "symmetric": [False, True],
-                "operation": [np.mean, np.mean],
-            },
-            "kaiser": {
-                "window": [3, 3],
-                "min_periods": [2, 1],
-                "symmetric": [False, True],
-                "beta": [7, 11],
-                "operation": [np.mean, np.mean],
-            },
-            "parzen": {
-                "window": [3, 3],
-                "min_periods": [2, 1],
-                "symmetric": [False, True],
-                "operation": [np.mean, np.mean],
-            },
-            "triang": {
-                "window": [3, 3],
-                "min_periods": [2, 1],
-                "symmetric": [False, True],
-                "operation": [np.mean, np.mean],
-            },
+        if window_type not in _WINDOW_FUNCTIONS:
+            raise ValueError(
+                f"window type {window_type} not supported, "
+                f"available window types are {tuple(_WINDOW_FUNCTIONS)}"
+            )
+        if not isinstance(window_payload, dict) or "window" not in window_payload:
+            raise ValueError(f"window missing for {window_type} payload")
+
+        _accepted = inspect.signature(
+            getattr(weighted_window_features, f"caluclate_{window_type}_feature")
+        ).parameters
+        for _key in window_payload:
+            if (_key not in _accepted) or (_key in ("self", "dataframe", "first_fit")):
+                raise ValueError(f"Unknown parameter {_key} for {window_type} payload")
+
+        _lengths = {
+            len(_value) for _value in window_payload.values() if isinstance(_value, list)
         }
-    }
-}
+        if len(_lengths) > 1:
+            raise ValueError(
+                f"list valued parameters of {window_type} payload must all have the same length"
+            )
+        _length = _lengths.pop() if _lengths else 1
+
+        configurations = []
+        for _iter in range(_length):
+            _params = {
+                _key: (_value[_iter] if isinstance(_value, list) else _value)
+                for _key, _value in window_payload.items()
+            }
+            _window, _min_periods = _params["window"], _params.get("min_periods", 1)
+            if isinstance(_window, (int, np.integer)):
+                if _window < 1:
+                    raise ValueError(
+                        f"window must be a positive integer, got {_window} for {window_type} payload"
+                    )
+                if (_min_periods is not None) and (_min_periods > _window):
+                    raise ValueError(
+                        f"min_periods {_min_periods} must be <= window {_window} for {window_type} payload"
+                    )
+            configurations.append(_params)
+        return configurations
+
+    def _execute_column_plan(self, column_plan: dict, series: pd.Series, first_fit: bool):
+        if first_fit:
+            column_plan["objects"] = {
+                "native": weighted_window_features(),
+                "callback": [weighted_window_features() for _ in column_plan["callback"]],
+            }
+        _objects = column_plan["objects"]
+        result = np.empty((len(series), len(column_plan["names"])), dtype=np.float64)
+
+        if len(column_plan["native"]) > 0:
+            _configurations = None
+            if first_fit:
+                _configurations = [
+                    dict(
+                        {
+                            _key: _value
+                            for _key, _value in _params.items()
+                            if _key not in _CALLBACK_ONLY_PARAMS
+                        },
+                        window_type=_window_type,
+                    )
+                    for _, _window_type, _params in column_plan["native"]
+                ]
+            result[
+                :, [_index for _index, _, _ in column_plan["native"]]
+            ] = _objects["native"].caluclate_multiple_window_features(
+                series,
+                configurations=_configurations,
+                first_fit=first_fit,
+                return_array=True,
+            )[:, 0, :]
+
+        for (_index, _window_type, _params), _object in zip(
+            column_plan["callback"], _objects["callback"]
+        ):
+            result[:, _index] = getattr(_object, f"caluclate_{_window_type}_feature")(
+                series, first_fit=first_fit, **_params
+            ).to_numpy(dtype=np.float64)
+
+        return result
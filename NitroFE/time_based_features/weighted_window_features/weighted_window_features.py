@@ -17,17 +17,66 @@ from NitroFE.time_based_features.weighted_window_features.weighted_windows impor
     _parzen_window,
     _triang_window,
     _weighted_moving_window,
+    _WINDOW_FUNCTIONS,
+    _WINDOW_DEFAULT_PARAMS,
 )
+from NitroFE.time_based_features.weighted_window_features.weighted_window_kernels import (
+    _native_operation_name,
+    _native_rolling_operation,
+    _batched_rolling_operation,
+    _multiple_native_rolling_operations,
+    _continuation_buffer,
+    _missing_as_nan,
+    _CONVOLUTION_MODES,
+    _FFT_WINDOW_THRESHOLD,
+)
+from NitroFE.time_based_features.weighted_window_features.ring_buffer import RingBuffer
+from NitroFE.time_based_features.weighted_window_features.weighted_window_jit import (
+    _jit_rolling_operation,
+    jit_available,
+)
+from NitroFE.time_based_features.feature_state import base_feature_state, _latest_rows
+
+import copy
+import inspect
+import warnings
 
 import numpy as np
 import pandas as pd
 from typing import Union, Callable
 
 
-class weighted_window_features:
-    def __init__(self):
+class weighted_window_features(base_feature_state):
+    def __init__(
+        self,
+        convolution_mode: str = "auto",
+        fft_window_threshold: int = _FFT_WINDOW_THRESHOLD,
+        jit: bool = False,
+    ):
+        """
+        Parameters
+        ----------
+        convolution_mode : str, {'auto','direct','fft'}
+            convolution used for np.sum/np.mean weighted window features. 'direct' computes the
+            sliding window products, 'fft' uses overlap-add FFT convolution, and 'auto' switches to
+            FFT convolution for windows of size fft_window_threshold and above, by default 'auto'
+        fft_window_threshold : int, optional
+            window size from which 'auto' convolution mode uses FFT convolution, by default 256
+        jit : bool, optional
+            If True, self defined operations are compiled with numba, when installed, together with the rolling loop.
+            The operation then receives every weighted window as a 1D numpy ndarray. When numba is missing or fails
+            to compile the operation, the pandas rolling apply is used instead. The backend which actually ran is
+            reported under self.params[feature_name]["backend"], by default False
+        """
+        if convolution_mode not in _CONVOLUTION_MODES:
+            raise ValueError(
+                f"convolution_mode {convolution_mode} not supported, "
+                f"available modes are {_CONVOLUTION_MODES}"
+            )
         self.params = {}
-        pass
+        self.convolution_mode = convolution_mode
+        self.fft_window_threshold = fft_window_threshold
+        self.jit = jit
 
     def first_fit_params_save(self, function_name, **kwargs):
 
@@ -49,6 +98,8 @@ class weighted_window_features:
         operation: Callable = np.mean,
         operation_args: tuple = (),
         last_values_from_calculated: bool = False,
+        raw: bool = False,
+        vectorized: bool = False,
         **kwargs
     ):
         _function_name = function_name
@@ -67,6 +118,16 @@ class weighted_window_features:
             self.params[_function_name][
                 "last_values_from_calculated"
             ] = last_values_from_calculated
+            self.params[_function_name]["raw"] = raw
+            self.params[_function_name]["vectorized"] = vectorized
+            self.params[_function_name]["jit"] = self.jit
+            self.params[_function_name]["win_function"] = win_function
+            self.params[_function_name]["is_series"] = isinstance(dataframe, pd.Series)
+            self.params[_function_name]["columns"] = (
+                dataframe.name
+                if isinstance(dataframe, pd.Series)
+                else list(dataframe.columns)
+            )
 
             self.first_fit_params_save(_function_name, kwargs=kwargs)
 
@@ -78,52 +139,410 @@ class weighted_window_features:
                     "First fit has not occured before. Kindly run first_fit=True for first fit instance,"
                     "and then proceed with first_fit=False for subsequent fits "
                 )
-            dataframe = pd.concat(
-                [
-                    self.params[_function_name]["last_values_from_previous_run"],
-                    dataframe,
-                ],
-                axis=0,
+            self._sync_ring_buffer_tail(_function_name)
+            dataframe = self._fitted_columns(_function_name, dataframe)
+            _tail = self.params[_function_name]["last_values_from_previous_run"]
+        else:
+            _tail = None
+            # validates window and min_periods the way pandas does
+            dataframe.rolling(
+                window=self.params[_function_name]["window"],
+                min_periods=self.params[_function_name]["min_periods"],
             )
+        _n_tail = 0 if _tail is None else len(_tail)
+        values = self._continuation_values(_tail, dataframe)
 
-        _return = dataframe.rolling(
-            window=self.params[_function_name]["window"],
-            min_periods=self.params[_function_name]["min_periods"],
-        ).agg(
-            lambda x: self.params[_function_name]["operation"](
-                win_function(
-                    data=x,
-                    window_size=self.params[_function_name]["window"],
-                    symmetric=self.params[_function_name]["symmetric"],
-                    **self.params[_function_name]["kwargs"]
+        _native_operation = _native_operation_name(
+            self.params[_function_name]["operation"],
+            self.params[_function_name]["operation_args"],
+        )
+        _integer_window = isinstance(
+            self.params[_function_name]["window"], (int, np.integer)
+        )
+        _return = None
+        if (_native_operation is not None) and _integer_window:
+            _backend = "native"
+            _return = self._native_feature_calculation(
+                _function_name, win_function, values, _native_operation, start=_n_tail
+            )
+        elif self.params[_function_name].get("vectorized", False) and _integer_window:
+            _backend = "vectorized"
+            _return = self._batched_feature_calculation(
+                _function_name, win_function, values, start=_n_tail
+            )
+        elif self.params[_function_name].get("jit", False) and _integer_window:
+            _backend = "jit"
+            _return = self._jit_feature_calculation(
+                _function_name, win_function, values
+            )
+        if _return is None:
+            _backend = "pandas"
+            _frame = dataframe
+            if _n_tail > 0:
+                _frame = (
+                    pd.Series(values[:, 0], name=dataframe.name)
+                    if isinstance(dataframe, pd.Series)
+                    else pd.DataFrame(values, columns=dataframe.columns)
+                )
+            _return = _frame.rolling(
+                window=self.params[_function_name]["window"],
+                min_periods=self.params[_function_name]["min_periods"],
+            ).apply(
+                lambda x: self.params[_function_name]["operation"](
+                    win_function(
+                        data=x,
+                        window_size=self.params[_function_name]["window"],
+                        symmetric=self.params[_function_name]["symmetric"],
+                        **self.params[_function_name]["kwargs"]
+                    ),
+                    *self.params[_function_name]["operation_args"]
                 ),
-                *self.params[_function_name]["operation_args"]
+                raw=self.params[_function_name].get("raw", False),
             )
-        )
-        if not first_fit:
-            _return = _return.iloc[
-                self.params[_function_name]["len_last_values_from_previous_run"] :
-            ]
+            _return = _return.to_numpy(dtype=np.float64).reshape(len(_frame), -1)
+        self.params[_function_name]["backend"] = _backend
+        _return = _return[_n_tail:]
 
-        if not self.params[_function_name]["last_values_from_calculated"]:
+        # the continuation state is the last window - 1 rows of the input (or output), as a small array
+        _last_values_from_previous_run = None
+        if self.params[_function_name]["window"] != 1:
             _last_values_from_previous_run = (
-                dataframe.iloc[1 - self.params[_function_name]["window"] :]
-                if self.params[_function_name]["window"] != 1
-                else None
+                _return
+                if self.params[_function_name]["last_values_from_calculated"]
+                else values
+            )[1 - self.params[_function_name]["window"] :].copy()
+        self.first_fit_params_save(
+            _function_name,
+            last_values_from_previous_run=_last_values_from_previous_run,
+            len_last_values_from_previous_run=0
+            if _last_values_from_previous_run is None
+            else len(_last_values_from_previous_run),
+        )
+        # the saved tail is the continuation state again, update() rebuilds its buffer from it
+        self.params[_function_name].pop("ring_buffer", None)
+
+        return self._frame_result(_return, dataframe)
+
+    def update(self, function_name: str, values):
+        """
+        Streaming update of an already fitted feature with a single new row
+
+        The last "window" values are kept in a fixed size ring buffer, so that a tick costs one weighted
+        window operation, without any DataFrame allocation. The output matches what the first_fit=False
+        batch call would produce for the same row, and batch and streaming calls can be interleaved.
+
+        Parameters
+        ----------
+        function_name : str
+            name of the fitted feature method, e.g. 'caluclate_barthann_feature'
+        values : Union[float, np.ndarray, list, pd.Series]
+            new value of every column, in the column order of the first fit.
+            A pd.Series is aligned on its index
+
+        Returns
+        -------
+        Union[float, np.ndarray]
+            float when the feature was fitted over a series, else one value per column
+        """
+        if (function_name not in self.params) or (
+            "last_values_from_previous_run" not in self.params[function_name]
+        ):
+            raise ValueError(
+                "First fit has not occured before. Kindly run first_fit=True for first fit instance,"
+                "and then proceed with update for subsequent rows "
             )
-        else:
-            _last_values_from_previous_run = (
-                _return.iloc[1 - self.params[_function_name]["window"] :]
-                if self.params[_function_name]["window"] != 1
-                else None
+        _params = self.params[function_name]
+        if not isinstance(_params["window"], (int, np.integer)):
+            raise ValueError("update is only supported for integer windows")
+        if _params["last_values_from_calculated"]:
+            raise ValueError("update is not supported with last_values_from_calculated=True")
+
+        _buffer = _params.get("ring_buffer")
+        if _buffer is None:
+            _buffer = self._build_ring_buffer(function_name)
+
+        if isinstance(values, pd.Series) and not _params["is_series"]:
+            values = values.reindex(_params["columns"])
+        _values = np.asarray(values, dtype=np.float64).reshape(-1)
+        if len(_values) != _buffer.n_lanes:
+            raise ValueError(
+                f"update expects {_buffer.n_lanes} values, one per fitted column, got {len(_values)}"
             )
+        _buffer.push(_values)
+        _params["ring_buffer_synced"] = False
+
+        result = self._window_operation(function_name, _buffer.last(int(_buffer.count[0])))
+        return float(result[0]) if _params["is_series"] else result
+
+    def latest(
+        self, dataframe: Union[pd.DataFrame, pd.Series], method: str, k: int = 1, **kwargs
+    ):
+        """
+        Last k values of a feature method fitted with first_fit=True, computed over the last
+        window - 1 + k rows of the dataframe only. The fitted params are left unchanged,
+        first_fit=False calls and update continue from the last fit
+
+        Parameters
+        ----------
+        dataframe : Union[pd.DataFrame, pd.Series]
+            history of column values, in ascending order
+        method : str
+            name of the feature method, e.g. 'caluclate_barthann_feature'
+        k : int, optional
+            number of most recent values to compute, by default 1
+        kwargs :
+            additional keyword arguments of method, e.g. window
+
+        Returns
+        -------
+        Union[pd.DataFrame, pd.Series, np.ndarray]
+            last k rows of the method result
+        """
+        _method = getattr(self, method)
+        if method == "caluclate_multiple_window_features":
+            _windows = [
+                _configuration.get("window")
+                for _configuration in (kwargs.get("configurations") or [])
+            ]
+        else:
+            _parameter = inspect.signature(_method).parameters.get("window")
+            _windows = [
+                kwargs.get(
+                    "window", None if _parameter is None else _parameter.default
+                )
+            ]
+        # time based (offset) windows do not span a fixed number of rows
+        _lookback = (
+            max(_windows) - 1
+            if _windows
+            and all(isinstance(_window, (int, np.integer)) for _window in _windows)
+            else None
+        )
+        return _latest_rows(
+            getattr(self._detached_copy(), method), _lookback, dataframe, k, kwargs
+        )
+
+    def _detached_copy(self):
+        # a first fit replaces the params of its feature, the params of the other features are shared
+        _copy = copy.copy(self)
+        _copy.params = dict(self.params)
+        return _copy
+
+    def _build_ring_buffer(self, function_name: str):
+        _params = self.params[function_name]
+        _buffer = RingBuffer(
+            n_lanes=1 if _params["is_series"] else len(_params["columns"]),
+            capacity=_params["window"],
+        )
+        if _params["last_values_from_previous_run"] is not None:
+            _buffer.extend(_params["last_values_from_previous_run"])
+        _params["ring_buffer"] = _buffer
+        _params["ring_buffer_synced"] = True
+        return _buffer
+
+    def _sync_ring_buffer_tail(self, function_name: str):
+        """
+        Rebuilds last_values_from_previous_run from the ring buffer, after update() calls
+        """
+        _params = self.params[function_name]
+        if ("ring_buffer" not in _params) or _params.get("ring_buffer_synced", True):
+            return
+        _buffer = _params["ring_buffer"]
+        _last_values_from_previous_run = (
+            None
+            if _params["window"] == 1
+            else _buffer.last(min(int(_buffer.count[0]), _params["window"] - 1)).T
+        )
         self.first_fit_params_save(
-            _function_name,
+            function_name,
             last_values_from_previous_run=_last_values_from_previous_run,
-            len_last_values_from_previous_run=len(_last_values_from_previous_run),
+            len_last_values_from_previous_run=0
+            if _last_values_from_previous_run is None
+            else len(_last_values_from_previous_run),
+            ring_buffer_synced=True,
         )
 
-        return _return
+    def _window_operation(self, function_name: str, windows: np.ndarray):
+        """
+        Applies the feature operation to the last weighted window of every lane
+
+        Parameters
+        ----------
+        windows : np.ndarray
+            2D array (lanes, window length), oldest value first
+        """
+        _params = self.params[function_name]
+        _weights = self._window_weight_function(function_name, _params["win_function"])(
+            windows.shape[1]
+        )
+        windows = _missing_as_nan(windows)
+        _observed = ~np.isnan(windows)
+        _counts = _observed.sum(axis=1)
+        _operation, _operation_args = _params["operation"], _params["operation_args"]
+        _native_operation = _native_operation_name(_operation, _operation_args)
+
+        with np.errstate(all="ignore"):
+            if _native_operation is not None:
+                result = np.where(_observed, windows, 0.0) @ _weights
+                if _native_operation == "mean":
+                    result = np.where(_counts == 0, np.nan, result / _counts)
+            elif _params.get("vectorized", False):
+                result = np.asarray(
+                    _operation(windows * _weights, *_operation_args), dtype=np.float64
+                ).reshape(-1)
+            elif _params.get("raw", False) or (_params.get("backend") == "jit"):
+                result = np.array(
+                    [_operation(_row, *_operation_args) for _row in windows * _weights],
+                    dtype=np.float64,
+                )
+            else:
+                result = np.array(
+                    [
+                        _operation(pd.Series(_row), *_operation_args)
+                        for _row in windows * _weights
+                    ],
+                    dtype=np.float64,
+                )
+
+        _min_periods = (
+            _params["window"] if _params["min_periods"] is None else _params["min_periods"]
+        )
+        result[_counts < _min_periods] = np.nan
+        return result
+
+    def _native_feature_calculation(
+        self,
+        function_name,
+        win_function,
+        values: np.ndarray,
+        operation_name: str,
+        start: int = 0,
+    ):
+        """
+        Computes np.sum / np.mean weighted rolling window features as a single vectorized
+        sliding dot product over all rows, instead of a python callback per window.
+        Rows before start are the carried tail and are not computed
+        """
+        _params = self.params[function_name]
+
+        return _native_rolling_operation(
+            values=values,
+            weight_function=self._window_weight_function(function_name, win_function),
+            window=_params["window"],
+            min_periods=_params["min_periods"],
+            operation_name=operation_name,
+            convolution_mode=self.convolution_mode,
+            fft_window_threshold=self.fft_window_threshold,
+            linear_weights=(
+                win_function is _weighted_moving_window
+                and not _params["kwargs"].get("resize", False)
+            ),
+            start=start,
+        )
+
+    def _batched_feature_calculation(
+        self,
+        function_name,
+        win_function,
+        values: np.ndarray,
+        start: int = 0,
+    ):
+        """
+        Computes a raw, vectorized operation over the stacked rolling windows of every column
+        at once, treating the dataframe as a single 2D array. Rows before start are the carried
+        tail and are not computed
+        """
+        _params = self.params[function_name]
+
+        return _batched_rolling_operation(
+            values=values,
+            weight_function=self._window_weight_function(function_name, win_function),
+            window=_params["window"],
+            min_periods=_params["min_periods"],
+            operation=_params["operation"],
+            operation_args=_params["operation_args"],
+            start=start,
+        )
+
+    def _jit_feature_calculation(
+        self,
+        function_name,
+        win_function,
+        values: np.ndarray,
+    ):
+        """
+        Runs a self defined operation and its rolling loop as numba compiled code,
+        returns None when numba is not installed or cannot compile the operation
+        """
+        _params = self.params[function_name]
+
+        if not jit_available():
+            warnings.warn(
+                "numba is not installed, falling back to pandas rolling apply", RuntimeWarning
+            )
+            _params["jit"] = False
+            return None
+        try:
+            return _jit_rolling_operation(
+                values=values,
+                weight_function=self._window_weight_function(function_name, win_function),
+                window=_params["window"],
+                min_periods=_params["min_periods"],
+                operation=_params["operation"],
+                operation_args=_params["operation_args"],
+            )
+        except Exception as error:
+            warnings.warn(
+                f"operation could not be JIT compiled ({type(error).__name__}), "
+                "falling back to pandas rolling apply",
+                RuntimeWarning,
+            )
+            _params["jit"] = False
+            return None
+
+    def _window_weight_function(self, function_name, win_function):
+        _params = self.params[function_name]
+
+        def _weight_function(length):
+            return win_function(
+                data=np.ones(length),
+                window_size=_params["window"],
+                symmetric=_params["symmetric"],
+                **_params["kwargs"]
+            )
+
+        return _weight_function
+
+    def _frame_values(self, dataframe: Union[pd.DataFrame, pd.Series]):
+        return dataframe.to_numpy(dtype=np.float64).reshape(len(dataframe), -1)
+
+    def _continuation_values(
+        self, tail: np.ndarray, dataframe: Union[pd.DataFrame, pd.Series]
+    ):
+        """
+        Saved tail rows followed by the values of dataframe, written into one preallocated
+        float64 array that the kernels consume directly, instead of concatenating dataframes
+        """
+        return _continuation_buffer(tail, self._frame_values(dataframe))
+
+    def _fitted_columns(self, function_name: str, dataframe: Union[pd.DataFrame, pd.Series]):
+        """
+        Puts the columns of a continuation dataframe in the order of the first fit,
+        which the saved tail rows are in
+        """
+        _columns = self.params[function_name].get("columns")
+        if (
+            isinstance(dataframe, pd.DataFrame)
+            and isinstance(_columns, list)
+            and (list(dataframe.columns) != _columns)
+        ):
+            return dataframe.reindex(columns=_columns)
+        return dataframe
+
+    def _frame_result(self, result: np.ndarray, dataframe: Union[pd.DataFrame, pd.Series]):
+        if isinstance(dataframe, pd.Series):
+            return pd.Series(result[:, 0], index=dataframe.index, name=dataframe.name)
+        return pd.DataFrame(result, index=dataframe.index, columns=dataframe.columns)
 
     def caluclate_weighted_moving_window_feature(
         self,
@@ -133,6 +552,8 @@ class weighted_window_features:
         min_periods: int = 1,
         operation: Callable = None,
         operation_args: tuple = (),
+        raw: bool = False,
+        vectorized: bool = False,
     ):
         """
         Create weighted moving window feature
@@ -158,6 +579,13 @@ class weighted_window_features:
             operation to perform over the weighted rolling window values, when None is passed, np.sum is used
         operation_args : tuple, optional
             additional agrument values to be sent for self defined operation function
+        raw : bool, optional
+            If True, operation receives every window as a numpy ndarray instead of a pandas Series,
+            which is considerably faster for self defined operations, by default False
+        vectorized : bool, optional
+            If True, operation is called once with the weighted windows of all rows and columns,
+            stacked along the leading axes of a numpy ndarray, and must reduce over its last axis,
+            e.g. lambda x: np.max(x, axis=-1). Faster than raw for such operations, by default False
 
         """
 
@@ -173,6 +601,8 @@ class weighted_window_features:
             symmetric=None,
             operation=operation,
             operation_args=operation_args,
+            raw=raw,
+            vectorized=vectorized,
         )
 
     def caluclate_barthann_feature(
@@ -184,6 +614,8 @@ class weighted_window_features:
         symmetric: bool = False,
         operation: Callable = None,
         operation_args: tuple = (),
+        raw: bool = False,
+        vectorized: bool = False,
     ):
         """
         Create Bartlett–Hann weighted rolling window feature
@@ -208,6 +640,13 @@ class weighted_window_features:
             operation to perform over the weighted rolling window values, when None is passed, np.mean is used
         operation_args : tuple, optional
             additional agrument values to be sent for operation function
+        raw : bool, optional
+            If True, operation receives every window as a numpy ndarray instead of a pandas Series,
+            which is considerably faster for self defined operations, by default False
+        vectorized : bool, optional
+            If True, operation is called once with the weighted windows of all rows and columns,
+            stacked along the leading axes of a numpy ndarray, and must reduce over its last axis,
+            e.g. lambda x: np.max(x, axis=-1). Faster than raw for such operations, by default False
 
         """
         operation = np.mean if operation == None else operation
@@ -222,6 +661,8 @@ class weighted_window_features:
             symmetric=symmetric,
             operation=operation,
             operation_args=operation_args,
+            raw=raw,
+            vectorized=vectorized,
         )
 
     def caluclate_bartlett_feature(
@@ -233,6 +674,8 @@ class weighted_window_features:
         symmetric: bool = False,
         operation: Callable = None,
         operation_args: tuple = (),
+        raw: bool = False,
+        vectorized: bool = False,
     ):
         """
         Create bartlett weighted rolling window feature
@@ -257,6 +700,13 @@ class weighted_window_features:
            operation to perform over the weighted rolling window values, when None is passed, np.mean is used
         operation_args : tuple, optional
             additional agrument values to be sent for operation function
+        raw : bool, optional
+            If True, operation receives every window as a numpy ndarray instead of a pandas Series,
+            which is considerably faster for self defined operations, by default False
+        vectorized : bool, optional
+            If True, operation is called once with the weighted windows of all rows and columns,
+            stacked along the leading axes of a numpy ndarray, and must reduce over its last axis,
+            e.g. lambda x: np.max(x, axis=-1). Faster than raw for such operations, by default False
         """
         operation = np.mean if operation == None else operation
         _function_name = "caluclate_bartlett_feature"
@@ -270,6 +720,8 @@ class weighted_window_features:
             symmetric=symmetric,
             operation=operation,
             operation_args=operation_args,
+            raw=raw,
+            vectorized=vectorized,
         )
 
     def caluclate_equal_feature(
@@ -280,6 +732,8 @@ class weighted_window_features:
         min_periods: int = 1,
         operation: Callable = None,
         operation_args: tuple = (),
+        raw: bool = False,
+        vectorized: bool = False,
     ):
         """
         Create equally weighted rolling window feature
@@ -302,6 +756,13 @@ class weighted_window_features:
             operation to perform over the weighted rolling window values, when None is passed, np.mean is used
         operation_args : tuple, optional
             additional agrument values to be sent for operation function
+        raw : bool, optional
+            If True, operation receives every window as a numpy ndarray instead of a pandas Series,
+            which is considerably faster for self defined operations, by default False
+        vectorized : bool, optional
+            If True, operation is called once with the weighted windows of all rows and columns,
+            stacked along the leading axes of a numpy ndarray, and must reduce over its last axis,
+            e.g. lambda x: np.max(x, axis=-1). Faster than raw for such operations, by default False
 
         """
         operation = np.mean if operation == None else operation
@@ -316,6 +777,8 @@ class weighted_window_features:
             symmetric=None,
             operation=operation,
             operation_args=operation_args,
+            raw=raw,
+            vectorized=vectorized,
         )
 
     def caluclate_blackman_feature(
@@ -327,6 +790,8 @@ class weighted_window_features:
         symmetric: bool = False,
         operation: Callable = None,
         operation_args: tuple = (),
+        raw: bool = False,
+        vectorized: bool = False,
     ):
         """
         Create blackman weighted rolling window feature
@@ -351,6 +816,13 @@ class weighted_window_features:
             operation to perform over the weighted rolling window values, when None is passed, np.mean is used
         operation_args : tuple, optional
             additional agrument values to be sent for operation function
+        raw : bool, optional
+            If True, operation receives every window as a numpy ndarray instead of a pandas Series,
+            which is considerably faster for self defined operations, by default False
+        vectorized : bool, optional
+            If True, operation is called once with the weighted windows of all rows and columns,
+            stacked along the leading axes of a numpy ndarray, and must reduce over its last axis,
+            e.g. lambda x: np.max(x, axis=-1). Faster than raw for such operations, by default False
         """
         operation = np.mean if operation == None else operation
         _function_name = "caluclate_blackman_feature"
@@ -364,6 +836,8 @@ class weighted_window_features:
             symmetric=symmetric,
             operation=operation,
             operation_args=operation_args,
+            raw=raw,
+            vectorized=vectorized,
         )
 
     def caluclate_blackmanharris_feature(
@@ -375,6 +849,8 @@ class weighted_window_features:
         symmetric: bool = False,
         operation: Callable = None,
         operation_args: tuple = (),
+        raw: bool = False,
+        vectorized: bool = False,
     ):
         """
         Create blackman-harris weighted rolling window feature
@@ -399,6 +875,13 @@ class weighted_window_features:
             operation to perform over the weighted rolling window values, when None is passed, np.mean is used
         operation_args : tuple, optional
             additional agrument values to be sent for operation function
+        raw : bool, optional
+            If True, operation receives every window as a numpy ndarray instead of a pandas Series,
+            which is considerably faster for self defined operations, by default False
+        vectorized : bool, optional
+            If True, operation is called once with the weighted windows of all rows and columns,
+            stacked along the leading axes of a numpy ndarray, and must reduce over its last axis,
+            e.g. lambda x: np.max(x, axis=-1). Faster than raw for such operations, by default False
         """
         operation = np.mean if operation == None else operation
         _function_name = "caluclate_blackmanharris_feature"
@@ -412,6 +895,8 @@ class weighted_window_features:
             symmetric=symmetric,
             operation=operation,
             operation_args=operation_args,
+            raw=raw,
+            vectorized=vectorized,
         )
 
     def caluclate_bohman_feature(
@@ -423,6 +908,8 @@ class weighted_window_features:
         symmetric: bool = False,
         operation: Callable = None,
         operation_args: tuple = (),
+        raw: bool = False,
+        vectorized: bool = False,
     ):
         """
         Create bohman weighted rolling window feature
@@ -447,6 +934,13 @@ class weighted_window_features:
             operation to perform over the weighted rolling window values, when None is passed, np.mean is used
         operation_args : tuple, optional
             additional agrument values to be sent for operation function
+        raw : bool, optional
+            If True, operation receives every window as a numpy ndarray instead of a pandas Series,
+            which is considerably faster for self defined operations, by default False
+        vectorized : bool, optional
+            If True, operation is called once with the weighted windows of all rows and columns,
+            stacked along the leading axes of a numpy ndarray, and must reduce over its last axis,
+            e.g. lambda x: np.max(x, axis=-1). Faster than raw for such operations, by default False
         """
         operation = np.mean if operation == None else operation
         _function_name = "caluclate_bohman_feature"
@@ -460,6 +954,8 @@ class weighted_window_features:
             symmetric=symmetric,
             operation=operation,
             operation_args=operation_args,
+            raw=raw,
+            vectorized=vectorized,
         )
 
     def caluclate_cosine_feature(
@@ -471,6 +967,8 @@ class weighted_window_features:
         symmetric: bool = False,
         operation: Callable = None,
         operation_args: tuple = (),
+        raw: bool = False,
+        vectorized: bool = False,
     ):
         """
         Create cosine weighted rolling window feature
@@ -495,6 +993,13 @@ class weighted_window_features:
             operation to perform over the weighted rolling window values, when None is passed, np.mean is used
         operation_args : tuple, optional
             additional agrument values to be sent for operation function
+        raw : bool, optional
+            If True, operation receives every window as a numpy ndarray instead of a pandas Series,
+            which is considerably faster for self defined operations, by default False
+        vectorized : bool, optional
+            If True, operation is called once with the weighted windows of all rows and columns,
+            stacked along the leading axes of a numpy ndarray, and must reduce over its last axis,
+            e.g. lambda x: np.max(x, axis=-1). Faster than raw for such operations, by default False
 
         """
         operation = np.mean if operation == None else operation
@@ -509,6 +1014,8 @@ class weighted_window_features:
             symmetric=symmetric,
             operation=operation,
             operation_args=operation_args,
+            raw=raw,
+            vectorized=vectorized,
         )
 
     def caluclate_exponential_feature(
@@ -522,6 +1029,8 @@ class weighted_window_features:
         operation_args: tuple = (),
         center: float = None,
         tau: float = 1,
+        raw: bool = False,
+        vectorized: bool = False,
     ):
         """
         Create exponential weighted rolling window feature
@@ -551,6 +1060,13 @@ class weighted_window_features:
             The default value if not given is center = (M-1) / 2. This parameter must take its default value for symmetric windows.
         tau : float , optional
             Parameter defining the decay. For center = 0 use tau = -(M-1) / ln(x) if x is the fraction of the window remaining at the end, by default 1
+        raw : bool, optional
+            If True, operation receives every window as a numpy ndarray instead of a pandas Series,
+            which is considerably faster for self defined operations, by default False
+        vectorized : bool, optional
+            If True, operation is called once with the weighted windows of all rows and columns,
+            stacked along the leading axes of a numpy ndarray, and must reduce over its last axis,
+            e.g. lambda x: np.max(x, axis=-1). Faster than raw for such operations, by default False
 
         """
         operation = np.mean if operation == None else operation
@@ -565,6 +1081,8 @@ class weighted_window_features:
             symmetric=symmetric,
             operation=operation,
             operation_args=operation_args,
+            raw=raw,
+            vectorized=vectorized,
             center=center,
             tau=tau,
         )
@@ -578,6 +1096,8 @@ class weighted_window_features:
         symmetric: bool = False,
         operation: Callable = None,
         operation_args: tuple = (),
+        raw: bool = False,
+        vectorized: bool = False,
     ):
         """
         Create flattop weighted rolling window feature
@@ -602,6 +1122,13 @@ class weighted_window_features:
             operation to perform over the weighted rolling window values, when None is passed, np.mean is used
         operation_args : tuple, optional
             additional agrument values to be sent for operation function
+        raw : bool, optional
+            If True, operation receives every window as a numpy ndarray instead of a pandas Series,
+            which is considerably faster for self defined operations, by default False
+        vectorized : bool, optional
+            If True, operation is called once with the weighted windows of all rows and columns,
+            stacked along the leading axes of a numpy ndarray, and must reduce over its last axis,
+            e.g. lambda x: np.max(x, axis=-1). Faster than raw for such operations, by default False
 
         """
         operation = np.mean if operation == None else operation
@@ -616,6 +1143,8 @@ class weighted_window_features:
             symmetric=symmetric,
             operation=operation,
             operation_args=operation_args,
+            raw=raw,
+            vectorized=vectorized,
         )
 
     def caluclate_gaussian_feature(
@@ -628,6 +1157,8 @@ class weighted_window_features:
         operation: Callable = None,
         operation_args: tuple = (),
         std: float = 1,
+        raw: bool = False,
+        vectorized: bool = False,
     ):
         """
         Create flattop gaussian rolling window feature
@@ -654,6 +1185,13 @@ class weighted_window_features:
             additional agrument values to be sent for operation function
         std : float, optional
             The standard deviation, sigma.
+        raw : bool, optional
+            If True, operation receives every window as a numpy ndarray instead of a pandas Series,
+            which is considerably faster for self defined operations, by default False
+        vectorized : bool, optional
+            If True, operation is called once with the weighted windows of all rows and columns,
+            stacked along the leading axes of a numpy ndarray, and must reduce over its last axis,
+            e.g. lambda x: np.max(x, axis=-1). Faster than raw for such operations, by default False
 
         """
         operation = np.mean if operation == None else operation
@@ -668,6 +1206,8 @@ class weighted_window_features:
             symmetric=symmetric,
             operation=operation,
             operation_args=operation_args,
+            raw=raw,
+            vectorized=vectorized,
             std=std,
         )
 
@@ -680,6 +1220,8 @@ class weighted_window_features:
         symmetric: bool = False,
         operation: Callable = None,
         operation_args: tuple = (),
+        raw: bool = False,
+        vectorized: bool = False,
     ):
         """
         Create flattop hamming rolling window feature
@@ -704,6 +1246,13 @@ class weighted_window_features:
             operation to perform over the weighted rolling window values, when None is passed, np.mean is used
         operation_args : tuple, optional
             additional agrument values to be sent for operation function
+        raw : bool, optional
+            If True, operation receives every window as a numpy ndarray instead of a pandas Series,
+            which is considerably faster for self defined operations, by default False
+        vectorized : bool, optional
+            If True, operation is called once with the weighted windows of all rows and columns,
+            stacked along the leading axes of a numpy ndarray, and must reduce over its last axis,
+            e.g. lambda x: np.max(x, axis=-1). Faster than raw for such operations, by default False
 
         """
         operation = np.mean if operation == None else operation
@@ -718,6 +1267,8 @@ class weighted_window_features:
             symmetric=symmetric,
             operation=operation,
             operation_args=operation_args,
+            raw=raw,
+            vectorized=vectorized,
         )
 
     def caluclate_hann_feature(
@@ -729,6 +1280,8 @@ class weighted_window_features:
         symmetric: bool = False,
         operation: Callable = None,
         operation_args: tuple = (),
+        raw: bool = False,
+        vectorized: bool = False,
     ):
         """
         Create flattop hann rolling window feature
@@ -753,6 +1306,13 @@ class weighted_window_features:
             operation to perform over the weighted rolling window values, when None is passed, np.mean is used
         operation_args : tuple, optional
             additional agrument values to be sent for operation function
+        raw : bool, optional
+            If True, operation receives every window as a numpy ndarray instead of a pandas Series,
+            which is considerably faster for self defined operations, by default False
+        vectorized : bool, optional
+            If True, operation is called once with the weighted windows of all rows and columns,
+            stacked along the leading axes of a numpy ndarray, and must reduce over its last axis,
+            e.g. lambda x: np.max(x, axis=-1). Faster than raw for such operations, by default False
 
         """
         operation = np.mean if operation == None else operation
@@ -767,6 +1327,8 @@ class weighted_window_features:
             symmetric=symmetric,
             operation=operation,
             operation_args=operation_args,
+            raw=raw,
+            vectorized=vectorized,
         )
 
     def caluclate_kaiser_feature(
@@ -779,6 +1341,8 @@ class weighted_window_features:
         beta: float = 7,
         operation: Callable = None,
         operation_args: tuple = (),
+        raw: bool = False,
+        vectorized: bool = False,
     ):
         """
         Create flattop kaiser rolling window feature
@@ -806,6 +1370,13 @@ class weighted_window_features:
             operation to perform over the weighted rolling window values, when None is passed, np.mean is used
         operation_args : tuple, optional
             additional agrument values to be sent for operation function
+        raw : bool, optional
+            If True, operation receives every window as a numpy ndarray instead of a pandas Series,
+            which is considerably faster for self defined operations, by default False
+        vectorized : bool, optional
+            If True, operation is called once with the weighted windows of all rows and columns,
+            stacked along the leading axes of a numpy ndarray, and must reduce over its last axis,
+            e.g. lambda x: np.max(x, axis=-1). Faster than raw for such operations, by default False
         """
         operation = np.mean if operation == None else operation
         _function_name = "caluclate_kaiser_feature"
@@ -819,6 +1390,8 @@ class weighted_window_features:
             symmetric=symmetric,
             operation=operation,
             operation_args=operation_args,
+            raw=raw,
+            vectorized=vectorized,
             beta=beta,
         )
 
@@ -831,6 +1404,8 @@ class weighted_window_features:
         symmetric: bool = False,
         operation: Callable = None,
         operation_args: tuple = (),
+        raw: bool = False,
+        vectorized: bool = False,
     ):
         """
         Create flattop parzen rolling window feature
@@ -855,6 +1430,13 @@ class weighted_window_features:
             operation to perform over the weighted rolling window values, when None is passed, np.mean is used
         operation_args : tuple, optional
             additional agrument values to be sent for operation function
+        raw : bool, optional
+            If True, operation receives every window as a numpy ndarray instead of a pandas Series,
+            which is considerably faster for self defined operations, by default False
+        vectorized : bool, optional
+            If True, operation is called once with the weighted windows of all rows and columns,
+            stacked along the leading axes of a numpy ndarray, and must reduce over its last axis,
+            e.g. lambda x: np.max(x, axis=-1). Faster than raw for such operations, by default False
 
         """
         operation = np.mean if operation == None else operation
@@ -869,6 +1451,8 @@ class weighted_window_features:
             symmetric=symmetric,
             operation=operation,
             operation_args=operation_args,
+            raw=raw,
+            vectorized=vectorized,
         )
 
     def caluclate_triang_feature(
@@ -880,6 +1464,8 @@ class weighted_window_features:
         symmetric: bool = False,
         operation: Callable = None,
         operation_args: tuple = (),
+        raw: bool = False,
+        vectorized: bool = False,
     ):
         """
         Create flattop triang rolling window feature
@@ -904,6 +1490,13 @@ class weighted_window_features:
             operation to perform over the weighted rolling window values, when None is passed, np.mean is used
         operation_args : tuple, optional
             additional agrument values to be sent for operation function
+        raw : bool, optional
+            If True, operation receives every window as a numpy ndarray instead of a pandas Series,
+            which is considerably faster for self defined operations, by default False
+        vectorized : bool, optional
+            If True, operation is called once with the weighted windows of all rows and columns,
+            stacked along the leading axes of a numpy ndarray, and must reduce over its last axis,
+            e.g. lambda x: np.max(x, axis=-1). Faster than raw for such operations, by default False
 
         """
         operation = np.mean if operation == None else operation
@@ -918,4 +1511,198 @@ class weighted_window_features:
             symmetric=symmetric,
             operation=operation,
             operation_args=operation_args,
+            raw=raw,
+            vectorized=vectorized,
+        )
+
+    def caluclate_multiple_window_features(
+        self,
+        dataframe: Union[pd.DataFrame, pd.Series],
+        configurations: list = None,
+        first_fit: bool = True,
+        return_array: bool = False,
+    ):
+        """
+        Create several np.sum/np.mean weighted rolling window features over the same dataframe in a single batch
+
+        Configurations sharing a window size are computed in one pass over the rolling windows,
+        with their window weights stacked together, instead of one full rolling pass per configuration.
+
+        Parameters
+        ----------
+        dataframe : Union[pd.DataFrame,pd.Series]
+            dataframe/series over which weighted rolling window features are to be constructed
+        configurations : list, optional
+            list of dicts, each describing one feature with keys
+            "window_type" : one of 'equal','barthann','bartlett','blackman','blackmanharris','bohman','cosine',
+            'exponential','flattop','gaussian','hamming','hann','kaiser','parzen','triang','weighted_moving_window',
+            "window" : int, size of the rolling window,
+            "min_periods" : int, optional, by default 1,
+            "symmetric" : bool, optional, by default False,
+            "operation" : np.sum or np.mean, optional, by default np.sum for 'weighted_moving_window' and np.mean otherwise,
+            "name" : str, optional, by default "{window_type}_{window}",
+            and the window specific parameters ("center","tau" for exponential, "std" for gaussian, "beta" for kaiser).
+            Ignored when first_fit is False, in which case the configurations of the first fit are used
+        first_fit : bool, optional
+            Rolling features require past "window" number of values for calculation.
+            Use True, when calculating for training data { in which case last "window" number of values will be saved }
+            Use False, when calculating for testing/production data { in which case the, last "window" number of values, which
+            are were saved during the last phase, will be utilized for calculation }, by default True
+        return_array : bool, optional
+            If True, returns a 3D numpy array of shape (rows, columns, configurations),
+            else a dataframe with one "{column}_{name}" column per column and configuration, by default False
+
+        Returns
+        -------
+        Union[pd.DataFrame,np.ndarray]
+        """
+        _function_name = "caluclate_multiple_window_features"
+
+        if first_fit:
+            self.params[_function_name] = {}
+            self.params[_function_name][
+                "configurations"
+            ] = self._compile_window_configurations(configurations)
+            self.params[_function_name]["is_series"] = isinstance(dataframe, pd.Series)
+            self.params[_function_name]["columns"] = (
+                dataframe.name
+                if isinstance(dataframe, pd.Series)
+                else list(dataframe.columns)
+            )
+
+        if not first_fit:
+            if _function_name not in self.params:
+                raise ValueError(
+                    "First fit has not occured before. Kindly run first_fit=True for first fit instance,"
+                    "and then proceed with first_fit=False for subsequent fits "
+                )
+            dataframe = self._fitted_columns(_function_name, dataframe)
+        _tail = (
+            None
+            if first_fit
+            else self.params[_function_name]["last_values_from_previous_run"]
+        )
+        _n_tail = 0 if _tail is None else len(_tail)
+        values = self._continuation_values(_tail, dataframe)
+
+        _configurations = self.params[_function_name]["configurations"]
+        result = _multiple_native_rolling_operations(
+            values=values,
+            weight_functions=[
+                self._configuration_weight_function(_configuration)
+                for _configuration in _configurations
+            ],
+            windows=[_configuration["window"] for _configuration in _configurations],
+            min_periods=[
+                _configuration["min_periods"] for _configuration in _configurations
+            ],
+            operation_names=[
+                _configuration["operation_name"] for _configuration in _configurations
+            ],
+            convolution_mode=self.convolution_mode,
+            fft_window_threshold=self.fft_window_threshold,
+            start=_n_tail,
+        )
+        result = result[_n_tail:]
+
+        _max_window = max(_configuration["window"] for _configuration in _configurations)
+        _last_values_from_previous_run = (
+            values[1 - _max_window :].copy() if _max_window != 1 else None
+        )
+        self.first_fit_params_save(
+            _function_name,
+            last_values_from_previous_run=_last_values_from_previous_run,
+            len_last_values_from_previous_run=0
+            if _last_values_from_previous_run is None
+            else len(_last_values_from_previous_run),
         )
+
+        if return_array:
+            return result
+
+        _columns = (
+            [dataframe.name] if isinstance(dataframe, pd.Series) else dataframe.columns
+        )
+        return pd.DataFrame(
+            result.reshape(len(result), -1),
+            index=dataframe.index,
+            columns=[
+                f"{_column}_{_configuration['name']}"
+                for _column in _columns
+                for _configuration in _configurations
+            ],
+        )
+
+    def _compile_window_configurations(self, configurations: list):
+        if not configurations:
+            raise ValueError("configurations must be a non empty list of dicts")
+
+        _compiled, _names = [], {}
+        for _configuration in configurations:
+            _configuration = dict(_configuration)
+            _window_type = _configuration.pop("window_type", None)
+            if _window_type not in _WINDOW_FUNCTIONS:
+                raise ValueError(
+                    f"window_type {_window_type} not supported, "
+                    f"available window types are {tuple(_WINDOW_FUNCTIONS)}"
+                )
+            if "window" not in _configuration:
+                raise ValueError(f"window missing for {_window_type} configuration")
+            _window = _configuration.pop("window")
+            if not isinstance(_window, (int, np.integer)) or _window < 1:
+                raise ValueError(
+                    f"window must be a positive integer, got {_window} for {_window_type} configuration"
+                )
+            _operation = _configuration.pop("operation", None)
+            if _operation is None:
+                _operation = (
+                    np.sum if _window_type == "weighted_moving_window" else np.mean
+                )
+            _operation_name = _native_operation_name(_operation, ())
+            if _operation_name is None:
+                raise ValueError(
+                    "Only np.sum and np.mean operations are supported by caluclate_multiple_window_features"
+                )
+            _name = _configuration.pop("name", f"{_window_type}_{_window}")
+            if _name in _names:
+                _names[_name] += 1
+                _name = f"{_name}_{_names[_name]}"
+            else:
+                _names[_name] = 0
+
+            _min_periods = _configuration.pop("min_periods", 1)
+            _symmetric = _configuration.pop("symmetric", False)
+
+            _kwargs = dict(_WINDOW_DEFAULT_PARAMS.get(_window_type, {}))
+            for _key, _value in _configuration.items():
+                if _key not in _kwargs:
+                    raise ValueError(
+                        f"Unknown parameter {_key} for {_window_type} configuration"
+                    )
+                _kwargs[_key] = _value
+
+            _compiled.append(
+                {
+                    "window_type": _window_type,
+                    "window": int(_window),
+                    "min_periods": _min_periods,
+                    "symmetric": _symmetric,
+                    "operation_name": _operation_name,
+                    "name": _name,
+                    "kwargs": _kwargs,
+                }
+            )
+        return _compiled
+
+    def _configuration_weight_function(self, configuration: dict):
+        win_function = _WINDOW_FUNCTIONS[configuration["window_type"]]
+
+        def _weight_function(length):
+            return win_function(
+                data=np.ones(length),
+                window_size=configuration["window"],
+                symmetric=configuration["symmetric"],
+                **configuration["kwargs"]
+            )
+
+        return _weight_function
@@ -0,0 +1,167 @@
+import numpy as np
+from functools import lru_cache
+from typing import Callable
+from NitroFE.time_based_features.weighted_window_features.weighted_window_kernels import (
+    _adaptive_smoothing,
+    _missing_as_nan,
+)
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - numba is an optional dependency
+    numba = None
+
+
+_JIT_AVAILABLE = numba is not None
+
+
+def jit_available():
+    """
+    Whether the optional numba JIT backend can be used
+
+    Returns
+    -------
+    bool
+        True when numba is installed
+    """
+    return _JIT_AVAILABLE
+
+
+def _smoothing_rows(values, smoothing, previous, start, convex, result):
+    """
+    Row loop of _adaptive_smoothing written one element at a time, for numba to compile
+    """
+    for _row in range(start, values.shape[0]):
+        for _column in range(values.shape[1]):
+            if convex:
+                previous[_column] = (
+                    previous[_column] * (1 - smoothing[_row, _column])
+                    + values[_row, _column] * smoothing[_row, _column]
+                )
+            else:
+                previous[_column] = previous[_column] + smoothing[_row, _column] * (
+                    values[_row, _column] - previous[_column]
+                )
+            result[_row, _column] = previous[_column]
+
+
+if _JIT_AVAILABLE:
+    _compiled_smoothing_rows = numba.njit(cache=True)(_smoothing_rows)
+
+
+def _compiled_adaptive_smoothing(
+    values: np.ndarray,
+    smoothing: np.ndarray,
+    initial: np.ndarray,
+    start: int = 0,
+    convex: bool = False,
+):
+    """
+    _adaptive_smoothing with the row loop compiled by numba, which runs the recursion
+    without a python step per row. Falls back to the numpy row loop when numba is not installed.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        2D float array (rows, columns)
+    smoothing : np.ndarray
+        smoothing constant of every value, same shape as values
+    initial : np.ndarray
+        y[start - 1], one value per column
+    start : int, optional
+        first row of the recursion, rows before it are 0, by default 0
+    convex : bool, optional
+        If True, the recursion is written y[i] = y[i - 1] * (1 - smoothing[i]) + values[i] * smoothing[i],
+        by default False
+
+    Returns
+    -------
+    np.ndarray
+    """
+    if not _JIT_AVAILABLE:
+        return _adaptive_smoothing(values, smoothing, initial, start=start, convex=convex)
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    result = np.zeros(values.shape)
+    _compiled_smoothing_rows(
+        values,
+        np.ascontiguousarray(np.broadcast_to(smoothing, values.shape), dtype=np.float64),
+        np.array(initial, dtype=np.float64).reshape(values.shape[1:]),
+        start,
+        convex,
+        result,
+    )
+    return result
+
+
+@lru_cache(maxsize=64)
+def _jit_rolling_loop(operation: Callable):
+    """
+    Compiles ``operation``, written against a 1D numpy array, together with the rolling loop
+    which feeds it every weighted window. Compilation itself is lazy, typing errors surface
+    on the first call of the returned loop.
+    """
+    if isinstance(operation, numba.core.registry.CPUDispatcher):
+        _jit_operation = operation
+    else:
+        _jit_operation = numba.njit(operation)
+
+    @numba.njit
+    def _rolling_loop(values, weights, window, min_periods, operation_args):
+        n_rows, n_columns = values.shape
+        result = np.full((n_rows, n_columns), np.nan)
+        for _column in range(n_columns):
+            _count = 0
+            for _row in range(n_rows):
+                if not np.isnan(values[_row, _column]):
+                    _count += 1
+                if (_row >= window) and (not np.isnan(values[_row - window, _column])):
+                    _count -= 1
+                if _count < min_periods:
+                    continue
+                _length = min(_row + 1, window)
+                _window_values = (
+                    values[_row + 1 - _length : _row + 1, _column]
+                    * weights[_length - 1, :_length]
+                )
+                result[_row, _column] = _jit_operation(_window_values, *operation_args)
+        return result
+
+    return _rolling_loop
+
+
+def _jit_rolling_operation(
+    values: np.ndarray,
+    weight_function: Callable,
+    window: int,
+    min_periods: int,
+    operation: Callable,
+    operation_args: tuple = (),
+):
+    """
+    Compiled equivalent of
+    ``dataframe.rolling(window, min_periods).apply(lambda x: operation(weights * x, *operation_args), raw=True)``
+
+    Parameters
+    ----------
+    values : np.ndarray
+        2D float array (rows, columns)
+    weight_function : Callable
+        function returning the window weights for a given window length
+    window : int
+        Size of the rolling window
+    min_periods : int
+        Minimum number of observations in window required to have a value
+    operation : Callable
+        numba compilable operation reducing a 1D weighted window to a scalar
+    operation_args : tuple, optional
+        additional agrument values to be sent for operation function
+    """
+    min_periods = window if min_periods is None else min_periods
+    _lengths = min(window, values.shape[0])
+    weights = np.zeros((max(_lengths, 1), window), dtype=np.float64)
+    for _length in range(1, _lengths + 1):
+        weights[_length - 1, :_length] = weight_function(_length)
+
+    return _jit_rolling_loop(operation)(
+        np.ascontiguousarray(_missing_as_nan(values)), weights, window, min_periods, tuple(operation_args)
+    )
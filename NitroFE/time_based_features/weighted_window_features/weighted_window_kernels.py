@@ -0,0 +1,727 @@
+import warnings
+import numpy as np
+from scipy import signal
+from typing import Callable
+
+
+_NATIVE_OPERATIONS = {np.sum: "sum", np.mean: "mean"}
+_CONVOLUTION_MODES = ("auto", "direct", "fft")
+_FFT_WINDOW_THRESHOLD = 256
+_BATCH_ELEMENTS = 1 << 22
+_RUNNING_SUM_BLOCK = 64
+_RUNNING_SUM_BATCH_ELEMENTS = 1 << 15
+
+
+def _native_operation_name(operation: Callable, operation_args: tuple):
+    """
+    Returns the name of the vectorized kernel that can replace ``operation``,
+    or None when the operation has to go through the pandas rolling callback
+    """
+    if len(operation_args) != 0:
+        return None
+    try:
+        return _NATIVE_OPERATIONS.get(operation)
+    except TypeError:
+        return None
+
+
+def _missing_as_nan(values: np.ndarray):
+    """
+    values with +/-inf replaced by NaN, pandas rolling windows treat infinite values as missing
+    """
+    return np.where(np.isinf(values), np.nan, values)
+
+
+def _continuation_buffer(state: np.ndarray, values: np.ndarray):
+    """
+    Carried state rows followed by the new values, written into one preallocated float64 array,
+    which replaces concatenating the saved dataframe tail onto every incremental batch
+
+    Parameters
+    ----------
+    state : np.ndarray
+        rows carried over from the previous fit, (state rows,) + values.shape[1:], or None
+    values : np.ndarray
+        values of the new batch
+
+    Returns
+    -------
+    np.ndarray
+    """
+    values = np.asarray(values)
+    if (state is None) or (len(state) == 0):
+        return values.astype(np.float64, copy=False)
+    buffer = np.empty((len(state) + len(values),) + values.shape[1:], dtype=np.float64)
+    buffer[: len(state)] = state
+    buffer[len(state) :] = values
+    return buffer
+
+
+def _adaptive_smoothing(
+    values: np.ndarray,
+    smoothing: np.ndarray,
+    initial: np.ndarray,
+    start: int = 0,
+    convex: bool = False,
+):
+    """
+    Linear recursion y[i] = y[i - 1] + smoothing[i] * (values[i] - y[i - 1]) of adaptive moving
+    averages, run once over the rows and vectorized over the columns
+
+    Parameters
+    ----------
+    values : np.ndarray
+        2D float array (rows, columns)
+    smoothing : np.ndarray
+        smoothing constant of every value, same shape as values
+    initial : np.ndarray
+        y[start - 1], one value per column
+    start : int, optional
+        first row of the recursion, rows before it are 0, by default 0
+    convex : bool, optional
+        If True, the recursion is written y[i] = y[i - 1] * (1 - smoothing[i]) + values[i] * smoothing[i],
+        which rounds differently, by default False
+
+    Returns
+    -------
+    np.ndarray
+    """
+    result = np.zeros(values.shape)
+    _previous = np.asarray(initial, dtype=np.float64).reshape(values.shape[1:])
+    for _row in range(start, len(values)):
+        if convex:
+            _previous = _previous * (1 - smoothing[_row]) + values[_row] * smoothing[_row]
+        else:
+            _previous = _previous + smoothing[_row] * (values[_row] - _previous)
+        result[_row] = _previous
+    return result
+
+
+def _exponential_filter(values: np.ndarray, alpha: float, initial: np.ndarray):
+    """
+    First order recursion y[i] = (1 - alpha) * y[i - 1] + alpha * values[i], evaluated along the
+    rows of every column as an IIR filter
+
+    Non finite values carry on as in the plain recursion, an inf stays in the average until
+    a NaN or an inf of the other sign turns it into NaN.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        2D float array (rows, columns)
+    alpha : float
+        weight of the new value
+    initial : np.ndarray
+        y[-1], the filter state carried over, one value per column
+
+    Returns
+    -------
+    np.ndarray
+    """
+    _initial = np.asarray(initial, dtype=np.float64).reshape(1, -1)
+    _finite = np.isfinite(values)
+    _finite_initial = np.isfinite(_initial)
+    result, _ = signal.lfilter(
+        [alpha],
+        [1.0, alpha - 1.0],
+        np.where(_finite, values, 0.0),
+        axis=0,
+        zi=(1.0 - alpha) * np.where(_finite_initial, _initial, 0.0),
+    )
+    if not (_finite.all() and _finite_initial.all()):
+        # the filter state multiplies an inf by 0, the recursion only adds the non finite values up
+        with np.errstate(invalid="ignore"):
+            result += np.cumsum(
+                np.concatenate(
+                    [np.where(_finite_initial, 0.0, _initial), np.where(_finite, 0.0, values)]
+                ),
+                axis=0,
+            )[1:]
+    return result
+
+
+def _sliding_nanmax(values: np.ndarray, window: int):
+    """
+    NaN skipping max over the (possibly partial) rolling window ending at every row, -inf for windows
+    without observations. Uses the block prefix / suffix maxima of van Herk and Gil-Werman,
+    so the cost is linear in the rows whatever the window size
+
+    Parameters
+    ----------
+    values : np.ndarray
+        2D float array (rows, columns)
+    window : int
+        Size of the rolling window
+    """
+    n_rows = len(values)
+    n_blocks = -(-(n_rows + window - 1) // window)
+    padded = np.full((n_blocks * window,) + values.shape[1:], -np.inf)
+    padded[window - 1 : window - 1 + n_rows] = np.where(np.isnan(values), -np.inf, values)
+    blocks = padded.reshape((n_blocks, window) + values.shape[1:])
+    prefix = np.maximum.accumulate(blocks, axis=1).reshape(padded.shape)
+    suffix = np.maximum.accumulate(blocks[:, ::-1], axis=1)[:, ::-1].reshape(padded.shape)
+    return np.maximum(suffix[:n_rows], prefix[window - 1 : window - 1 + n_rows])
+
+
+def _rolling_count(mask: np.ndarray, window: int):
+    """
+    Number of non NaN observations inside every (possibly partial) rolling window
+
+    Parameters
+    ----------
+    mask : np.ndarray
+        2D boolean array (rows, columns), True where an observation is present
+    window : int
+        Size of the rolling window
+    """
+    cumulative = np.cumsum(mask, axis=0, dtype=np.int64)
+    counts = cumulative.copy()
+    counts[window:] -= cumulative[:-window]
+    return counts
+
+
+def _rolling_nansum(values: np.ndarray, window: int):
+    """
+    NaN and inf skipping sum inside every (possibly partial) rolling window, 0 for windows without
+    observations, as the difference of running sums
+
+    The running sums restart every block of rows, so that a value only reaches the windows of
+    its own block and the rounding error of long series stays bounded.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        2D float array (rows, columns)
+    window : int
+        Size of the rolling window
+    """
+    n_rows, n_columns = values.shape
+    values = np.where(np.isfinite(values), values, 0.0)
+    sums = np.empty(values.shape)
+    if n_rows == 0:
+        return sums
+    block = min(max(_RUNNING_SUM_BLOCK, window), n_rows)
+    step = block * max(1, _RUNNING_SUM_BATCH_ELEMENTS // (block * n_columns))
+
+    for _start in range(0, n_rows, step):
+        _stop = min(_start + step, n_rows)
+        _n_blocks = -(-(_stop - _start) // block)
+        padded = np.zeros((window - 1 + _n_blocks * block, n_columns))
+        _first = max(_start - window + 1, 0)
+        padded[window - 1 - (_start - _first) : window - 1 + _stop - _start] = values[
+            _first:_stop
+        ]
+        blocks = np.lib.stride_tricks.sliding_window_view(
+            padded, block + window - 1, axis=0
+        )[::block].transpose(0, 2, 1)
+        cumulative = np.zeros((_n_blocks, block + window, n_columns))
+        np.cumsum(blocks, axis=1, out=cumulative[:, 1:])
+        _sums = (cumulative[:, window:] - cumulative[:, :-window]).reshape(-1, n_columns)
+        sums[_start:_stop] = _sums[: _stop - _start]
+    return sums
+
+
+def _blocked_mean_std(padded: np.ndarray, window: int, block: int, min_periods: int):
+    """
+    Rolling mean and variance of the rows of padded after its first window - 1 rows,
+    len(padded) - window + 1 being a multiple of block
+    """
+    n_blocks = (len(padded) - window + 1) // block
+    # (blocks, rows of a block, columns), every block preceded by the rows its first windows reach back to
+    blocks = np.lib.stride_tricks.sliding_window_view(
+        padded, block + window - 1, axis=0
+    )[::block].transpose(0, 2, 1)
+
+    mask = np.isfinite(blocks)
+    shifted = np.where(mask, blocks, 0.0)
+    reference = shifted.sum(axis=1, keepdims=True) / np.maximum(
+        mask.sum(axis=1, keepdims=True), 1
+    )
+    shifted -= reference
+    shifted *= mask
+
+    def _running_sums(x):
+        cumulative = np.zeros((x.shape[0], x.shape[1] + 1, x.shape[2]))
+        np.cumsum(x, axis=1, out=cumulative[:, 1:])
+        return cumulative
+
+    def _window_sums(cumulative):
+        return cumulative[:, window:] - cumulative[:, :-window]
+
+    counts = _rolling_count(np.isfinite(padded), window)[window - 1 :].reshape(
+        n_blocks, block, -1
+    )
+    squares = _running_sums(shifted * shifted)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = _window_sums(_running_sums(shifted)) / counts
+        variance = _window_sums(squares) / counts - mean * mean
+    # below the rounding error of the running sums, e.g. constant windows, the variance is 0
+    variance[
+        variance * counts <= 4 * np.finfo(np.float64).eps * squares[:, window:]
+    ] = 0.0
+    mean += reference
+
+    _missing = counts < max(min_periods, 1)
+    mean[_missing] = np.nan
+    variance[_missing] = np.nan
+    return mean.reshape(n_blocks * block, -1), variance.reshape(n_blocks * block, -1)
+
+
+def _rolling_mean_std(values: np.ndarray, window: int, min_periods: int):
+    """
+    NaN and inf skipping rolling mean and population standard deviation of every column, from the
+    running sums of the values and of their squares, computed together in a single pass
+
+    The running sums restart every block of rows and are taken relative to the block mean,
+    which bounds the rounding error of long series and keeps sum of squares minus squared
+    sum from cancelling. The cost per row does not depend on the window size.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        2D float array (rows, columns)
+    window : int
+        Size of the rolling window
+    min_periods : int
+        Minimum number of observations in window required to have a value
+
+    Returns
+    -------
+    tuple
+        rolling mean and rolling standard deviation, both shaped as values
+    """
+    n_rows, n_columns = values.shape
+    mean, std = np.empty(values.shape), np.empty(values.shape)
+    if n_rows == 0:
+        return mean, std
+    min_periods = window if min_periods is None else min_periods
+    block = min(max(_RUNNING_SUM_BLOCK, window), n_rows)
+    # rows per batch, a multiple of block, so that the intermediate arrays stay in cache
+    step = block * max(1, _RUNNING_SUM_BATCH_ELEMENTS // (block * n_columns))
+
+    for _start in range(0, n_rows, step):
+        _stop = min(_start + step, n_rows)
+        _n_blocks = -(-(_stop - _start) // block)
+        padded = np.full((window - 1 + _n_blocks * block, n_columns), np.nan)
+        _first = max(_start - window + 1, 0)
+        padded[window - 1 - (_start - _first) : window - 1 + _stop - _start] = values[
+            _first:_stop
+        ]
+        _mean, _variance = _blocked_mean_std(padded, window, block, min_periods)
+        mean[_start:_stop] = _mean[: _stop - _start]
+        std[_start:_stop] = np.sqrt(_variance[: _stop - _start])
+    return mean, std
+
+
+def _blocked_linear_weighted_sum(padded: np.ndarray, window: int, block: int):
+    """
+    Plain and linearly weighted (1 .. window) sums of the windows ending at the rows of padded
+    after its first window - 1 rows, len(padded) - window + 1 being a multiple of block
+    """
+    n_blocks = (len(padded) - window + 1) // block
+    blocks = np.lib.stride_tricks.sliding_window_view(
+        padded, block + window - 1, axis=0
+    )[::block].transpose(0, 2, 1)
+    positions = np.arange(block + window - 1, dtype=np.float64)[:, np.newaxis]
+
+    def _running_sums(x):
+        cumulative = np.zeros((x.shape[0], x.shape[1] + 1, x.shape[2]))
+        np.cumsum(x, axis=1, out=cumulative[:, 1:])
+        return cumulative
+
+    sums = _running_sums(blocks)
+    plain = sums[:, window:] - sums[:, :-window]
+    # sum of (position - first position of the window + 1) * value
+    weighted = _running_sums(blocks * positions)
+    weighted = (
+        weighted[:, window:]
+        - weighted[:, :-window]
+        - (np.arange(block, dtype=np.float64) - 1)[:, np.newaxis] * plain
+    )
+    return plain.reshape(n_blocks * block, -1), weighted.reshape(n_blocks * block, -1)
+
+
+def _linear_weighted_rolling_sum(values: np.ndarray, window: int):
+    """
+    Sliding dot product of the 'weighted_moving' window weights, 1 .. length divided by their sum,
+    with every rolling window of values, partial windows at the start weighted by their own length
+
+    The weighted sums follow from the running sum and the running position weighted sum, so the
+    cost per row does not depend on the window size. The running sums restart every block of rows,
+    which bounds their rounding error on long series.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        2D float array (rows, columns), NaN and inf values are skipped
+    window : int
+        Size of the rolling window
+    """
+    n_rows, n_columns = values.shape
+    # an inf would reach every running sum of its block, including the windows before it
+    values = np.where(np.isfinite(values), values, 0.0)
+    result = np.empty(values.shape)
+    if n_rows == 0:
+        return result
+    block = min(max(_RUNNING_SUM_BLOCK, window), n_rows)
+    step = block * max(1, _RUNNING_SUM_BATCH_ELEMENTS // (block * n_columns))
+
+    for _start in range(0, n_rows, step):
+        _stop = min(_start + step, n_rows)
+        _n_blocks = -(-(_stop - _start) // block)
+        padded = np.zeros((window - 1 + _n_blocks * block, n_columns))
+        _first = max(_start - window + 1, 0)
+        padded[window - 1 - (_start - _first) : window - 1 + _stop - _start] = values[
+            _first:_stop
+        ]
+        _plain, _weighted = _blocked_linear_weighted_sum(padded, window, block)
+        _plain, _weighted = _plain[: _stop - _start], _weighted[: _stop - _start]
+
+        _lengths = np.minimum(np.arange(_start, _stop) + 1, window)[:, np.newaxis]
+        # partial windows start at weight 1 instead of window - length + 1
+        _weighted -= (window - _lengths) * _plain
+        result[_start:_stop] = _weighted / (_lengths * (_lengths + 1) / 2)
+    return result
+
+
+def _use_fft_convolution(
+    values: np.ndarray, window: int, convolution_mode: str, fft_window_threshold: int
+):
+    """
+    Decides between the direct sliding product, O(n*window), and FFT / overlap-add
+    convolution, O(n*log(window)), for the full rolling windows
+    """
+    if convolution_mode not in _CONVOLUTION_MODES:
+        raise ValueError(
+            f"convolution_mode {convolution_mode} not supported, "
+            f"available modes are {_CONVOLUTION_MODES}"
+        )
+    if (convolution_mode == "direct") or (values.shape[0] < window):
+        return False
+    return (convolution_mode == "fft") or (window >= fft_window_threshold)
+
+
+def _weighted_rolling_sum(
+    values: np.ndarray,
+    weight_function: Callable,
+    window: int,
+    convolution_mode: str = "auto",
+    fft_window_threshold: int = _FFT_WINDOW_THRESHOLD,
+    start: int = 0,
+):
+    """
+    Sliding dot product of the window weights with every rolling window of ``values``
+
+    Rows which have less than ``window`` preceding observations are weighted with the
+    weights of a window of their own length, which is how the pandas rolling callback
+    builds partial windows when min_periods < window.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        2D float array (rows, columns), NaN and inf values must already be replaced by 0
+    weight_function : Callable
+        function returning the window weights for a given window length
+    window : int
+        Size of the rolling window
+    convolution_mode : str, {'auto','direct','fft'}
+        'direct' computes the sliding products, 'fft' uses overlap-add FFT convolution,
+        'auto' switches to FFT convolution when window >= fft_window_threshold, by default 'auto'
+    fft_window_threshold : int
+        window size from which 'auto' uses FFT convolution
+    start : int, optional
+        first row to compute, partial windows of the rows before it (the carried tail) are left 0,
+        by default 0
+    """
+    n_rows = values.shape[0]
+    result = np.zeros(values.shape, dtype=np.float64)
+
+    for _length in range(start + 1, min(window - 1, n_rows) + 1):
+        result[_length - 1] = weight_function(_length) @ values[:_length]
+
+    if _use_fft_convolution(values, window, convolution_mode, fft_window_threshold):
+        result[window - 1 :] = signal.oaconvolve(
+            values, weight_function(window)[::-1, np.newaxis], mode="valid", axes=0
+        )
+    elif n_rows >= window:
+        _full = result[window - 1 :]
+        for _position, _weight in enumerate(weight_function(window)):
+            _full += _weight * values[_position : n_rows - window + 1 + _position]
+
+    return result
+
+
+def _native_rolling_operation(
+    values: np.ndarray,
+    weight_function: Callable,
+    window: int,
+    min_periods: int,
+    operation_name: str,
+    convolution_mode: str = "auto",
+    fft_window_threshold: int = _FFT_WINDOW_THRESHOLD,
+    linear_weights: bool = False,
+    start: int = 0,
+):
+    """
+    Vectorized equivalent of
+    ``dataframe.rolling(window, min_periods).agg(lambda x: operation(weights * x))``
+    for operation in {np.sum, np.mean}
+
+    NaN and inf values inside a window are skipped, in the same way as pandas does when the
+    operation is applied over the weighted window series.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        2D float array (rows, columns)
+    weight_function : Callable
+        function returning the window weights for a given window length
+    window : int
+        Size of the rolling window
+    min_periods : int
+        Minimum number of observations in window required to have a value
+    operation_name : str, {'sum','mean'}
+        operation to be performed over the weighted window values
+    convolution_mode : str, {'auto','direct','fft'}
+        convolution used for the full rolling windows, by default 'auto'
+    fft_window_threshold : int
+        window size from which 'auto' uses FFT convolution
+    linear_weights : bool, optional
+        If True, the weights are the 'weighted_moving' window, whose weighted sums are computed
+        from running sums, independent of the window size, by default False
+    start : int, optional
+        first row to compute, the rows before it are the carried tail, which the caller drops,
+        by default 0
+    """
+    mask = np.isfinite(values)
+    counts = _rolling_count(mask, window)
+    if linear_weights:
+        result = _linear_weighted_rolling_sum(np.where(mask, values, 0.0), window)
+    else:
+        result = _weighted_rolling_sum(
+            np.where(mask, values, 0.0),
+            weight_function,
+            window,
+            convolution_mode=convolution_mode,
+            fft_window_threshold=fft_window_threshold,
+            start=start,
+        )
+
+    if operation_name == "mean":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            result = result / counts
+        result[counts == 0] = np.nan
+
+    min_periods = window if min_periods is None else min_periods
+    result[counts < min_periods] = np.nan
+    return result
+
+
+def _multiple_native_rolling_operations(
+    values: np.ndarray,
+    weight_functions: list,
+    windows: list,
+    min_periods: list,
+    operation_names: list,
+    convolution_mode: str = "auto",
+    fft_window_threshold: int = _FFT_WINDOW_THRESHOLD,
+    start: int = 0,
+):
+    """
+    Computes several np.sum / np.mean weighted rolling window features over the same values
+
+    NaN masking and observation counts are shared by all configurations, and configurations
+    with the same window size share a single pass over the rolling windows, with their
+    weights stacked into one (window, configurations) matrix.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        2D float array (rows, columns)
+    weight_functions : list
+        per configuration, function returning the window weights for a given window length
+    windows : list
+        per configuration, size of the rolling window
+    min_periods : list
+        per configuration, minimum number of observations in window required to have a value
+    operation_names : list
+        per configuration, operation to be performed over the weighted window values, {'sum','mean'}
+    convolution_mode : str, {'auto','direct','fft'}
+        convolution used for the full rolling windows, by default 'auto'
+    fft_window_threshold : int
+        window size from which 'auto' uses FFT convolution
+    start : int, optional
+        first row to compute, the rows before it are the carried tail, which the caller drops,
+        by default 0
+
+    Returns
+    -------
+    np.ndarray
+        3D float array (rows, columns, configurations)
+    """
+    n_rows, n_columns = values.shape
+    mask = np.isfinite(values)
+    filled = np.where(mask, values, 0.0)
+    result = np.zeros((n_rows, n_columns, len(windows)), dtype=np.float64)
+    counts = {_window: _rolling_count(mask, _window) for _window in set(windows)}
+
+    direct_groups = {}
+    for _index, _window in enumerate(windows):
+        if _use_fft_convolution(filled, _window, convolution_mode, fft_window_threshold):
+            result[:, :, _index] = _weighted_rolling_sum(
+                filled, weight_functions[_index], _window, convolution_mode="fft", start=start
+            )
+        else:
+            direct_groups.setdefault(_window, []).append(_index)
+
+    for _window, _indexes in direct_groups.items():
+        for _length in range(start + 1, min(_window - 1, n_rows) + 1):
+            for _index in _indexes:
+                result[_length - 1, :, _index] = (
+                    weight_functions[_index](_length) @ filled[:_length]
+                )
+        if n_rows >= _window:
+            _weights = np.stack(
+                [weight_functions[_index](_window) for _index in _indexes], axis=1
+            )
+            _full = np.zeros((n_rows - _window + 1, n_columns, len(_indexes)))
+            for _position in range(_window):
+                _full += (
+                    filled[_position : n_rows - _window + 1 + _position, :, np.newaxis]
+                    * _weights[_position]
+                )
+            result[_window - 1 :, :, _indexes] = _full
+
+    for _index, (_window, _min_periods, _operation_name) in enumerate(
+        zip(windows, min_periods, operation_names)
+    ):
+        _result, _counts = result[:, :, _index], counts[_window]
+        if _operation_name == "mean":
+            with np.errstate(invalid="ignore", divide="ignore"):
+                _result /= _counts
+            _result[_counts == 0] = np.nan
+        _min_periods = _window if _min_periods is None else _min_periods
+        _result[_counts < _min_periods] = np.nan
+
+    return result
+
+
+def _batched_rolling_operation(
+    values: np.ndarray,
+    weight_function: Callable,
+    window: int,
+    min_periods: int,
+    operation: Callable,
+    operation_args: tuple = (),
+    start: int = 0,
+):
+    """
+    Applies a raw operation to the rolling windows of all columns in a single vectorized call
+
+    The operation must reduce over the last axis of its input, so that it accepts the
+    (rows, columns, window) stack of rolling windows as well as a single window.
+    Rows are processed in chunks, to bound the memory used by the weighted windows.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        2D float array (rows, columns)
+    weight_function : Callable
+        function returning the window weights for a given window length
+    window : int
+        Size of the rolling window
+    min_periods : int
+        Minimum number of observations in window required to have a value
+    operation : Callable
+        operation reducing the last axis of the weighted windows
+    operation_args : tuple, optional
+        additional agrument values to be sent for operation function
+    start : int, optional
+        first row to compute, the rows before it are the carried tail, which the caller drops,
+        by default 0
+    """
+    values = _missing_as_nan(values)
+    n_rows, n_columns = values.shape
+    min_periods = window if min_periods is None else min_periods
+    result = np.full(values.shape, np.nan)
+
+    def _apply(windows, weights):
+        if not np.all(weights == 1):
+            windows = windows * weights
+        return operation(windows, *operation_args)
+
+    with np.errstate(all="ignore"):
+        # partial windows shorter than min_periods can never hold enough observations
+        for _length in range(max(1, min_periods, start + 1), min(window - 1, n_rows) + 1):
+            result[_length - 1] = _apply(
+                values[:_length].T, weight_function(_length)
+            )
+
+        if n_rows >= window:
+            _windows = np.lib.stride_tricks.sliding_window_view(values, window, axis=0)
+            _weights = weight_function(window)
+            _chunk = max(1, _BATCH_ELEMENTS // (n_columns * window))
+            for _start in range(0, _windows.shape[0], _chunk):
+                result[window - 1 + _start : window - 1 + _start + _chunk] = _apply(
+                    _windows[_start : _start + _chunk], _weights
+                )
+
+    counts = _rolling_count(~np.isnan(values), window)
+    result[counts < min_periods] = np.nan
+    return result
+
+
+def _empty_window_result(x: np.ndarray):
+    return np.full(x.shape[:-1], np.nan)[()]
+
+
+def _window_nanmax(x: np.ndarray):
+    """
+    NaN skipping max over the last (window) axis of a raw window, NaN for empty or all NaN
+    windows, which is what np.max returns for a pandas Series window
+    """
+    if x.shape[-1] == 0:
+        return _empty_window_result(x)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        return np.nanmax(x, axis=-1)
+
+
+def _window_nanmin(x: np.ndarray):
+    """
+    NaN skipping min over the last (window) axis of a raw window, NaN for empty or all NaN
+    windows, which is what np.min returns for a pandas Series window
+    """
+    if x.shape[-1] == 0:
+        return _empty_window_result(x)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        return np.nanmin(x, axis=-1)
+
+
+def _window_nanargmax(x: np.ndarray):
+    """
+    Position of the NaN skipping max over the last (window) axis of a raw window,
+    -1 for all NaN windows, same as pandas Series.argmax
+    """
+    _all_nan = np.isnan(x).all(axis=-1)
+    return np.where(_all_nan, -1, np.argmax(np.where(np.isnan(x), -np.inf, x), axis=-1))[()]
+
+
+def _window_nanargmin(x: np.ndarray):
+    """
+    Position of the NaN skipping min over the last (window) axis of a raw window,
+    -1 for all NaN windows, same as pandas Series.argmin
+    """
+    _all_nan = np.isnan(x).all(axis=-1)
+    return np.where(_all_nan, -1, np.argmin(np.where(np.isnan(x), np.inf, x), axis=-1))[()]
+
+
+def _window_nanstd(x: np.ndarray):
+    """
+    NaN skipping population standard deviation over the last (window) axis of a raw window,
+    which is what np.std returns for a pandas Series window
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", category=RuntimeWarning)
+        return np.nanstd(x, axis=-1)
@@ -1,7 +1,54 @@
 from scipy import signal
+from functools import lru_cache
 import numpy as np
 
 
+_WINDOW_CACHE_MAXSIZE = 4096
+
+
+@lru_cache(maxsize=_WINDOW_CACHE_MAXSIZE)
+def _cached_window_function_values(kind, length, symmetric, params):
+    if kind == "equal":
+        window_function_values = np.ones(length)
+    elif kind == "weighted_moving":
+        window_function_values = np.arange(1, length + 1) / np.arange(1, length + 1).sum()
+    else:
+        window_function_values = getattr(signal.windows, kind)(
+            length, sym=symmetric, **dict(params)
+        )
+    window_function_values.setflags(write=False)
+    return window_function_values
+
+
+def _window_function_values(kind, length, symmetric, **params):
+    """
+    Window weights of the given kind and length, served from a shared bounded LRU cache
+    keyed by (kind, length, symmetric, extra window params). The returned array is read-only.
+    """
+    return _cached_window_function_values(
+        kind, length, symmetric, tuple(sorted(params.items()))
+    )
+
+
+def window_cache_info():
+    """
+    Hit/miss statistics of the shared window weights cache
+
+    Returns
+    -------
+    functools._CacheInfo
+        named tuple with hits, misses, maxsize and currsize
+    """
+    return _cached_window_function_values.cache_info()
+
+
+def clear_window_cache():
+    """
+    Empty the shared window weights cache and reset its statistics
+    """
+    _cached_window_function_values.cache_clear()
+
+
 def _weighted_window_operation(data,
                                window_size,
                                window_function_values,
@@ -21,9 +68,9 @@ def _barthann_window(data,
 
     if (len(data) < window_size)&(resize):
         data = np.concatenate((np.zeros(window_size-len(data)), data))
-        window_function_values=signal.windows.barthann(window_size, sym=symmetric)
+        window_function_values=_window_function_values("barthann", window_size, symmetric=symmetric)
     else:
-        window_function_values=signal.windows.barthann(len(data), sym=symmetric)
+        window_function_values=_window_function_values("barthann", len(data), symmetric=symmetric)
     return np.multiply(window_function_values, data)   
 
  
@@ -33,9 +80,9 @@ def _weighted_moving_window(data,
                   resize=False):
     if (len(data) < window_size)&(resize):
         data = np.concatenate((np.zeros(window_size-len(data)), data))
-        window_function_values=np.arange(1,window_size+1)/np.arange(1,window_size+1).sum()
+        window_function_values=_window_function_values("weighted_moving", window_size, symmetric=symmetric)
     else:
-        window_function_values=np.arange(1,len(data)+1)/np.arange(1,len(data)+1).sum()
+        window_function_values=_window_function_values("weighted_moving", len(data), symmetric=symmetric)
     return np.multiply(window_function_values, data)  
 
 
@@ -45,9 +92,9 @@ def _bartlett_window(data,
                   resize=False):
     if (len(data) < window_size)&(resize):
         data = np.concatenate((np.zeros(window_size-len(data)), data))
-        window_function_values=signal.windows.bartlett(window_size, sym=symmetric)
+        window_function_values=_window_function_values("bartlett", window_size, symmetric=symmetric)
     else:
-        window_function_values=signal.windows.bartlett(len(data), sym=symmetric)
+        window_function_values=_window_function_values("bartlett", len(data), symmetric=symmetric)
     return np.multiply(window_function_values, data)   
 
 
@@ -57,9 +104,9 @@ def _blackman_window(data,
                   resize=False):
     if (len(data) < window_size)&(resize):
         data = np.concatenate((np.zeros(window_size-len(data)), data))
-        window_function_values=signal.windows.blackman(window_size, sym=symmetric)
+        window_function_values=_window_function_values("blackman", window_size, symmetric=symmetric)
     else:
-        window_function_values=signal.windows.blackman(len(data), sym=symmetric)
+        window_function_values=_window_function_values("blackman", len(data), symmetric=symmetric)
     return np.multiply(window_function_values, data)  
 
 
@@ -69,9 +116,9 @@ def _blackmanharris_window(data,
                   resize=False):
     if (len(data) < window_size)&(resize):
         data = np.concatenate((np.zeros(window_size-len(data)), data))
-        window_function_values=signal.windows.blackmanharris(window_size, sym=symmetric)
+        window_function_values=_window_function_values("blackmanharris", window_size, symmetric=symmetric)
     else:
-        window_function_values=signal.windows.blackmanharris(len(data), sym=symmetric)
+        window_function_values=_window_function_values("blackmanharris", len(data), symmetric=symmetric)
     return np.multiply(window_function_values, data)
 
 
@@ -81,9 +128,9 @@ def _bohman_window(data,
                   resize=False):
     if (len(data) < window_size)&(resize):
         data = np.concatenate((np.zeros(window_size-len(data)), data))
-        window_function_values=signal.windows.bohman(window_size, sym=symmetric)
+        window_function_values=_window_function_values("bohman", window_size, symmetric=symmetric)
     else:
-        window_function_values=signal.windows.bohman(len(data), sym=symmetric)
+        window_function_values=_window_function_values("bohman", len(data), symmetric=symmetric)
     return np.multiply(window_function_values, data)
 
 
@@ -93,9 +140,9 @@ def _cosine_window(data,
                   resize=False):
     if (len(data) < window_size)&(resize):
         data = np.concatenate((np.zeros(window_size-len(data)), data))
-        window_function_values=signal.windows.cosine(window_size, sym=symmetric)
+        window_function_values=_window_function_values("cosine", window_size, symmetric=symmetric)
     else:
-        window_function_values=signal.windows.cosine(len(data), sym=symmetric)
+        window_function_values=_window_function_values("cosine", len(data), symmetric=symmetric)
     return np.multiply(window_function_values, data)
 
 
@@ -107,11 +154,9 @@ def _exponential_window(data,
                   resize=False):
     if (len(data) < window_size)&(resize):
         data = np.concatenate((np.zeros(window_size-len(data)), data))
-        window_function_values=signal.windows.exponential(window_size, center=center,
-                                      tau=tau, sym=symmetric)
+        window_function_values=_window_function_values("exponential", window_size, center=center, tau=tau, symmetric=symmetric)
     else:
-        window_function_values=signal.windows.exponential(len(data), center=center,
-                                      tau=tau, sym=symmetric)
+        window_function_values=_window_function_values("exponential", len(data), center=center, tau=tau, symmetric=symmetric)
     return np.multiply(window_function_values, data)
 
 
@@ -122,9 +167,9 @@ def _flattop_window(data,
                   resize=False):
     if (len(data) < window_size)&(resize):
         data = np.concatenate((np.zeros(window_size-len(data)), data))
-        window_function_values=signal.windows.flattop(window_size, sym=symmetric)
+        window_function_values=_window_function_values("flattop", window_size, symmetric=symmetric)
     else:
-        window_function_values=signal.windows.flattop(len(data), sym=symmetric)
+        window_function_values=_window_function_values("flattop", len(data), symmetric=symmetric)
     return np.multiply(window_function_values, data)
 
 
@@ -135,9 +180,9 @@ def _gaussian_window(data,
                   resize=False):
     if (len(data) < window_size)&(resize):
         data = np.concatenate((np.zeros(window_size-len(data)), data))
-        window_function_values=signal.windows.gaussian(window_size, std=std,sym=symmetric)
+        window_function_values=_window_function_values("gaussian", window_size, std=std, symmetric=symmetric)
     else:
-        window_function_values=signal.windows.gaussian(len(data), std=std,sym=symmetric)
+        window_function_values=_window_function_values("gaussian", len(data), std=std, symmetric=symmetric)
     return np.multiply(window_function_values, data)
 
 
@@ -147,9 +192,9 @@ def _hamming_window(data,
                   resize=False):
     if (len(data) < window_size)&(resize):
         data = np.concatenate((np.zeros(window_size-len(data)), data))
-        window_function_values=signal.windows.hamming(window_size, sym=symmetric)
+        window_function_values=_window_function_values("hamming", window_size, symmetric=symmetric)
     else:
-        window_function_values=signal.windows.hamming(len(data), sym=symmetric)
+        window_function_values=_window_function_values("hamming", len(data), symmetric=symmetric)
     return np.multiply(window_function_values, data)
 
 
@@ -159,9 +204,9 @@ def _hann_window(data,
                   resize=False):
     if (len(data) < window_size)&(resize):
         data = np.concatenate((np.zeros(window_size-len(data)), data))
-        window_function_values=signal.windows.hamming(window_size, sym=symmetric)
+        window_function_values=_window_function_values("hamming", window_size, symmetric=symmetric)
     else:
-        window_function_values=signal.windows.hamming(len(data), sym=symmetric)
+        window_function_values=_window_function_values("hamming", len(data), symmetric=symmetric)
     return np.multiply(window_function_values, data)
 
 
@@ -172,9 +217,9 @@ def _kaiser_window(data,
                   resize=False):
     if (len(data) < window_size)&(resize):
         data = np.concatenate((np.zeros(window_size-len(data)), data))
-        window_function_values=signal.windows.kaiser(window_size, beta,sym=symmetric)
+        window_function_values=_window_function_values("kaiser", window_size, beta=beta, symmetric=symmetric)
     else:
-        window_function_values=signal.windows.kaiser(len(data), beta,sym=symmetric)
+        window_function_values=_window_function_values("kaiser", len(data), beta=beta, symmetric=symmetric)
     return np.multiply(window_function_values, data)
 
 
@@ -184,9 +229,9 @@ def _parzen_window(data,
                   resize=False):
     if (len(data) < window_size)&(resize):
         data = np.concatenate((np.zeros(window_size-len(data)), data))
-        window_function_values=signal.windows.parzen(window_size,sym=symmetric)
+        window_function_values=_window_function_values("parzen", window_size, symmetric=symmetric)
     else:
-        window_function_values=signal.windows.parzen(len(data),sym=symmetric)
+        window_function_values=_window_function_values("parzen", len(data), symmetric=symmetric)
     return np.multiply(window_function_values, data)
 
 
@@ -196,9 +241,9 @@ def _triang_window(data,
                   resize=False):
     if (len(data) < window_size)&(resize):
         data = np.concatenate((np.zeros(window_size-len(data)), data))
-        window_function_values=signal.windows.triang(window_size,sym=symmetric)
+        window_function_values=_window_function_values("triang", window_size, symmetric=symmetric)
     else:
-        window_function_values=signal.windows.triang(len(data),sym=symmetric)
+        window_function_values=_window_function_values("triang", len(data), symmetric=symmetric)
     return np.multiply(window_function_values, data)
 
 
@@ -208,9 +253,9 @@ def _equal_window(data,
                   resize=False):
     if (len(data) < window_size)&(resize):
         data = np.concatenate((np.zeros(window_size-len(data)), data))
-        window_function_values=np.ones(window_size)
+        window_function_values=_window_function_values("equal", window_size, symmetric=symmetric)
     else:
-        window_function_values=np.ones(len(data))
+        window_function_values=_window_function_values("equal", len(data), symmetric=symmetric)
     return np.multiply(window_function_values, data)
 
 def _identity_window(data,
@@ -218,3 +263,29 @@ def _identity_window(data,
                   symmetric,
                   resize=False):
     return data
+
+
+_WINDOW_FUNCTIONS = {
+    "equal": _equal_window,
+    "barthann": _barthann_window,
+    "bartlett": _bartlett_window,
+    "blackman": _blackman_window,
+    "blackmanharris": _blackmanharris_window,
+    "bohman": _bohman_window,
+    "cosine": _cosine_window,
+    "exponential": _exponential_window,
+    "flattop": _flattop_window,
+    "gaussian": _gaussian_window,
+    "hamming": _hamming_window,
+    "hann": _hann_window,
+    "kaiser": _kaiser_window,
+    "parzen": _parzen_window,
+    "triang": _triang_window,
+    "weighted_moving_window": _weighted_moving_window,
+}
+
+_WINDOW_DEFAULT_PARAMS = {
+    "exponential": {"center": None, "tau": 1},
+    "gaussian": {"std": 1},
+    "kaiser": {"beta": 7},
+}
@@ -0,0 +1,345 @@
+"""
+Throughput benchmarks for every feature class exported by NitroFE
+
+Every case is timed in two modes
+    batch : one first_fit=True call over rows x columns
+    micro : repeated first_fit=False calls of --micro-batch-rows rows, after a first fit over --warmup-rows rows
+
+With --memory, micro mode also records the peak memory allocated per incremental call (tracemalloc),
+in a separate pass so that tracing does not distort the timings.
+
+Usage
+    python benchmarks/benchmark_features.py --save benchmarks/baseline.json
+    python benchmarks/benchmark_features.py --compare benchmarks/baseline.json --threshold 0.25
+    python benchmarks/benchmark_features.py --rows 1000 --columns 1 10 --cases Moving Weighted hann --memory
+
+With --compare, the exit code is 1 when any case is slower than its baseline timing by more than threshold,
+or raises an error while it ran in the baseline. Grid points whose estimated duration, extrapolated from the
+previous grid point of the same case, exceeds --max-seconds, or which hold more than --max-cells values,
+are recorded as skipped. With the default grid and --max-cells 1e8, the 10_000_000 rows x 100 and
+x 1000 columns points are always skipped, pass a larger --max-cells to run them.
+"""
+import argparse
+import inspect
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import warnings
+
+import numpy as np
+import pandas as pd
+
+import NitroFE
+
+
+BASELINE_VERSION = 1
+
+
+def _fit(feature, dataframe, weight, first_fit):
+    return feature.fit(dataframe, first_fit=first_fit)
+
+
+def _fit_weighted(feature, dataframe, weight, first_fit):
+    return feature.fit(dataframe, weight, first_fit=first_fit)
+
+
+def _weighted_window_method(method, **kwargs):
+    def _run(feature, dataframe, weight, first_fit):
+        if first_fit:
+            return getattr(feature, method)(dataframe, first_fit=True, **kwargs)
+        return getattr(feature, method)(dataframe, first_fit=False)
+
+    return _run
+
+
+def _fit_keyed(feature, dataframe, weight, first_fit):
+    # one column per entity id at the first fit, afterwards every row is a batch of
+    # (entity_id, value) ticks, one per entity
+    if first_fit:
+        return feature.fit(dataframe)
+    return feature.update(
+        np.tile(dataframe.columns, len(dataframe)), dataframe.to_numpy().reshape(-1)
+    )
+
+
+def _fit_engine(feature, dataframe, weight, first_fit):
+    payload = {
+        _column: {
+            "weighted_window_features": {
+                "hann": {"window": [5, 20]},
+                "kaiser": {"window": 10, "operation": np.max},
+            }
+        }
+        for _column in dataframe.columns
+    }
+    return feature.fit(dataframe, payload if first_fit else None, first_fit=first_fit)
+
+
+def _fit_encoding(feature, dataframe, weight, first_fit):
+    if first_fit:
+        _target = pd.Series(weight.iloc[:, 0].to_numpy(), index=dataframe.index, name="y")
+        if isinstance(feature, NitroFE.SmoothedEncoding):
+            feature.fit(
+                dataframe,
+                y=_target,
+                payload={_column: {"target_y": [np.mean]} for _column in dataframe.columns},
+            )
+        else:
+            feature.fit(dataframe, y=_target, columns_to_encode=list(dataframe.columns))
+    return feature.transform(dataframe)
+
+
+# name : (exported class, factory, runner, data kind)
+CASES = {
+    "ExponentialMovingFeature": ("ExponentialMovingFeature", lambda: NitroFE.ExponentialMovingFeature(span=8), _fit, "series"),
+    "HullMovingFeature": ("HullMovingFeature", lambda: NitroFE.HullMovingFeature(window=9), _fit, "series"),
+    "KaufmanAdaptiveMovingAverage": ("KaufmanAdaptiveMovingAverage", lambda: NitroFE.KaufmanAdaptiveMovingAverage(), _fit, "series"),
+    "FractalAdaptiveMovingAverage": ("FractalAdaptiveMovingAverage", lambda: NitroFE.FractalAdaptiveMovingAverage(), _fit, "series"),
+    "TripleExponentialMovingFeature": ("TripleExponentialMovingFeature", lambda: NitroFE.TripleExponentialMovingFeature(span=8), _fit, "series"),
+    "SmoothedMovingAverage": ("SmoothedMovingAverage", lambda: NitroFE.SmoothedMovingAverage(), _fit, "series"),
+    "AbsolutePriceOscillator": ("AbsolutePriceOscillator", lambda: NitroFE.AbsolutePriceOscillator(), _fit, "series"),
+    "PercentageValueOscillator": ("PercentageValueOscillator", lambda: NitroFE.PercentageValueOscillator(), _fit, "series"),
+    "MovingAverageConvergenceDivergence": ("MovingAverageConvergenceDivergence", lambda: NitroFE.MovingAverageConvergenceDivergence(), _fit, "series"),
+    "AverageTrueRange": ("AverageTrueRange", lambda: NitroFE.AverageTrueRange(), _fit, "series"),
+    "AverageDirectionalMovementIndex": ("AverageDirectionalMovementIndex", lambda: NitroFE.AverageDirectionalMovementIndex(), _fit, "series"),
+    "AroonOscillator": ("AroonOscillator", lambda: NitroFE.AroonOscillator(), _fit, "series"),
+    "TypicalValue": ("TypicalValue", lambda: NitroFE.TypicalValue(), _fit, "series"),
+    "BollingerBands": ("BollingerBands", lambda: NitroFE.BollingerBands(), _fit, "series"),
+    "KaufmanEfficiency": ("KaufmanEfficiency", lambda: NitroFE.KaufmanEfficiency(), _fit, "series"),
+    "TripleExponentialMovingAverageOscillator": ("TripleExponentialMovingAverageOscillator", lambda: NitroFE.TripleExponentialMovingAverageOscillator(span=8), _fit, "series"),
+    "ZeroLagExponentialMovingFeature": ("ZeroLagExponentialMovingFeature", lambda: NitroFE.ZeroLagExponentialMovingFeature(span=8), _fit, "series"),
+    "RelativeStrengthIndex": ("RelativeStrengthIndex", lambda: NitroFE.RelativeStrengthIndex(), _fit, "series"),
+    "InverseFisherRelativeStrengthIndex": ("InverseFisherRelativeStrengthIndex", lambda: NitroFE.InverseFisherRelativeStrengthIndex(), _fit, "series"),
+    "KeltnerChannel": ("KeltnerChannel", lambda: NitroFE.KeltnerChannel(), _fit, "series"),
+    "KeyedRelativeStrengthIndex": ("KeyedRelativeStrengthIndex", lambda: NitroFE.KeyedRelativeStrengthIndex(), _fit_keyed, "series"),
+    "KeyedAverageTrueRange": ("KeyedAverageTrueRange", lambda: NitroFE.KeyedAverageTrueRange(), _fit_keyed, "series"),
+    "KeyedBollingerBands": ("KeyedBollingerBands", lambda: NitroFE.KeyedBollingerBands(), _fit_keyed, "series"),
+    "KeyedMovingAverageConvergenceDivergence": ("KeyedMovingAverageConvergenceDivergence", lambda: NitroFE.KeyedMovingAverageConvergenceDivergence(), _fit_keyed, "series"),
+    "SeriesWeightedAverage": ("SeriesWeightedAverage", lambda: NitroFE.SeriesWeightedAverage(), _fit_weighted, "series"),
+    "SeriesWeightedMovingFeature": ("SeriesWeightedMovingFeature", lambda: NitroFE.SeriesWeightedMovingFeature(), _fit_weighted, "series"),
+    "weighted_window_features.hann_mean": ("weighted_window_features", lambda: NitroFE.weighted_window_features(), _weighted_window_method("caluclate_hann_feature", window=10), "series"),
+    "weighted_window_features.hann_max": ("weighted_window_features", lambda: NitroFE.weighted_window_features(), _weighted_window_method("caluclate_hann_feature", window=10, operation=np.max), "series"),
+    "weighted_rolling_window_engine": ("weighted_rolling_window_engine", lambda: NitroFE.weighted_rolling_window_engine(), _fit_engine, "series"),
+    "SmoothedEncoding": ("SmoothedEncoding", lambda: NitroFE.SmoothedEncoding(), _fit_encoding, "categorical"),
+    "CategoricalEncoding": ("CategoricalEncoding", lambda: NitroFE.CategoricalEncoding(), _fit_encoding, "categorical"),
+}
+
+
+def _make_data(kind: str, n_rows: int, n_columns: int, seed: int):
+    rng = np.random.default_rng(seed)
+    columns = [f"c{_column}" for _column in range(n_columns)]
+    weight = pd.DataFrame(rng.uniform(1, 5, size=(n_rows, n_columns)), columns=columns)
+    if kind == "categorical":
+        dataframe = pd.DataFrame(
+            rng.integers(0, 50, size=(n_rows, n_columns)).astype(str), columns=columns
+        )
+    else:
+        dataframe = pd.DataFrame(
+            100 + rng.normal(size=(n_rows, n_columns)).cumsum(axis=0), columns=columns
+        )
+    return dataframe, weight
+
+
+def _time_batch(case: tuple, n_rows: int, n_columns: int, repeat: int, seed: int):
+    _, factory, runner, kind = case
+    dataframe, weight = _make_data(kind, n_rows, n_columns, seed)
+    timings = []
+    for _ in range(repeat):
+        feature = factory()
+        _start = time.perf_counter()
+        runner(feature, dataframe, weight, True)
+        timings.append(time.perf_counter() - _start)
+    return min(timings), n_rows
+
+
+def _time_micro(
+    case: tuple,
+    n_columns: int,
+    warmup_rows: int,
+    micro_batches: int,
+    micro_batch_rows: int,
+    seed: int,
+    memory: bool = False,
+):
+    _, factory, runner, kind = case
+    dataframe, weight = _make_data(
+        kind, warmup_rows + 2 * micro_batches * micro_batch_rows, n_columns, seed
+    )
+    feature = factory()
+    runner(feature, dataframe.iloc[:warmup_rows], weight.iloc[:warmup_rows], True)
+
+    # the batches are sliced up front, slicing is not part of the measured incremental call
+    batches = []
+    for _batch in range(2 * micro_batches):
+        _rows = slice(
+            warmup_rows + _batch * micro_batch_rows,
+            warmup_rows + (_batch + 1) * micro_batch_rows,
+        )
+        batches.append((dataframe.iloc[_rows], weight.iloc[_rows]))
+
+    _start = time.perf_counter()
+    for _dataframe, _weight in batches[:micro_batches]:
+        runner(feature, _dataframe, _weight, False)
+    seconds = (time.perf_counter() - _start) / micro_batches
+
+    peak_bytes = None
+    if memory:
+        _peaks = []
+        tracemalloc.start()
+        try:
+            for _dataframe, _weight in batches[micro_batches:]:
+                tracemalloc.reset_peak()
+                _before = tracemalloc.get_traced_memory()[0]
+                runner(feature, _dataframe, _weight, False)
+                _peaks.append(tracemalloc.get_traced_memory()[1] - _before)
+        finally:
+            tracemalloc.stop()
+        peak_bytes = float(np.mean(_peaks))
+    return seconds, micro_batch_rows, peak_bytes
+
+
+def run_benchmarks(args):
+    results = {}
+    for name, case in CASES.items():
+        if args.cases and not any(_pattern in name for _pattern in args.cases):
+            continue
+        grids = {
+            "batch": sorted(
+                ((_rows, _columns) for _rows in args.rows for _columns in args.columns),
+                key=lambda _grid: _grid[0] * _grid[1],
+            ),
+            "micro": [(args.micro_batch_rows, _columns) for _columns in sorted(args.columns)],
+        }
+        for mode, grid in grids.items():
+            _last = None
+            for n_rows, n_columns in grid:
+                key = f"{name}|{mode}|rows={n_rows}|columns={n_columns}"
+                _cells = n_rows * n_columns
+                if _cells > args.max_cells:
+                    results[key] = {"skipped": f"{_cells} cells above --max-cells"}
+                    print(f"{key:90s} skipped, {_cells} cells above --max-cells")
+                    continue
+                if _last is not None:
+                    _estimate = _last[0] * _cells / _last[1]
+                    if _estimate > args.max_seconds:
+                        results[key] = {"skipped": f"estimated {_estimate:.1f}s above --max-seconds"}
+                        print(f"{key:90s} skipped, estimated {_estimate:.1f}s")
+                        continue
+                peak_bytes = None
+                try:
+                    if mode == "batch":
+                        seconds, rows = _time_batch(case, n_rows, n_columns, args.repeat, args.seed)
+                    else:
+                        seconds, rows, peak_bytes = _time_micro(
+                            case,
+                            n_columns,
+                            args.warmup_rows,
+                            args.micro_batches,
+                            args.micro_batch_rows,
+                            args.seed,
+                            args.memory,
+                        )
+                except Exception as error:
+                    results[key] = {"error": f"{type(error).__name__}: {error}"}
+                    print(f"{key:90s} error {type(error).__name__}")
+                    continue
+                _last = (seconds, _cells)
+                results[key] = {
+                    "seconds": seconds,
+                    "rows_per_second": rows / seconds if seconds > 0 else float("inf"),
+                }
+                if peak_bytes is not None:
+                    results[key]["peak_bytes"] = peak_bytes
+                    print(f"{key:90s} {seconds:12.6f}s {peak_bytes / 1024:10.1f}KiB")
+                else:
+                    print(f"{key:90s} {seconds:12.6f}s")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float):
+    """
+    Returns the keys of the cases slower than their baseline timing by more than threshold,
+    and of the cases raising an error which ran in the baseline
+    """
+    regressions = []
+    for key, result in results.items():
+        _baseline = baseline["results"].get(key, {})
+        if ("error" in result) and ("seconds" in _baseline):
+            regressions.append(key)
+            print(f"REGRESSION {key}: ran in the baseline, now raises {result['error']}")
+            continue
+        if ("seconds" not in result) or ("seconds" not in _baseline):
+            continue
+        _ratio = result["seconds"] / max(_baseline["seconds"], 1e-12)
+        if _ratio > 1 + threshold:
+            regressions.append(key)
+            print(f"REGRESSION {key}: {_baseline['seconds']:.6f}s -> {result['seconds']:.6f}s ({_ratio:.2f}x)")
+    return regressions
+
+
+def _missing_cases():
+    _covered = {_case[0] for _case in CASES.values()}
+    return [
+        _name
+        for _name, _value in vars(NitroFE).items()
+        if inspect.isclass(_value) and _name not in _covered
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000, 10_000_000])
+    parser.add_argument("--columns", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--cases", nargs="*", default=None, help="only run cases whose name contains one of these")
+    parser.add_argument("--repeat", type=int, default=3, help="batch timings keep the best of repeat runs")
+    parser.add_argument("--warmup-rows", type=int, default=1_000)
+    parser.add_argument("--micro-batches", type=int, default=100)
+    parser.add_argument("--micro-batch-rows", type=int, default=1)
+    parser.add_argument("--memory", action="store_true", help="record the peak allocation of every micro batch call")
+    parser.add_argument("--max-seconds", type=float, default=60.0)
+    parser.add_argument(
+        "--max-cells", type=float, default=1e8, help="skip grid points holding more rows x columns values"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", default=None, help="write the results as a baseline json file")
+    parser.add_argument("--compare", default=None, help="baseline json file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed relative slowdown")
+    args = parser.parse_args(argv)
+
+    for _name in _missing_cases():
+        print(f"WARNING no benchmark case for exported class {_name}")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        results = run_benchmarks(args)
+
+    if args.save:
+        with open(args.save, "w") as _file:
+            json.dump(
+                {
+                    "version": BASELINE_VERSION,
+                    "python": platform.python_version(),
+                    "numpy": np.__version__,
+                    "pandas": pd.__version__,
+                    "machine": platform.machine(),
+                    "results": results,
+                },
+                _file,
+                indent=1,
+                sort_keys=True,
+            )
+
+    if args.compare:
+        with open(args.compare) as _file:
+            baseline = json.load(_file)
+        if baseline.get("version") != BASELINE_VERSION:
+            raise ValueError(f"baseline version {baseline.get('version')} not supported")
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
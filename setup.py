@@ -18,4 +18,7 @@ setup(name='NitroFE',
 		"scipy",
             "plotly"
 		],
+	  extras_require={
+		"jit": ["numba"],
+		},
       )
\ No newline at end of file
@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from NitroFE import (
+    KaufmanAdaptiveMovingAverage,
+    async_feature_stream,
+    micro_batch_coalescer,
+    weighted_window_features,
+)
+
+
+def test_micro_batches_after_a_failed_fit_fail_until_reset():
+    fitted = []
+
+    def feature(batch: pd.DataFrame, first_fit: bool = False):
+        if batch["x"].isna().any():
+            raise ValueError("missing value")
+        fitted.append(list(batch["x"]))
+        return batch * 2
+
+    async def run():
+        async with micro_batch_coalescer(feature, max_batch_size=2, max_latency=10) as coalescer:
+            results = await asyncio.gather(
+                *[coalescer.submit({"x": _x}) for _x in [1.0, np.nan, 3.0, 4.0]],
+                return_exceptions=True,
+            )
+            await coalescer.reset()
+            resumed = await asyncio.gather(
+                *[coalescer.submit({"x": _x}) for _x in [5.0, 6.0]]
+            )
+        return results, resumed
+
+    results, resumed = asyncio.run(run())
+
+    assert all(isinstance(_result, ValueError) for _result in results)
+    assert "missing value" in str(results[0])
+    # the micro-batch queued behind the failed one is not fitted on the partly updated state
+    assert isinstance(results[2].__cause__, ValueError)
+    assert [_row["x"] for _row in resumed] == [10.0, 12.0]
+    assert fitted == [[5.0, 6.0]]
+
+
+def test_reset_without_a_failure_keeps_fitting():
+    async def run():
+        coalescer = micro_batch_coalescer(lambda batch, first_fit: batch, max_latency=0)
+        await coalescer.reset()
+        result = await coalescer.submit({"x": 1.0})
+        coalescer.close()
+        return result
+
+    assert asyncio.run(run())["x"] == 1.0
+
+
+def test_stream_results_follow_the_stream_order_and_equal_a_serial_fit():
+    rng = np.random.default_rng(0)
+    dataframe = pd.DataFrame(
+        100 + rng.normal(size=(60, 2)).cumsum(axis=0), columns=["a", "b"]
+    )
+    # single rows (series and dicts) and micro-batches of varying size
+    _cuts = [0, 20, 21, 22, 30, 31, 45, 60]
+    items = [dataframe.iloc[_start:_stop] for _start, _stop in zip(_cuts[:-1], _cuts[1:])]
+    items[1], items[2] = items[1].iloc[0], items[2].iloc[0].to_dict()
+
+    def slow_hann(batch: pd.DataFrame, first_fit: bool = False):
+        # later batches finish first, unless the calls of a feature are chained
+        time.sleep(0.02 * rng.random())
+        return hann.caluclate_hann_feature(batch, first_fit=first_fit, window=4)
+
+    async def run():
+        async with async_feature_stream(
+            {"kama": kama, "hann": slow_hann}, first_fit=True, max_workers=4
+        ) as stream:
+            return [_result async for _result in stream.stream(items)]
+
+    kama, hann = KaufmanAdaptiveMovingAverage(), weighted_window_features()
+    results = asyncio.run(run())
+
+    assert len(results) == len(items)
+    for _name, expected in [
+        ("kama", KaufmanAdaptiveMovingAverage().fit(dataframe)),
+        ("hann", weighted_window_features().caluclate_hann_feature(dataframe, window=4)),
+    ]:
+        result = pd.concat([_result[_name] for _result in results])
+        np.testing.assert_allclose(
+            result.to_numpy(dtype=np.float64), expected.to_numpy(), rtol=1e-9
+        )
+
+
+@pytest.mark.parametrize("max_pending", [1, 3])
+def test_stream_stops_pulling_from_the_source_for_a_slow_consumer(max_pending):
+    pulled = []
+
+    async def source():
+        for _x in range(20):
+            pulled.append(_x)
+            yield {"x": float(_x)}
+
+    async def run():
+        ahead = []
+        async with async_feature_stream(
+            lambda batch, first_fit: batch, max_pending=max_pending
+        ) as stream:
+            consumed = 0
+            async for _result in stream.stream(source()):
+                assert _result["x"].tolist() == [float(consumed)]
+                consumed += 1
+                # give the producer time to run as far ahead as it may
+                await asyncio.sleep(0.01)
+                ahead.append(len(pulled) - consumed)
+        return ahead
+
+    ahead = asyncio.run(run())
+
+    assert len(ahead) == 20
+    # max_pending results wait in the queue, one more item is held by the blocked producer
+    assert max(ahead) == max_pending + 1
+    assert ahead[-1] == 0
@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from NitroFE import (
+    AverageTrueRange,
+    BollingerBands,
+    HullMovingFeature,
+    KaufmanAdaptiveMovingAverage,
+    KeltnerChannel,
+    MovingAverageConvergenceDivergence,
+    chunked_fit,
+)
+
+
+FEATURES = [
+    KaufmanAdaptiveMovingAverage,
+    BollingerBands,
+    AverageTrueRange,
+    MovingAverageConvergenceDivergence,
+    HullMovingFeature,
+    KeltnerChannel,
+]
+
+
+def _history(n_rows=300):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        100 + rng.normal(size=(n_rows, 2)).cumsum(axis=0), columns=["a", "b"]
+    )
+
+
+def _chunks(dataframe):
+    # uneven chunks, one of them a single row
+    _cuts = [0, 40, 41, 97, 180, 181, 250, len(dataframe)]
+    for _start, _stop in zip(_cuts[:-1], _cuts[1:]):
+        yield dataframe.iloc[_start:_stop]
+
+
+@pytest.mark.parametrize("feature", FEATURES)
+@pytest.mark.parametrize("sink", [None, "result.npy", "result.csv"])
+def test_chunked_fit_equals_a_single_fit(tmp_path, feature, sink):
+    dataframe = _history()
+    expected = feature().fit(dataframe)
+
+    if sink is None:
+        result = pd.concat(list(chunked_fit(feature(), _chunks(dataframe))))
+    else:
+        result = chunked_fit(feature(), _chunks(dataframe), sink=str(tmp_path / sink))
+        if sink.endswith(".csv"):
+            result = pd.read_csv(result, index_col=0)
+    np.testing.assert_allclose(
+        np.asarray(result, dtype=np.float64).reshape(len(dataframe), -1),
+        np.asarray(expected, dtype=np.float64).reshape(len(dataframe), -1),
+        rtol=1e-9,
+        equal_nan=True,
+    )
+
+
+@pytest.mark.parametrize("sink", ["result.npy", "result.csv"])
+def test_chunked_fit_of_a_feature_set_combines_the_columns(tmp_path, sink):
+    dataframe = _history()
+    features = {"kama": KaufmanAdaptiveMovingAverage(), "bands": BollingerBands()}
+    expected = pd.concat(
+        [
+            KaufmanAdaptiveMovingAverage().fit(dataframe).add_suffix("_kama"),
+            BollingerBands().fit(dataframe).add_suffix("_bands"),
+        ],
+        axis=1,
+    )
+
+    result = chunked_fit(features, _chunks(dataframe), sink=str(tmp_path / sink))
+    if sink.endswith(".csv"):
+        result = pd.read_csv(result, index_col=0)
+        assert list(result.columns) == list(expected.columns)
+    np.testing.assert_allclose(
+        np.asarray(result, dtype=np.float64), expected.to_numpy(), rtol=1e-9, equal_nan=True
+    )
@@ -0,0 +1,127 @@
+import json
+import statistics
+import zlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import NitroFE
+from NitroFE.time_based_features.feature_state import _HEADER
+
+
+def _history():
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(100 + rng.normal(size=(80, 3)).cumsum(axis=0), columns=list("abc"))
+
+
+def _replace_in_header(state: bytes, old: str, new: str):
+    _magic, _version, _length = _HEADER.unpack_from(state, 0)
+    header = zlib.decompress(state[_HEADER.size : _HEADER.size + _length]).decode()
+    assert old in header
+    header = zlib.compress(header.replace(old, new).encode())
+    header += b"\0" * (-(_HEADER.size + len(header)) % 8)
+    return (
+        _HEADER.pack(_magic, _version, len(header))
+        + header
+        + state[_HEADER.size + _length :]
+    )
+
+
+def test_restored_feature_continues_like_the_original():
+    dataframe = _history()
+    feature = NitroFE.AverageDirectionalMovementIndex()
+    feature.fit(dataframe.iloc[:60])
+    state = feature.get_state()
+
+    restored = NitroFE.AverageDirectionalMovementIndex().set_state(state)
+    pd.testing.assert_frame_equal(
+        restored.fit(dataframe.iloc[60:], first_fit=False),
+        feature.fit(dataframe.iloc[60:], first_fit=False),
+    )
+
+
+def test_snapshot_paths_outside_nitrofe_are_not_resolved():
+    feature = NitroFE.HullMovingFeature(window=9)
+    feature.fit(_history())
+    state = _replace_in_header(feature.get_state(), '"numpy:mean"', '"os:getcwd"')
+
+    with pytest.raises(ValueError, match="os:getcwd"):
+        NitroFE.HullMovingFeature(window=9).set_state(state)
+
+
+def test_self_defined_operations_are_passed_to_set_state():
+    dataframe = _history()
+    feature = NitroFE.weighted_window_features()
+    feature.caluclate_hann_feature(dataframe.iloc[:60], window=4, operation=statistics.fmean)
+    state = feature.get_state()
+
+    with pytest.raises(ValueError, match="statistics:fmean"):
+        NitroFE.weighted_window_features().set_state(state)
+    restored = NitroFE.weighted_window_features().set_state(
+        state, operations=(statistics.fmean,)
+    )
+    pd.testing.assert_frame_equal(
+        restored.caluclate_hann_feature(dataframe.iloc[60:], first_fit=False),
+        feature.caluclate_hann_feature(dataframe.iloc[60:], first_fit=False),
+    )
+
+
+def test_state_store_arrays_stay_out_of_the_snapshot(tmp_path):
+    ticks = 100 + np.random.default_rng(0).normal(size=(30, 10)).cumsum(axis=0)
+    in_memory = NitroFE.KeyedRelativeStrengthIndex()
+    feature = NitroFE.KeyedRelativeStrengthIndex().open_state_store(
+        str(tmp_path / "rsi.state"), n_entities=100_000
+    )
+    for _values in ticks[:20]:
+        in_memory.update(np.arange(10), _values)
+        feature.update(np.arange(10), _values)
+    state = feature.get_state()
+
+    assert len(state) < 4096
+    restored = NitroFE.KeyedRelativeStrengthIndex().set_state(state)
+    assert restored.n_entities == 100_000
+    for _values in ticks[20:]:
+        expected = in_memory.update(np.arange(10), _values)
+        assert np.isfinite(expected).all()
+        np.testing.assert_allclose(restored.update(np.arange(10), _values), expected)
+
+
+@pytest.mark.parametrize(
+    "feature",
+    [
+        NitroFE.SmoothedMovingAverage,
+        NitroFE.RelativeStrengthIndex,
+        NitroFE.InverseFisherRelativeStrengthIndex,
+    ],
+)
+def test_latest_equals_fit_with_nan_in_the_history(feature):
+    rng = np.random.default_rng(0)
+    dataframe = pd.DataFrame(100 + rng.normal(size=(3000, 2)).cumsum(axis=0), columns=["a", "b"])
+    dataframe.iloc[100, 0] = np.nan
+
+    pd.testing.assert_frame_equal(
+        feature().latest(dataframe, k=3), feature().fit(dataframe).iloc[-3:]
+    )
+
+
+@pytest.mark.parametrize(
+    "feature",
+    [
+        NitroFE.BollingerBands,
+        NitroFE.KaufmanAdaptiveMovingAverage,
+        NitroFE.KeyedRelativeStrengthIndex,
+    ],
+)
+def test_latest_leaves_the_fitted_state_unchanged(feature):
+    dataframe = _history()
+    fitted, reference = feature(), feature()
+    fitted.fit(dataframe.iloc[:60])
+    reference.fit(dataframe.iloc[:60])
+
+    fitted.latest(dataframe.iloc[:40], k=3)
+
+    pd.testing.assert_frame_equal(
+        fitted.fit(dataframe.iloc[60:], first_fit=False),
+        reference.fit(dataframe.iloc[60:], first_fit=False),
+    )
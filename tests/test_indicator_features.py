@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from NitroFE.time_based_features.indicator_features._ElasticSeriesWeightedAverage import (
+    ElasticSeriesWeightedAverage,
+)
+
+
+def _reference_eswa(dataframe, weights, weight_sum_lookback):
+    # the pandas implementation: rolling sums of the weights, which skip NaN and inf,
+    # and the recursion run row by row, a missing value or gain leaving the average unchanged
+    weight_sum = weights.rolling(weight_sum_lookback, min_periods=1).sum().to_numpy()
+    values, weights = dataframe.to_numpy(), weights.to_numpy()
+    result = np.empty(values.shape)
+    previous = values[0]
+    for _row in range(len(values)):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            gain = weights[_row] / weight_sum[_row]
+        update = np.isfinite(values[_row]) & np.isfinite(gain)
+        previous = np.where(update, previous + gain * (values[_row] - previous), previous)
+        result[_row] = previous
+    return pd.DataFrame(result, columns=dataframe.columns)
+
+
+def _eswa_frames(missing_in):
+    rng = np.random.default_rng(0)
+    dataframe = pd.DataFrame(100 + rng.normal(size=(60, 2)).cumsum(axis=0), columns=["a", "b"])
+    weights = pd.DataFrame(rng.uniform(1, 5, size=(60, 2)), columns=["a", "b"])
+    changed = weights if missing_in == "weights" else dataframe
+    changed.iloc[5, 0] = np.inf
+    changed.iloc[20, 1] = -np.inf
+    changed.iloc[40, 0] = np.nan
+    return dataframe, weights
+
+
+@pytest.mark.parametrize("missing_in", ["weights", "values"])
+@pytest.mark.parametrize("cuts", [(60,), (7, 8, 30, 60)])
+def test_elastic_series_weighted_average_skips_inf_like_pandas_rolling(missing_in, cuts):
+    dataframe, weights = _eswa_frames(missing_in)
+    feature = ElasticSeriesWeightedAverage(weight_sum_lookback=4)
+    result = pd.concat(
+        [
+            feature.fit(
+                dataframe.iloc[_start:_stop],
+                weights.iloc[_start:_stop],
+                first_fit=_start == 0,
+            )
+            for _start, _stop in zip((0,) + cuts[:-1], cuts)
+        ],
+        ignore_index=True,
+    )
+
+    assert np.isfinite(result.to_numpy()).all()
+    pd.testing.assert_frame_equal(result, _reference_eswa(dataframe, weights, 4), rtol=1e-9)
@@ -0,0 +1,130 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import NitroFE
+from NitroFE.time_based_features.keyed_state import keyed_entity_state
+
+
+def _interleaved_ticks(n_entities=4, n_rows=60):
+    """
+    Ticks of several entities in a random interleaving, which keeps the order of every entity
+    """
+    rng = np.random.default_rng(0)
+    histories = {
+        _entity: 100 + rng.normal(size=n_rows - 5 * _entity).cumsum()
+        for _entity in range(n_entities)
+    }
+    entity_ids = rng.permutation(
+        np.repeat(list(histories), [len(_history) for _history in histories.values()])
+    )
+    _positions = {_entity: 0 for _entity in histories}
+    values = []
+    for _entity in entity_ids:
+        values.append(histories[_entity][_positions[_entity]])
+        _positions[_entity] += 1
+    return histories, entity_ids, np.array(values)
+
+
+def test_subclass_without_update_rows_cannot_be_created():
+    class _incomplete_state(keyed_entity_state):
+        _output_names = ("value",)
+
+    with pytest.raises(TypeError, match="_update_rows"):
+        _incomplete_state()
+
+
+@pytest.mark.parametrize(
+    "keyed, single",
+    [
+        (NitroFE.KeyedRelativeStrengthIndex, NitroFE.RelativeStrengthIndex),
+        (NitroFE.KeyedAverageTrueRange, NitroFE.AverageTrueRange),
+        (NitroFE.KeyedBollingerBands, NitroFE.BollingerBands),
+        (
+            NitroFE.KeyedMovingAverageConvergenceDivergence,
+            NitroFE.MovingAverageConvergenceDivergence,
+        ),
+    ],
+)
+def test_keyed_values_equal_the_feature_fitted_per_entity(keyed, single):
+    histories, entity_ids, values = _interleaved_ticks()
+    feature = keyed()
+    # batches of varying size, some holding several ticks of one entity
+    _cuts = [0, 1, 2, 9, 30, 31, 80, 150, len(values)]
+    result = pd.concat(
+        [
+            feature.update(entity_ids[_start:_stop], values[_start:_stop])
+            for _start, _stop in zip(_cuts[:-1], _cuts[1:])
+        ]
+    )
+
+    for _entity, _history in histories.items():
+        expected = single().fit(pd.Series(_history))
+        np.testing.assert_allclose(
+            np.asarray(result[entity_ids == _entity], dtype=np.float64),
+            np.asarray(expected, dtype=np.float64).reshape(len(_history), -1).squeeze(),
+            rtol=1e-9,
+        )
+
+
+@pytest.mark.parametrize(
+    "keyed",
+    [NitroFE.KeyedRelativeStrengthIndex, NitroFE.KeyedBollingerBands],
+)
+def test_state_store_reopened_continues_like_a_continuous_run(tmp_path, keyed):
+    path = str(tmp_path / "feature.state")
+    ticks = pd.DataFrame(
+        100 + np.random.default_rng(0).normal(size=(60, 4)).cumsum(axis=0),
+        columns=range(4),
+    )
+    in_memory = keyed()
+    in_memory.fit(ticks.iloc[:30])
+    expected_fit = in_memory.fit(ticks.iloc[30:45], first_fit=False)
+    expected_update = pd.concat(
+        [in_memory.update(ticks.columns, _values) for _values in ticks.iloc[45:].to_numpy()]
+    )
+
+    feature = keyed().open_state_store(path, n_entities=4)
+    feature.fit(ticks.iloc[:30])
+    feature.flush()
+    del feature
+
+    reopened = keyed().open_state_store(path)
+    pd.testing.assert_frame_equal(
+        reopened.fit(ticks.iloc[30:45], first_fit=False), expected_fit
+    )
+    del reopened
+    reopened = keyed().open_state_store(path, n_entities=4)
+    result = pd.concat(
+        [reopened.update(ticks.columns, _values) for _values in ticks.iloc[45:].to_numpy()]
+    )
+    assert np.isfinite(np.asarray(expected_update, dtype=np.float64)).all()
+    np.testing.assert_allclose(
+        np.asarray(result, dtype=np.float64), np.asarray(expected_update, dtype=np.float64)
+    )
+
+
+def test_state_store_grows_past_its_initial_capacity(tmp_path):
+    path = str(tmp_path / "rsi.state")
+    ticks = pd.DataFrame(
+        100 + np.random.default_rng(0).normal(size=(40, 6)).cumsum(axis=0),
+        columns=range(6),
+    )
+    in_memory = NitroFE.KeyedRelativeStrengthIndex()
+    in_memory.fit(ticks.iloc[:20, :3])
+    expected = in_memory.fit(ticks.iloc[20:], first_fit=False)
+
+    feature = NitroFE.KeyedRelativeStrengthIndex().open_state_store(path, n_entities=3)
+    feature.fit(ticks.iloc[:20, :3])
+    with pytest.raises(ValueError, match="entity ids of a state store"):
+        feature.update([3], [100.0])
+    feature.flush()
+    del feature
+
+    grown = NitroFE.KeyedRelativeStrengthIndex().open_state_store(path, n_entities=6)
+    assert grown.n_entities == 6
+    pd.testing.assert_frame_equal(grown.fit(ticks.iloc[20:], first_fit=False), expected)
+    del grown
+
+    with pytest.raises(ValueError, match="can only grow"):
+        NitroFE.KeyedRelativeStrengthIndex().open_state_store(path, n_entities=3)
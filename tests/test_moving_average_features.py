@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import NitroFE
+
+
+def _history(n_rows=80):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(100 + rng.normal(size=(n_rows, 2)).cumsum(axis=0), columns=["a", "b"])
+
+
+def _fit_in_chunks(feature, dataframe, cuts):
+    return pd.concat(
+        [
+            feature.fit(dataframe.iloc[_start:_stop], first_fit=_start == 0)
+            for _start, _stop in zip((0,) + cuts[:-1], cuts)
+        ]
+    )
+
+
+def _reference_kaufman_efficiency(x):
+    down = np.nansum(np.abs(np.diff(x)))
+    return 0 if down == 0 else np.abs(x[-1] - x[0]) / down
+
+
+def _reference_kama(dataframe, lookback_period, min_periods, fast_ema_span=2, slow_ema_span=5):
+    # the pandas implementation: rolling apply of the efficiency ratio, then the recursion row by row
+    efficiency = (
+        dataframe.rolling(lookback_period, min_periods=min_periods)
+        .apply(_reference_kaufman_efficiency, raw=True)
+        .to_numpy()
+    )
+    smoothing = (
+        efficiency * (2 / (fast_ema_span + 1) - 2 / (slow_ema_span + 1)) + 2 / (slow_ema_span + 1)
+    ) ** 2
+    if min_periods is None:
+        _first = lookback_period - 1
+    else:
+        _first = max(min_periods - 1, 1)
+
+    values = dataframe.to_numpy()
+    result = np.zeros(values.shape)
+    for _row in range(_first, len(values)):
+        result[_row] = result[_row - 1] + smoothing[_row] * (values[_row] - result[_row - 1])
+    return pd.DataFrame(result, index=dataframe.index, columns=dataframe.columns)
+
+
+@pytest.mark.parametrize("min_periods", [None, 1, 3])
+@pytest.mark.parametrize("cuts", [(80,), (10, 11, 45, 80)])
+def test_kaufman_adaptive_moving_average_matches_pandas_reference(min_periods, cuts):
+    dataframe = _history()
+    dataframe.iloc[50:53, 0] = np.nan
+    feature = NitroFE.KaufmanAdaptiveMovingAverage(
+        kaufman_efficiency_lookback_period=6, kaufman_efficiency_min_periods=min_periods
+    )
+
+    pd.testing.assert_frame_equal(
+        _fit_in_chunks(feature, dataframe, cuts),
+        _reference_kama(dataframe, 6, min_periods),
+        rtol=1e-9,
+    )
+
+
+def _reference_frama(dataframe, lookback_period, min_periods):
+    # the pandas implementation: rolling apply of the three ranges, in which inf is turned into NaN,
+    # then the recursion row by row
+    half = int(lookback_period / 2)
+
+    def _range(window, operation):
+        return (
+            dataframe.rolling(window, min_periods=min_periods)
+            .apply(operation, raw=True)
+            .to_numpy()
+        )
+
+    first = _range(half, lambda x: (np.max(x) - np.min(x)) / half)
+    second = _range(lookback_period, lambda x: (np.max(x[:half]) - np.min(x[:half])) / half)
+    third = _range(lookback_period, lambda x: (np.max(x) - np.min(x)) / lookback_period)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        dimension = (np.log(second + first) - np.log(third)) / np.log(2)
+        a_value = np.exp(-4.6 * (dimension - 1))
+    a_value = np.where(np.isnan(a_value) | (a_value < 0.01), 0.01, a_value)
+    FC, SC = lookback_period / 2, lookback_period
+    newN = ((SC - FC) * ((2 - a_value) / a_value - 1) / (SC - 1)) + FC
+    a_value = 2 / (newN + 1)
+
+    values = dataframe.to_numpy()
+    result = np.zeros(values.shape)
+    previous = np.zeros(values.shape[1])
+    with np.errstate(invalid="ignore"):
+        for _row in range(len(values)):
+            previous = previous * (1 - a_value[_row]) + values[_row] * a_value[_row]
+            result[_row] = previous
+    return pd.DataFrame(result, index=dataframe.index, columns=dataframe.columns)
+
+
+@pytest.mark.parametrize("lookback_period, min_periods", [(8, 1), (7, 3), (6, None)])
+@pytest.mark.parametrize("cuts", [(80,), (10, 11, 45, 80)])
+def test_fractal_adaptive_moving_average_matches_pandas_reference(
+    lookback_period, min_periods, cuts
+):
+    dataframe = _history()
+    dataframe.iloc[30, 0] = np.inf
+    dataframe.iloc[60, 1] = -np.inf
+    feature = NitroFE.FractalAdaptiveMovingAverage(
+        lookback_period=lookback_period, min_periods=min_periods
+    )
+    result = _fit_in_chunks(feature, dataframe, cuts)
+
+    # an inf value stays in the average, as it did in the pandas implementation
+    assert np.isposinf(result["a"].iloc[30:]).all()
+    assert np.isneginf(result["b"].iloc[60:]).all()
+    pd.testing.assert_frame_equal(
+        result, _reference_frama(dataframe, lookback_period, min_periods), rtol=1e-9
+    )
+
+
+def _reference_smma(dataframe, lookback_period):
+    # the pandas implementation: the mean of the first lookback_period values, then
+    # (previous * (lookback_period - 1) + value) / lookback_period row by row
+    values = dataframe.to_numpy()
+    result = np.zeros(values.shape)
+    result[lookback_period - 1] = np.nansum(values[:lookback_period], axis=0) / lookback_period
+    with np.errstate(invalid="ignore"):
+        for _row in range(lookback_period, len(values)):
+            result[_row] = (
+                result[_row - 1] * (lookback_period - 1) + values[_row]
+            ) / lookback_period
+    return pd.DataFrame(result, index=dataframe.index, columns=dataframe.columns)
+
+
+@pytest.mark.parametrize("cuts", [(80,), (10, 11, 35, 36, 80)])
+def test_smoothed_moving_average_carries_the_filter_state(cuts):
+    dataframe = _history()
+    dataframe["c"] = dataframe["a"] - 50
+    dataframe.iloc[30, 0] = np.inf
+    dataframe.iloc[50, 1] = np.nan
+    dataframe.iloc[20, 2] = -np.inf
+    dataframe.iloc[40, 2] = np.inf
+    result = _fit_in_chunks(NitroFE.SmoothedMovingAverage(lookback_period=4), dataframe, cuts)
+
+    assert np.isposinf(result["a"].iloc[30:]).all()
+    assert np.isnan(result["c"].iloc[40:]).all()
+    pd.testing.assert_frame_equal(result, _reference_smma(dataframe, 4), rtol=1e-9)
@@ -0,0 +1,90 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from NitroFE import (
+    BollingerBands,
+    parallel_fit,
+    weighted_rolling_window_engine,
+    weighted_window_features,
+)
+
+
+def _history(n_rows=80, n_columns=5):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        100 + rng.normal(size=(n_rows, n_columns)).cumsum(axis=0),
+        columns=list("abcdefgh"[:n_columns]),
+    )
+
+
+@pytest.mark.parametrize(
+    "method, kwargs",
+    [
+        ("caluclate_hann_feature", {"window": 5}),
+        ("caluclate_kaiser_feature", {"window": 4, "beta": 3}),
+        (
+            "caluclate_multiple_window_features",
+            {
+                "configurations": [
+                    {"window_type": "hann", "window": 3},
+                    {"window_type": "triang", "window": 5},
+                    {"window_type": "gaussian", "window": 4, "std": 2},
+                ]
+            },
+        ),
+    ],
+)
+@pytest.mark.parametrize("parallel_continuation", [False, True])
+def test_parallel_fit_equals_a_serial_fit(method, kwargs, parallel_continuation):
+    dataframe = _history()
+    serial, parallel = weighted_window_features(), weighted_window_features()
+
+    pd.testing.assert_frame_equal(
+        parallel_fit(parallel, dataframe.iloc[:50], n_jobs=2, method=method, **kwargs),
+        getattr(serial, method)(dataframe.iloc[:50], **kwargs),
+    )
+    # the merged per column state continues both through parallel_fit and serially
+    expected = getattr(serial, method)(dataframe.iloc[50:], first_fit=False, **kwargs)
+    if parallel_continuation:
+        result = parallel_fit(
+            parallel, dataframe.iloc[50:], first_fit=False, n_jobs=2, method=method, **kwargs
+        )
+    else:
+        result = getattr(parallel, method)(dataframe.iloc[50:], first_fit=False, **kwargs)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_parallel_fit_of_the_engine_equals_a_serial_fit():
+    dataframe = _history()
+    payload = {
+        _column: {
+            "weighted_window_features": {"hann": {"window": [3, 5]}, "triang": {"window": 4}}
+        }
+        for _column in dataframe.columns
+    }
+    serial, parallel = weighted_rolling_window_engine(), weighted_rolling_window_engine()
+
+    pd.testing.assert_frame_equal(
+        parallel_fit(parallel, dataframe.iloc[:50], n_jobs=2, payload=payload),
+        serial.fit(dataframe.iloc[:50], payload=payload),
+    )
+    assert parallel.n_jobs == 1
+    pd.testing.assert_frame_equal(
+        parallel.fit(dataframe.iloc[50:], first_fit=False),
+        serial.fit(dataframe.iloc[50:], first_fit=False),
+    )
+
+
+def test_parallel_fit_keeps_the_blocks_of_band_features():
+    dataframe = _history()
+    serial, parallel = BollingerBands(), BollingerBands()
+
+    pd.testing.assert_frame_equal(
+        parallel_fit(parallel, dataframe.iloc[:50], n_jobs=2),
+        serial.fit(dataframe.iloc[:50]),
+    )
+    pd.testing.assert_frame_equal(
+        parallel.fit(dataframe.iloc[50:], first_fit=False),
+        serial.fit(dataframe.iloc[50:], first_fit=False),
+    )
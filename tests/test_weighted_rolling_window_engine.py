@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+
+from NitroFE import weighted_rolling_window_engine, weighted_window_features
+
+
+def test_native_entries_accept_callback_only_params():
+    rng = np.random.default_rng(0)
+    dataframe = pd.DataFrame({"a": rng.normal(size=30)})
+    payload = {
+        "a": {
+            "weighted_window_features": {
+                "hann": {"window": 5, "operation": np.sum, "raw": True},
+                "triang": {"window": 3, "operation_args": (), "vectorized": True},
+            }
+        }
+    }
+    result = weighted_rolling_window_engine().fit(dataframe, payload=payload)
+
+    np.testing.assert_allclose(
+        result["a_hann_5"],
+        weighted_window_features().caluclate_hann_feature(
+            dataframe["a"], window=5, operation=np.sum, raw=True
+        ),
+        rtol=1e-9,
+    )
+    np.testing.assert_allclose(
+        result["a_triang_3"],
+        weighted_window_features().caluclate_triang_feature(dataframe["a"], window=3),
+        rtol=1e-9,
+    )
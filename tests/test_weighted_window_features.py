@@ -0,0 +1,210 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from NitroFE import weighted_window_features
+
+
+def _frame_with_inf():
+    rng = np.random.default_rng(0)
+    dataframe = pd.DataFrame(rng.normal(100, 5, (40, 2)), columns=["a", "b"])
+    dataframe.iloc[12, 0] = np.inf
+    dataframe.iloc[25, 1] = -np.inf
+    dataframe.iloc[30, 1] = np.nan
+    return dataframe
+
+
+@pytest.mark.parametrize("operation", [np.sum, np.mean])
+@pytest.mark.parametrize(
+    "method", ["caluclate_triang_feature", "caluclate_weighted_moving_window_feature"]
+)
+def test_native_operation_skips_inf_like_pandas_rolling(method, operation):
+    dataframe = _frame_with_inf()
+    native = getattr(weighted_window_features(), method)(
+        dataframe, window=5, operation=operation
+    )
+    # a lambda is not a native operation and goes through the pandas rolling apply
+    callback = getattr(weighted_window_features(), method)(
+        dataframe, window=5, operation=lambda x: operation(x)
+    )
+
+    assert np.isfinite(native.to_numpy()).all()
+    pd.testing.assert_frame_equal(native, callback, rtol=1e-9)
+
+
+def test_multiple_window_features_skip_inf():
+    dataframe = _frame_with_inf()
+    result = weighted_window_features().caluclate_multiple_window_features(
+        dataframe,
+        configurations=[
+            {"window_type": "triang", "window": 5, "operation": np.sum},
+            {"window_type": "hann", "window": 300, "operation": np.mean},
+        ],
+        return_array=True,
+    )
+    expected = weighted_window_features().caluclate_triang_feature(
+        dataframe, window=5, operation=np.sum
+    )
+
+    np.testing.assert_allclose(result[:, :, 0], expected.to_numpy(), rtol=1e-9)
+    assert np.isfinite(result).all()
+
+
+def test_continuation_skips_partial_windows_of_the_carried_tail():
+    from NitroFE import clear_window_cache, window_cache_info
+
+    rng = np.random.default_rng(1)
+    dataframe = pd.DataFrame(rng.normal(size=(5100, 2)), columns=["a", "b"])
+    features = weighted_window_features()
+    features.caluclate_hann_feature(dataframe.iloc[:-3], window=5000, operation=np.sum)
+    expected = weighted_window_features().caluclate_hann_feature(
+        dataframe, window=5000, operation=np.sum
+    )
+
+    clear_window_cache()
+    ticks = pd.concat(
+        [
+            features.caluclate_hann_feature(dataframe.iloc[_row : _row + 1], first_fit=False)
+            for _row in range(len(dataframe) - 3, len(dataframe))
+        ]
+    )
+
+    pd.testing.assert_frame_equal(ticks, expected.iloc[-3:], rtol=1e-9)
+    # only the full window weights are built, no partial window below the tail
+    assert window_cache_info().misses == 1
+
+
+def test_multiple_window_features_equal_the_single_feature_methods():
+    rng = np.random.default_rng(2)
+    dataframe = pd.DataFrame(rng.normal(size=(120, 3)), columns=["a", "b", "c"])
+    configurations = [
+        {"window_type": "triang", "window": 5, "operation": np.sum, "name": "triang"},
+        {"window_type": "hann", "window": 30, "name": "hann"},
+        {"window_type": "weighted_moving_window", "window": 4, "name": "wma"},
+    ]
+    multiple, single = weighted_window_features(), weighted_window_features()
+
+    def _single_features(dataframe, first_fit):
+        _features = {
+            "triang": single.caluclate_triang_feature(
+                dataframe, first_fit=first_fit, window=5, operation=np.sum
+            ),
+            "hann": single.caluclate_hann_feature(
+                dataframe, first_fit=first_fit, window=30, operation=np.mean
+            ),
+            "wma": single.caluclate_weighted_moving_window_feature(
+                dataframe, first_fit=first_fit, window=4
+            ),
+        }
+        return pd.DataFrame(
+            {
+                f"{_column}_{_name}": _feature[_column]
+                for _column in _features["triang"].columns
+                for _name, _feature in _features.items()
+            }
+        )
+
+    pd.testing.assert_frame_equal(
+        multiple.caluclate_multiple_window_features(
+            dataframe.iloc[:80], configurations=configurations
+        ),
+        _single_features(dataframe.iloc[:80], True),
+        rtol=1e-9,
+    )
+    # a continuation frame with reordered columns is put back in the order of the first fit
+    continuation = dataframe.iloc[80:][["c", "a", "b"]]
+    pd.testing.assert_frame_equal(
+        multiple.caluclate_multiple_window_features(continuation, first_fit=False),
+        _single_features(continuation, False),
+        rtol=1e-9,
+    )
+
+
+@pytest.mark.parametrize("min_periods", [1, 4])
+def test_vectorized_operation_matches_the_per_window_path(min_periods):
+    dataframe = _frame_with_inf()
+    vectorized, per_window = weighted_window_features(), weighted_window_features()
+
+    def _fit(features, dataframe, first_fit, **kwargs):
+        return features.caluclate_hann_feature(
+            dataframe, first_fit=first_fit, window=6, min_periods=min_periods, **kwargs
+        )
+
+    for _rows, _first_fit in [(slice(0, 25), True), (slice(25, 40), False)]:
+        result = _fit(
+            vectorized,
+            dataframe.iloc[_rows],
+            _first_fit,
+            operation=lambda x: np.max(x, axis=-1),
+            vectorized=True,
+        )
+        expected = _fit(per_window, dataframe.iloc[_rows], _first_fit, operation=np.max, raw=True)
+
+        assert vectorized.params["caluclate_hann_feature"]["backend"] == "vectorized"
+        pd.testing.assert_frame_equal(result, expected, rtol=1e-9)
+
+
+def test_latest_leaves_the_fitted_state_unchanged():
+    rng = np.random.default_rng(3)
+    dataframe = pd.DataFrame(rng.normal(size=(60, 2)), columns=["a", "b"])
+    fitted, reference = weighted_window_features(), weighted_window_features()
+    for _features in (fitted, reference):
+        _features.caluclate_hann_feature(dataframe.iloc[:40], window=5, operation=np.sum)
+        _features.update("caluclate_hann_feature", dataframe.iloc[40].to_numpy())
+
+    latest = fitted.latest(dataframe.iloc[:30], "caluclate_hann_feature", k=2, window=5)
+
+    pd.testing.assert_frame_equal(
+        latest,
+        weighted_window_features()
+        .caluclate_hann_feature(dataframe.iloc[:30], window=5, operation=np.mean)
+        .iloc[-2:],
+    )
+    np.testing.assert_array_equal(
+        fitted.update("caluclate_hann_feature", dataframe.iloc[41].to_numpy()),
+        reference.update("caluclate_hann_feature", dataframe.iloc[41].to_numpy()),
+    )
+    pd.testing.assert_frame_equal(
+        fitted.caluclate_hann_feature(dataframe.iloc[42:], first_fit=False),
+        reference.caluclate_hann_feature(dataframe.iloc[42:], first_fit=False),
+    )
+
+
+@pytest.mark.parametrize(
+    "method, kwargs",
+    [
+        ("caluclate_hann_feature", {"window": 5}),
+        ("caluclate_equal_feature", {"window": 4, "operation": np.sum}),
+        ("caluclate_kaiser_feature", {"window": 6, "beta": 3, "min_periods": 3}),
+        ("caluclate_triang_feature", {"window": 5, "operation": np.median}),
+    ],
+)
+@pytest.mark.parametrize("as_series", [False, True])
+def test_update_per_row_equals_the_batch_continuation(method, kwargs, as_series):
+    rng = np.random.default_rng(0)
+    dataframe = pd.DataFrame(
+        100 + rng.normal(size=(60, 3)).cumsum(axis=0), columns=["a", "b", "c"]
+    )
+    dataframe.iloc[[33, 34, 47], 1] = np.nan
+    if as_series:
+        dataframe = dataframe["b"]
+    batch, streaming = weighted_window_features(), weighted_window_features()
+    getattr(batch, method)(dataframe.iloc[:30], **kwargs)
+    getattr(streaming, method)(dataframe.iloc[:30], **kwargs)
+
+    expected = getattr(batch, method)(dataframe.iloc[30:], first_fit=False, **kwargs)
+    result = [
+        streaming.update(method, dataframe.iloc[_row]) for _row in range(30, 45)
+    ]
+    # batch and streaming calls interleave, the batch call continues from the updated rows
+    result = np.vstack(
+        [
+            np.asarray(result).reshape(15, -1),
+            np.asarray(
+                getattr(streaming, method)(dataframe.iloc[45:], first_fit=False, **kwargs)
+            ).reshape(15, -1),
+        ]
+    )
+    np.testing.assert_allclose(
+        result, np.asarray(expected).reshape(30, -1), rtol=1e-9, equal_nan=True
+    )
@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from NitroFE.time_based_features.weighted_window_features.weighted_window_jit import (
+    _compiled_adaptive_smoothing,
+)
+from NitroFE.time_based_features.weighted_window_features.weighted_window_kernels import (
+    _adaptive_smoothing,
+)
+
+
+@pytest.mark.parametrize("convex", [False, True])
+def test_compiled_adaptive_smoothing_equals_the_numpy_loop(convex):
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(500, 3))
+    values[40, 1] = np.nan
+    values[60, 2] = np.inf
+    smoothing = rng.uniform(0, 1, size=values.shape)
+    initial = np.array([0.5, -1.0, 2.0])
+
+    with np.errstate(invalid="ignore"):
+        expected = _adaptive_smoothing(values, smoothing, initial, start=3, convex=convex)
+
+    np.testing.assert_array_equal(
+        _compiled_adaptive_smoothing(values, smoothing, initial, start=3, convex=convex),
+        expected,
+    )
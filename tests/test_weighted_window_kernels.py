@@ -0,0 +1,66 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from NitroFE import BollingerBands, HullMovingFeature
+from NitroFE.time_based_features.weighted_window_features.weighted_window_kernels import (
+    _linear_weighted_rolling_sum,
+    _rolling_mean_std,
+    _weighted_rolling_sum,
+)
+from NitroFE.time_based_features.weighted_window_features.weighted_windows import (
+    _window_function_values,
+)
+
+
+def _values_with_inf():
+    rng = np.random.default_rng(0)
+    values = 100 + rng.normal(size=(200, 2)).cumsum(axis=0)
+    values[50, 0] = np.inf
+    values[130, 1] = -np.inf
+    return values
+
+
+def test_rolling_mean_std_skips_inf_like_pandas_rolling():
+    values = _values_with_inf()
+    mean, std = _rolling_mean_std(values, 10, 10)
+
+    rolling = pd.DataFrame(values).rolling(10, min_periods=10)
+    np.testing.assert_allclose(mean, rolling.mean().to_numpy(), rtol=1e-9)
+    np.testing.assert_allclose(std, rolling.std(ddof=0).to_numpy(), rtol=1e-7, atol=1e-9)
+    # an inf only affects the windows holding it, not the rest of its block
+    assert np.isfinite(mean[9:50, 0]).all()
+    assert np.isfinite(mean[60:, 0]).all()
+
+
+def test_bollinger_bands_with_inf():
+    values = _values_with_inf()
+    result = BollingerBands().fit(pd.DataFrame(values, columns=["a", "b"]))
+
+    _missing = np.flatnonzero(~np.isfinite(result["a_positive_band"].to_numpy()))
+    np.testing.assert_array_equal(_missing, np.r_[0:10, 50:61])
+
+
+def test_linear_weighted_rolling_sum_skips_inf():
+    values = _values_with_inf()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        result = _linear_weighted_rolling_sum(values, 9)
+
+    expected = _weighted_rolling_sum(
+        np.where(np.isfinite(values), values, 0.0),
+        lambda length: _window_function_values("weighted_moving", length, symmetric=False),
+        9,
+    )
+    np.testing.assert_allclose(result, expected, rtol=1e-9)
+
+
+def test_hull_moving_feature_with_inf():
+    dataframe = pd.DataFrame(_values_with_inf(), columns=["a", "b"])
+    result = HullMovingFeature(window=9).fit(dataframe)
+    # a lambda operation goes through the pandas rolling apply
+    expected = HullMovingFeature(window=9, operation=lambda x: np.mean(x)).fit(dataframe)
+
+    assert np.isfinite(result.to_numpy()).all()
+    pd.testing.assert_frame_equal(result, expected, rtol=1e-9)